@@ -5,9 +5,9 @@ from functools import lru_cache
 import gc
 import hashlib
 import io
+import logging
 import numpy as np
 import os
-import pandas as pd
 import pickle
 import plotly.graph_objects as go
 import tempfile
@@ -17,15 +17,18 @@ import traceback
 import re
 import webbrowser
 import zipfile
-from dash import dash_table, Dash, html, dcc, callback, Output, Input, State, ctx, no_update
-from plotly.subplots import make_subplots
+from dash import Dash, html, dcc, callback, Output, Input, State, ctx, no_update
 from scipy.fft import rfft, rfftfreq
-from scipy.signal import get_window, welch, csd, find_peaks, medfilt, butter, filtfilt, firwin, periodogram, sosfiltfilt
-from scipy.stats import median_abs_deviation
 from dynamic_stiffness_analyzer.visualization.shared import (
     generar_graficos_vacios,
     generar_figura_vacia,
 )
+from dynamic_stiffness_analyzer.services.datasets import guardar_dataset, leer_dataset
+from dynamic_stiffness_analyzer.services.logs import configurar_logging
+from dynamic_stiffness_analyzer.services.profiling import PERFILADOR
+from dynamic_stiffness_analyzer.signal_processing.filters import MODOS_MULTIBANDA
+# Los diccionarios añadidos en settings (FILTROS, ...) no existen en la ConfiguracionSistema local de más abajo
+from dynamic_stiffness_analyzer.config.settings import CONFIG as CONFIG_MODULAR
 
 # Intento de usar configuración modular externa; si falla, se usarán las definiciones locales
 try:
@@ -36,6 +39,10 @@ except Exception:
     # La configuración local definida más abajo seguirá activa
     pass
 
+# Nivel y formato desde CONFIG.LOGGING ('DEBUG' muestra los diagnósticos por llamada)
+configurar_logging()
+logger = logging.getLogger('dynamic_stiffness_analyzer.legado')
+
 app = Dash()
 
 ######################################################################################################################################
@@ -47,7 +54,7 @@ app = Dash()
 try:
     USAR_CACHE
 except NameError:
-    USAR_CACHE = False  # DESHABILITADO TEMPORALMENTE para aplicar correcciones de frecuencias
+    USAR_CACHE = True  # Claves por contenido: los resultados en caché no pueden quedar obsoletos
 
 ######################################################################################################################################
 ######################################################################################################################################
@@ -118,24 +125,20 @@ CONFIG = ConfiguracionSistema()
 try:
     USAR_CACHE
 except NameError:
-    USAR_CACHE = False  # DESHABILITADO TEMPORALMENTE para aplicar correcciones de frecuencias
+    USAR_CACHE = True  # Claves por contenido: los resultados en caché no pueden quedar obsoletos
 
 # --- Activación automática de caché según tamaño de datos ---
 def evaluar_cache_por_tamano(df):
     
-    #Activa o desactiva el caché automáticamente si el dataset es grande.
+    # Activa el caché automáticamente si el dataset es grande (nunca lo desactiva: las claves son exactas).
     global USAR_CACHE
     try:
         if df is not None and hasattr(df, '__len__') and len(df) > CONFIG.UMBRALES_DATOS['DATASET_GRANDE']:
             if not USAR_CACHE:
                 habilitar_cache()
-                print(f"[CACHE] Activado automáticamente por tamaño de datos: {len(df)} puntos")
-        else:
-            if USAR_CACHE:
-                deshabilitar_cache()
-                print(f"[CACHE] Desactivado automáticamente por tamaño de datos: {len(df) if df is not None else 0} puntos")
+                logger.debug("Activado automáticamente por tamaño de datos: %s puntos", len(df))
     except Exception as e:
-        print(f"[CACHE] Error en evaluación automática: {e}")
+        logger.warning("Error en evaluación automática: %s", e)
 
 ######################################################################################################################################
 ######################################################################################################################################
@@ -218,6 +221,27 @@ app.layout = html.Div([dcc.Store(id='store-df'), dcc.Store(id='store-df-corte'),
                                           'alignItems': 'center',
                                           'marginBottom': '20px'}),
 
+                       # Carga desde la carpeta local del servidor (oculta si no hay carpeta configurada)
+                       html.Div([
+                           html.Label('O cargar desde la carpeta local:', style={'color': 'white',
+                                                                                 'marginRight': '10px'}),
+                           dcc.Dropdown(id='selector-archivo-local', options=[], placeholder='Selecciona archivo...',
+                                        style={'width': '350px', 'color': 'black'}),
+                           html.Button('Cargar', id='boton-cargar-local', n_clicks=0, style={'marginLeft': '10px',
+                                                                                             'backgroundColor': '#444',
+                                                                                             'color': 'white',
+                                                                                             'fontWeight': 'bold',
+                                                                                             'borderRadius': '4px',
+                                                                                             'border': 'none',
+                                                                                             'padding': '8px 15px'}),
+                           html.Button('Actualizar lista', id='boton-refrescar-locales', n_clicks=0, style={'marginLeft': '10px',
+                                                                                                            'backgroundColor': '#444',
+                                                                                                            'color': 'white',
+                                                                                                            'borderRadius': '4px',
+                                                                                                            'border': 'none',
+                                                                                                            'padding': '8px 15px'})
+                                ], id='contenedor-archivos-locales', style={'display': 'none'}),
+
 ######################################################################################################################################
 ######################################################################################################################################
 ######################################################################################################################################
@@ -314,7 +338,15 @@ app.layout = html.Div([dcc.Store(id='store-df'), dcc.Store(id='store-df-corte'),
                                    dcc.Input(id='input-bandpass-multibanda', type='text', placeholder='50,200',
                                              style={'width': '140px',
                                                     'marginRight': '5px'}),
-                                   html.Span('Hz', style={'color': 'white'}), ], style={'display': 'flex',
+                                   html.Span('Hz', style={'color': 'white',
+                                                          'marginRight': '10px'}),
+                                   dcc.RadioItems(id='selector-modo-multibanda',
+                                                  options=[{'label': etiqueta, 'value': modo}
+                                                           for modo, etiqueta in MODOS_MULTIBANDA.items()],
+                                                  value=CONFIG_MODULAR.FILTROS['MODO_MULTIBANDA'],
+                                                  labelStyle={'display': 'inline-block',
+                                                              'marginRight': '5px',
+                                                              'color': 'white'}), ], style={'display': 'flex',
                                                                                         'alignItems': 'center',
                                                                                         'marginRight': '20px'}),
 
@@ -526,6 +558,37 @@ app.layout = html.Div([dcc.Store(id='store-df'), dcc.Store(id='store-df-corte'),
                            dcc.Graph(id='grafico-coherencia', style={'width': '100%',
                                                                      'height': '300px',
                                                                      'marginTop': '30px'}),
+                           html.Div([
+                               html.H3('Tiempos por etapa', style={'color': 'white',
+                                                                   'marginBottom': '10px'}),
+                               html.Div([
+                                   dcc.Dropdown(id='selector-ejecucion-perfilado', options=[], value=None,
+                                                placeholder='Selecciona ejecución...', clearable=False,
+                                                style={'width': '450px',
+                                                       'marginRight': '10px'}),
+                                   html.Button('Actualizar', id='boton-actualizar-perfilado', n_clicks=0,
+                                               style={'marginRight': '10px',
+                                                      'backgroundColor': '#444',
+                                                      'color': 'white',
+                                                      'fontWeight': 'bold',
+                                                      'borderRadius': '4px',
+                                                      'border': 'none',
+                                                      'padding': '8px 15px'}),
+                                   html.Button('Descargar JSON', id='boton-descargar-perfilado', n_clicks=0,
+                                               style={'backgroundColor': '#007bff',
+                                                      'color': 'white',
+                                                      'fontWeight': 'bold',
+                                                      'borderRadius': '4px',
+                                                      'border': 'none',
+                                                      'padding': '8px 15px'}),
+                                   dcc.Download(id='descarga-perfilado'),
+                                        ], style={'display': 'flex',
+                                                  'flexDirection': 'row',
+                                                  'alignItems': 'center',
+                                                  'marginBottom': '10px'}),
+                               html.Div(id='tabla-perfilado'),
+                                    ], style={'width': '100%',
+                                              'marginTop': '30px'}),
                            dcc.Store(id='estado-fijar-vista', data=False),], style={'width': '100%'}), ], style={'backgroundColor': '#111111',
                                                                                                                  'padding': '20px'})
 
@@ -608,23 +671,19 @@ def cerrar_aplicacion(n_clicks):
          )
 
 def cargar_archivo(contents, filename):
-    # Limpiar caché al cargar nuevo archivo para evitar inconsistencias
-    if contents is not None and USAR_CACHE:
-        cache_computacional.limpiar_cache()
-        print("[CACHÉ] Caché limpiado al cargar nuevo archivo")
-
+    # El caché está direccionado por contenido: un archivo nuevo no invalida resultados previos
     try:
         from dynamic_stiffness_analyzer.io.loader import cargar_contenidos_upload
         msg, df_json, msg_loading = cargar_contenidos_upload(contents, filename)
         if df_json:
             try:
-                df_tmp = pd.read_json(df_json, orient='split')
+                df_tmp = leer_dataset(df_json)
                 evaluar_cache_por_tamano(df_tmp)
             except Exception:
                 pass
         return msg, (df_json or ''), msg_loading
     except Exception as e:
-        print(f"[ERROR] Error en loader modular: {e}")
+        logger.error("Error en loader modular: %s", e)
         return 'Error al leer el archivo', '', ''
 
 ######################################################################################################################################
@@ -638,7 +697,7 @@ def cargar_archivo(contents, filename):
          )
 
 def exportar_waterfall(n_clicks):
-    datos = getattr(actualizar_graficos, 'datos_waterfall', None)
+    datos = getattr(actualizar_waterfall, 'datos_waterfall', None)
     if not datos:
         return None
     try:
@@ -648,7 +707,7 @@ def exportar_waterfall(n_clicks):
             return None
         return dcc.send_file(zip_path, filename="datos_3D.zip")
     except Exception as e:
-        print(f"[ERROR] Error en export modular: {e}")
+        logger.error("Error en export modular: %s", e)
         return None
 
 ######################################################################################################################################
@@ -659,6 +718,7 @@ def exportar_waterfall(n_clicks):
 @callback(Output('input-mediana', 'disabled'),
           Output('input-highpass', 'disabled'),
           Output('input-bandpass-multibanda', 'disabled'),
+          Output('selector-modo-multibanda', 'disabled'),
           Input('toggle-mediana', 'value'),
           Input('toggle-highpass', 'value'),
           Input('toggle-bandpass', 'value'),
@@ -668,6 +728,7 @@ def deshabilitar_inputs_filtros(toggle_mediana, toggle_highpass, toggle_bandpass
     return (toggle_mediana != 'yes',
             toggle_highpass != 'yes',
             toggle_bandpass != 'yes',
+            toggle_bandpass != 'yes',
             )
 
 ######################################################################################################################################
@@ -687,11 +748,11 @@ def actualizar_limites_duracion_segmento(df_json, df_corte_json, df_filtrado_jso
     max_val = 9999  # Valor por defecto si no hay datos
     df_base = None
     if df_corte_json:
-        df_base = pd.read_json(df_corte_json, orient='split')
+        df_base = leer_dataset(df_corte_json)
     elif df_filtrado_json:
-        df_base = pd.read_json(df_filtrado_json, orient='split')
+        df_base = leer_dataset(df_filtrado_json)
     elif df_json:
-        df_base = pd.read_json(df_json, orient='split')
+        df_base = leer_dataset(df_json)
     if df_base is not None and 'tiempo' in df_base.columns:
         t = df_base['tiempo'].values
         if len(t) > 1:
@@ -764,20 +825,24 @@ from dynamic_stiffness_analyzer.signal_processing.windowing import (
               State('toggle-mediana', 'value'),
               State('toggle-highpass', 'value'),
               State('toggle-bandpass', 'value'),
+              State('selector-modo-multibanda', 'value'),
+              State('store-df-filtrado', 'data'),
               prevent_initial_call=True
              )
 
 def aplicar_filtros(n_clicks, df_json, df_corte_json, seleccion_multi, seleccion_eje, mediana_val, highpass_val,
-                    bandpass_multibanda, toggle_mediana, toggle_highpass, toggle_bandpass):
+                    bandpass_multibanda, toggle_mediana, toggle_highpass, toggle_bandpass, modo_multibanda,
+                    df_filtrado_anterior):
     if n_clicks is None or n_clicks == 0:
         return no_update, no_update
     if df_json is None:
         return None, html.Div("No hay datos para filtrar", style={'color': 'red'})
+    PERFILADOR.iniciar("Filtrado")
     try:
-        df = pd.read_json(df_json, orient='split')
+        df = leer_dataset(df_json)
 
         # Validaciones básicas
-        if df.empty or 'tiempo' not in df.columns:
+        if df is None or df.empty or 'tiempo' not in df.columns:
             return None, html.Div("Datos inválidos", style={'color': 'red'})
 
         # Calcular parámetros de tiempo
@@ -787,16 +852,18 @@ def aplicar_filtros(n_clicks, df_json, df_corte_json, seleccion_multi, seleccion
 
         # Aplicar filtros usando la función corregida
         df_filtrado, mensajes_filtro, _ = filtrar_senal(df, seleccion_multi, seleccion_eje, fs, mediana_val, highpass_val,
-                                                        bandpass_multibanda, toggle_mediana, toggle_highpass, toggle_bandpass)
+                                                        bandpass_multibanda, toggle_mediana, toggle_highpass, toggle_bandpass,
+                                                        modo_multibanda)
 
         # Preparar mensaje de éxito
         mensaje = html.Div([
             html.Span("✅ Filtros aplicados correctamente", style={'color': 'green', 'fontWeight': 'bold'}),
             html.Br(),
             html.Span(f"Señales procesadas: {len(seleccion_multi or [])}", style={'color': 'white'})])
-        return df_filtrado.to_json(orient='split'), mensaje
+        # El filtrado anterior se reemplaza (no se acumula una versión por clic)
+        return guardar_dataset(df_filtrado, df_filtrado_anterior), mensaje
     except Exception as e:
-        print(f"[ERROR] Error aplicando filtros: {e}")
+        logger.error("Error aplicando filtros: %s", e)
         return None, html.Div(f"Error: {str(e)[:50]}", style={'color': 'red'})
 
 ######################################################################################################################################
@@ -819,20 +886,24 @@ from dynamic_stiffness_analyzer.signal_processing.filters import filtrar_senal
               State('store-df-filtrado', 'data'),
               State('store-df', 'data'),
               State('selector-multi', 'value'),
+              State('store-df-corte', 'data'),
               prevent_initial_call=True
              )
 
-def aplicar_corte(n_clicks, inicio, fin, df_filtrado_json, df_json, señales_seleccionadas):
+def aplicar_corte(n_clicks, inicio, fin, df_filtrado_json, df_json, señales_seleccionadas, df_corte_anterior):
     if n_clicks is None or (df_filtrado_json is None and df_json is None):
         return no_update, ''
+    PERFILADOR.iniciar("Corte")
     try:
-        df = pd.read_json(df_filtrado_json or df_json, orient='split')
+        df = leer_dataset(df_filtrado_json or df_json)
     except Exception:
         return no_update, 'Datos inválidos.'
+    if df is None:
+        return no_update, 'Datos inválidos.'
     try:
         from dynamic_stiffness_analyzer.signal_processing.cutting import aplicar_corte_df
         df_corte, mensaje = aplicar_corte_df(df, inicio, fin, señales_seleccionadas)
-        return df_corte.to_json(date_format='iso', orient='split'), mensaje
+        return guardar_dataset(df_corte, df_corte_anterior), mensaje
     except Exception as e:
         return no_update, str(e)
 
@@ -1156,663 +1227,20 @@ def controlar_estado_corte(df_json, df_filtrado_json, inicio, fin, n_clicks_cort
 ######################################################################################################################################
 ######################################################################################################################################
 ######################################################################################################################################
-                                                    # --- Callback principal ---
-
-@app.callback(Output('grafico-tiempo', 'figure'),
-              Output('grafico-fft', 'figure'),
-              Output('grafico-waterfall', 'figure'),
-              Output('amortiguamiento-tables', 'children'),
-              Output('grafico-desplazamiento', 'figure'),
-              Output('grafico-coherencia', 'figure'),
-              Output('selector-curvas', 'value'),
-              Output('selector-curvas', 'options'),
-              Output('estado-fijar-vista', 'data'),
-              Output('boton-fijar-vista', 'style'),
-              Output('input-mediana', 'value'),
-              Output('input-highpass', 'value'),
-              Output('input-bandpass-multibanda', 'value'),
-              Input('selector-multi', 'value'),
-              Input('selector-eje', 'value'),
-              Input('escala-x', 'value'),
-              Input('escala-y', 'value'),
-              Input('selector-curvas', 'value'),
-              Input('boton-reset', 'n_clicks'),
-              Input('boton-fijar-vista', 'n_clicks'),
-              Input('store-df', 'data'),
-              Input('boton-aplicar-filtros', 'n_clicks'),
-              Input('store-df-corte', 'data'),
-              Input('store-df-filtrado', 'data'),
-              Input('boton-aplicar-duracion-segmento', 'n_clicks'),
-              Input('boton-aplicar-masa', 'n_clicks'),
-              State('input-masa-martillo', 'value'),
-              State('input-mediana', 'value'),
-              State('input-highpass', 'value'),
-              State('input-bandpass-multibanda', 'value'),
-              State('selector-curvas', 'value'),
-              State('estado-fijar-vista', 'data'),
-              State('toggle-mediana', 'value'),
-              State('toggle-highpass', 'value'),
-              State('toggle-bandpass', 'value'),
-              State('store-df-filtrado', 'data'),
-              State('mensaje-filtro', 'children'),
-              State('input-duracion-segmento', 'value'),
-             )
-
-def actualizar_graficos(seleccion_multi, seleccion_eje, escala_x, escala_y, curvas_enfasis_input, n_clicks_reset, n_clicks_fijar,
-                        df_json, n_clicks_aplicar, df_corte_json, df_filtrado_json, n_clicks_aplicar_duracion,
-                        n_clicks_aplicar_masa, masa_martillo, mediana_val, highpass_val, bandpass_multibanda, curvas_enfasis_state,
-                        estado_fijar_vista, toggle_mediana, toggle_highpass, toggle_bandpass, store_df_filtrado, mensaje_filtro,
-                        duracion_segmento):
-    try:
-        
-        # Detectar cambios que requieren limpieza de caché
-        trigger_id = ctx.triggered_id if hasattr(ctx, 'triggered_id') else None
-
-        # Limpiar caché cuando cambian datos base o se aplican filtros/cortes
-        triggers_limpiar_cache = ['store-df',  # Nuevo archivo cargado
-                                  'boton-aplicar-filtros',  # Filtros aplicados
-                                  'boton-aplicar-corte',  # Corte aplicado
-                                  'boton-aplicar-masa'  # Masa del martillo cambiada
-                                 ]
-        if USAR_CACHE and trigger_id in triggers_limpiar_cache:
-            cache_computacional.limpiar_cache()
-            print(f"[CACHÉ] Caché limpiado por cambio en: {trigger_id}")
-        df_original = pd.read_json(df_json, orient='split') if df_json else None
-
-        # Debug del estado inicial
-        print(f"[DEBUG] Estado inicial - df_json existe: {df_json is not None}")
-        if df_json:
-            print(f"[DEBUG] Tamaño df_json: {len(df_json)} caracteres")
-        if df_original is not None:
-            print(f"[DEBUG] df_original cargado: shape={df_original.shape}, columnas={list(df_original.columns)}")
-
-        # Si no hay datos cargados, devolver figuras vacías
-        if df_json is None or df_original is None:
-            print("[ERROR] Sin datos cargados")
-            return generar_graficos_vacios()
-
-        # Verificar que hay columnas de tiempo y respuesta en el DataFrame
-        if df_original.empty or 'tiempo' not in df_original.columns:
-            print(f"[ERROR] DataFrame inválido - empty: {df_original.empty}, tiene tiempo: {'tiempo' in df_original.columns}")
-            return generar_graficos_vacios()
-
-        # Obtener el trigger_id de la acción que disparó el callback
-        trigger_id = ctx.triggered_id if hasattr(ctx, 'triggered_id') else (
-            ctx.triggered[0]['prop_id'].split('.')[0] if ctx.triggered else None)
-
-        # Inicializa siempre las variables de store para evitar errores de referencia
-        df_filtrado_json = df_filtrado_json if 'df_filtrado_json' in locals() or 'df_filtrado_json' in globals() else None
-
-        # Selección del DataFrame base para graficar
-        df_base = None
-        if df_corte_json is not None and df_corte_json != '':
-            try:
-                df_base = pd.read_json(df_corte_json, orient='split')
-                if df_base.empty or 'tiempo' not in df_base.columns:
-                    df_base = None
-            except Exception:
-                df_base = None
-        elif df_filtrado_json is not None and df_filtrado_json != '':
-            try:
-                df_base = pd.read_json(df_filtrado_json, orient='split')
-                if df_base.empty or 'tiempo' not in df_base.columns:
-                    df_base = None
-            except Exception:
-                df_base = None
-        elif df_json is not None and df_json != '':
-            try:
-                df_base = pd.read_json(df_json, orient='split')
-                if df_base.empty or 'tiempo' not in df_base.columns:
-                    df_base = None
-            except Exception:
-                df_base = None
-        if df_base is None:
-            return generar_graficos_vacios()
-        df = df_base.copy()
-
-        # Validar que el DataFrame resultante no esté vacío y tenga datos válidos
-        if df.empty or len(df) < 2:
-            return generar_graficos_vacios()
-
-        # Eliminar filas con NaN o infinitos en columnas críticas
-        columnas_criticas = ['tiempo'] + [col for col in df.columns if col.startswith(('accel_', 'fuerza'))]
-        df_clean = df[columnas_criticas].replace([np.inf, -np.inf], np.nan).dropna()
-        if df_clean.empty or len(df_clean) < 2:
-            return generar_graficos_vacios()
-
-        # Actualizar df con datos limpios pero mantener todas las columnas originales
-        df.loc[df_clean.index, columnas_criticas] = df_clean[columnas_criticas]
-        df = df.loc[df_clean.index].copy()
-    except Exception as e:
-        print(f"Error crítico al inicio de actualizar_graficos: {e}")
-        return generar_graficos_vacios()
-
-    # Inicialización de variables de estado
-    filtro_aplicado = False
-    mensajes_filtro = []
-    df_filtrado = None
-
-    # Si los selectores están vacíos (primera carga tras subir archivo), fuerza valores por defecto
-    if not seleccion_multi:
-        seleccion_multi = ['accel_x']
-    if not seleccion_eje:
-        seleccion_eje = 'accel_x'
-
-    # --- Parsear frecuencias_centrales una sola vez ---
-    frecuencias_centrales = []
-    if bandpass_multibanda:
-        try:
-            frecuencias_centrales = [float(f.strip()) for f in bandpass_multibanda.split(',') if f.strip()]
-        except Exception:
-            frecuencias_centrales = []
-
-    # Hacer frecuencias_centrales disponible para filtrar_senal
-    filtrar_senal.frecuencias_centrales = frecuencias_centrales
-
-    # Determinar el DataFrame a graficar con validaciones adicionales
-    try:
-        if df_corte_json:
-            df = pd.read_json(df_corte_json, orient='split')
-            print("[DEBUG] Graficando con df_corte_json (corte aplicado)")
-            filtro_aplicado = False
-            mensajes_filtro = []
-        elif df_filtrado_json:
-            df = pd.read_json(df_filtrado_json, orient='split')
-            print("[DEBUG] Graficando con df_filtrado_json (filtro aplicado)")
-            filtro_aplicado = True
-            mensajes_filtro = []
-        else:
-            df = df_base.copy()
-            print("[DEBUG] Graficando con df_base (sin filtro ni corte)")
-            filtro_aplicado = False
-            mensajes_filtro = []
-
-        # Validar nuevamente que el DataFrame final tiene datos válidos
-        if df.empty or len(df) < 2 or 'tiempo' not in df.columns:
-            print("[ERROR] DataFrame final inválido o vacío")
-            return generar_graficos_vacios()
-        print(f"[DEBUG] DataFrame para graficar: columnas={list(df.columns)}, shape={df.shape}")
-
-        # Validar selecciones con valores por defecto seguros
-        columnas_disponibles = [col for col in df.columns if col != 'tiempo']
-        print(f"[DEBUG] Columnas disponibles en DataFrame: {columnas_disponibles}")
-        if not columnas_disponibles:
-            print("[ERROR] No hay columnas de datos disponibles")
-            return generar_graficos_vacios()
-
-        # Si los selectores están vacíos o contienen columnas inexistentes, usar valores por defecto
-        if not seleccion_multi or not any(col in df.columns for col in seleccion_multi):
-            if 'accel_x' in df.columns:
-                seleccion_multi = ['accel_x']
-            else:
-                seleccion_multi = [columnas_disponibles[0]]  # Usar la primera columna disponible
-            print(f"[DEBUG] Seleccion_multi ajustada a: {seleccion_multi}")
-        if not seleccion_eje or seleccion_eje not in df.columns:
-            if 'accel_x' in df.columns:
-                seleccion_eje = 'accel_x'
-            else:
-                seleccion_eje = columnas_disponibles[0]  # Usar la primera columna disponible
-            print(f"[DEBUG] Seleccion_eje ajustada a: {seleccion_eje}")
-
-        # Filtrar seleccion_multi para incluir solo columnas existentes
-        seleccion_multi = [col for col in seleccion_multi if col in df.columns]
-        if not seleccion_multi:
-            seleccion_multi = [columnas_disponibles[0]]
-        print(f"[DEBUG] Selectores finales - multi: {seleccion_multi}, eje: {seleccion_eje}")
-
-        # Debug de columnas seleccionadas
-        for col in seleccion_multi:
-            if col in df.columns:
-                y = df[col].values
-                if len(y) > 0 and np.isfinite(y).any():
-                    y_finite = y[np.isfinite(y)]
-                    if len(y_finite) > 0:
-                        print(f"[DEBUG] Graficando columna '{col}': min={np.min(y_finite):.4f}, max={np.max(y_finite):.4f}, mean={np.mean(y_finite):.4f}, std={np.std(y_finite):.4f}")
-                    else:
-                        print(f"[WARNING] Columna '{col}' no tiene valores finitos")
-                else:
-                    print(f"[WARNING] Columna '{col}' está vacía o solo contiene valores no finitos")
-
-        # --- Método de diagnóstico y regeneración de dt ---
-        t = df['tiempo'].values
-        if len(t) < 2:
-            print("[ERROR] Insuficientes puntos de tiempo")
-            return generar_graficos_vacios()
-
-        # 1. Diagnóstico de regularidad temporal
-        dt_values = np.diff(t)
-
-        # Filtrar valores no válidos antes del cálculo
-        dt_values_valid = dt_values[dt_values > 0]
-        if len(dt_values_valid) == 0:
-            print("[ERROR] No hay intervalos de tiempo válidos")
-            return generar_graficos_vacios()
-        dt_original = np.median(dt_values_valid)
-        if dt_original <= 0:
-            print("[WARNING] Intervalo de tiempo inválido calculado")
-
-            # Fallback: calcular dt desde el rango total
-            dt_original = (t[-1] - t[0]) / (len(t) - 1)
-            if dt_original <= 0:
-                print("[ERROR] No se puede calcular dt válido - usando valor por defecto")
-                dt_original = 0.001  # 1ms por defecto
-                fs = 1000.0
-                print(f"[INFO] Usando dt={dt_original:.6f}, fs={fs:.2f} Hz por defecto")
-            else:
-                fs = 1 / dt_original
-                print(f"[INFO] dt calculado desde rango total: {dt_original:.6f}, fs={fs:.2f} Hz")
-        else:
-            fs = 1 / dt_original
-            print(f"[INFO] dt válido desde mediana: {dt_original:.6f}, fs={fs:.2f} Hz")
-
-        # Continuar con el diagnóstico solo si tenemos un dt válido
-        dt_std = np.std(dt_values_valid)
-        dt_mean = np.mean(dt_values_valid)
-        irregularidad_relativa = dt_std / dt_mean if dt_mean > 0 else 1.0
-        print(f"[DEBUG] Diagnóstico temporal original:")
-        print(f"  - dt_mean: {dt_mean:.6f} s")
-        print(f"  - dt_std: {dt_std:.6f} s")
-        print(f"  - Irregularidad relativa: {irregularidad_relativa:.4f} ({irregularidad_relativa * 100:.2f}%)")
-        print(f"  - Valores dt válidos: {len(dt_values_valid)}/{len(dt_values)}")
-
-        # 2. Criterio objetivo: si la irregularidad supera el 5%, regenerar
-        umbral_irregularidad = CONFIG.TOLERANCIAS['IRREGULARIDAD_TEMPORAL']  # 5%
-        tiempo_regenerado = False
-        if irregularidad_relativa > umbral_irregularidad:
-            print(f"[WARNING] Irregularidad temporal detectada ({irregularidad_relativa * 100:.2f}% > {umbral_irregularidad * 100:.1f}%)")
-            print("[INFO] Regenerando vector de tiempo uniforme...")
-
-            # Regenerar vector de tiempo uniforme
-            t_inicial = t[0]
-            t_final = t[-1]
-            n_puntos = len(t)
-
-            # Verificar que el rango de tiempo es válido
-            if t_final <= t_inicial:
-                print("[WARNING] Rango de tiempo inválido - usando tiempo por defecto")
-                t_nuevo = np.linspace(0, n_puntos * dt_original, n_puntos)
-            else:
-                t_nuevo = np.linspace(t_inicial, t_final, n_puntos)
-
-            # Reemplazar en el DataFrame
-            df['tiempo'] = t_nuevo
-            t = t_nuevo
-
-            # Recalcular parámetros
-            dt_nuevo = (t_nuevo[-1] - t_nuevo[0]) / (n_puntos - 1) if n_puntos > 1 else dt_original
-            dt_values_nuevo = np.diff(t_nuevo)
-            dt_std_nuevo = np.std(dt_values_nuevo)
-            irregularidad_nueva = dt_std_nuevo / dt_nuevo if dt_nuevo > 0 else 0.0
-            print(f"[INFO] Tiempo regenerado exitosamente:")
-            print(f"  - dt_nuevo: {dt_nuevo:.6f} s")
-            print(f"  - Irregularidad nueva: {irregularidad_nueva:.6f} ({irregularidad_nueva * 100:.4f}%)")
-            dt = dt_nuevo
-            fs = 1 / dt
-            tiempo_regenerado = True
-        else:
-            print(f"[INFO] Vector de tiempo regular ({irregularidad_relativa * 100:.2f}% ≤ {umbral_irregularidad * 100:.1f}%)")
-            dt = dt_original
-
-        # Verificación final de dt
-        if dt <= 0 or not np.isfinite(dt):
-            print("[ERROR] dt final inválido - forzando valor por defecto")
-            dt = 0.001  # 1ms
-            fs = 1000.0
-            tiempo_regenerado = True
-        else:
-            fs = 1 / dt
-        print(f"[DEBUG] Parámetros temporales finales: dt={dt:.6f}, fs={fs:.2f} Hz, regenerado={tiempo_regenerado}")
-
-        # Lógica del botón fijar vista 3D con validación
-        try:
-            curvas_enfasis = [] if trigger_id == 'boton-reset' else (curvas_enfasis_input or [])
-            if trigger_id == 'boton-fijar-vista':
-                estado_fijar_vista = not estado_fijar_vista
-            if estado_fijar_vista:
-                estilo_fijar = {'backgroundColor': "#f01717",
-                                'color': 'white', 'fontWeight': 'bold',
-                                'borderRadius': '4px',
-                                'border': 'none',
-                                'padding': '8px 15px'}
-            else:
-                estilo_fijar = {'backgroundColor': "#7C8085",
-                                'color': 'white',
-                                'fontWeight': 'bold',
-                                'borderRadius': '4px',
-                                'border': 'none',
-                                'padding': '8px 15px'}
-        except Exception as e:
-            print(f"[WARNING] Error en lógica de vista: {e}")
-            curvas_enfasis = []
-            estado_fijar_vista = False
-            estilo_fijar = {'backgroundColor': "#7C8085",
-                            'color': 'white',
-                            'fontWeight': 'bold',
-                            'borderRadius': '4px',
-                            'border': 'none',
-                            'padding': '8px 15px'}
-    except Exception as e:
-        print(f"[ERROR] Error en preparación de datos: {e}")
-        return generar_graficos_vacios()
-
-######################################################################################################################################
-                                        # --- Gráfico de tiempo con manejo de errores ---
-
-    try:
-
-        # Usar siempre la función optimizada (maneja automáticamente datasets grandes y pequeños)
-        from dynamic_stiffness_analyzer.visualization.time_plot import generar_grafico_tiempo_optimizado
-        fig_tiempo = generar_grafico_tiempo_optimizado(df, seleccion_multi, df_original, filtro_aplicado, df_corte_json)
-    except Exception as e:
-        print(f"[ERROR] Error generando gráfico de tiempo: {e}")
-        fig_tiempo = generar_figura_vacia("Error en gráfico de tiempo")
-
-######################################################################################################################################
-                                            # --- Gráfico FFT con manejo de errores ---
-
-    try:
-
-        # Usar siempre la función adaptativa (maneja automáticamente caché y optimización)
-        from dynamic_stiffness_analyzer.visualization.fft_plot import generar_grafico_fft_optimizado
-        fig_fft = generar_grafico_fft_optimizado(df, seleccion_multi, escala_x, escala_y)
-    except Exception as e:
-        print(f"[ERROR] Error generando gráfico FFT: {e}")
-        fig_fft = generar_figura_vacia("Error en gráfico FFT")
-
-######################################################################################################################################
-                                        # --- Gráfico 3D waterfall con manejo de errores ---
-
-    try:
-        if df_corte_json is not None and df_corte_json != '':
-            df_waterfall_json = df_corte_json
-        elif df_filtrado_json is not None and df_filtrado_json != '':
-            df_waterfall_json = df_filtrado_json
-        else:
-            df_waterfall_json = df_json
-
-        # FORZAR limpieza del caché para aplicar correcciones de frecuencias
-        if USAR_CACHE:
-            cache_computacional.limpiar_cache()
-            print("[DEBUG] Caché limpiado forzadamente para aplicar correcciones de waterfall")
-
-        # Función que detecta automáticamente si necesita optimización
-        from dynamic_stiffness_analyzer.visualization.waterfall_plot import generar_waterfall_adaptativo
-        fig_waterfall, datos_waterfall = generar_waterfall_adaptativo(df_waterfall_json, seleccion_eje, escala_x, escala_y, curvas_enfasis, estado_fijar_vista, duracion_segmento)
-
-        # Opciones de curvas para el selector
-        opciones_curvas = []
-        if datos_waterfall and isinstance(datos_waterfall, list):
-            try:
-
-                # Agrupar por segmento para evitar duplicados
-                segmentos_unicos = {}
-                for d in datos_waterfall:
-                    if isinstance(d, dict) and 'segmento' in d and 'tiempo_central' in d:
-                        seg = d['segmento']
-                        if seg not in segmentos_unicos:
-                            segmentos_unicos[seg] = d['tiempo_central']
-                opciones_curvas += [{'label': f'Curva {seg} - {tiempo:.2f}s', 'value': str(seg - 1)}
-                                    for seg, tiempo in sorted(segmentos_unicos.items())]
-            except Exception as e:
-                print(f"[WARNING] Error generando opciones de curvas: {e}")
-                opciones_curvas = []
-        actualizar_graficos.datos_waterfall = datos_waterfall
-    except Exception as e:
-        print(f"[ERROR] Error generando waterfall: {e}")
-        fig_waterfall = generar_figura_vacia("Error en gráfico Waterfall")
-        opciones_curvas = []
-        datos_waterfall = []
-
-    # Mapas de color y etiquetas para los ejes
-    color_map = {'accel_x': 'red', 'accel_y': 'green', 'accel_z': 'blue'}
-    label_map = {'accel_x': 'X', 'accel_y': 'Y', 'accel_z': 'Z'}
-
-######################################################################################################################################
-                                # --- Cálculo de rigidez dinámica y variables asociadas ---
-
-    try:
-
-        # Inicializar variables para caso de error
-        fK = np.array([])
-        S_ff = np.array([])
-        magK = np.array([])
-        phaseK = np.array([])
-        fig_damping = html.Div("Sin datos para calcular amortiguamiento")
-
-        # Verificar que el eje seleccionado es válido y existe en el DataFrame
-        if seleccion_eje in ['accel_x', 'accel_y',
-                             'accel_z'] and seleccion_eje in df.columns and 'fuerza' in df.columns:
-
-            # Verificar que hay suficientes datos para FRF
-            if len(df) < 1024:  # Mínimo para análisis espectral
-                print(f"[WARNING] Insuficientes datos para FRF: {len(df)} puntos")
-                raise ValueError("Insuficientes datos para análisis FRF")
-
-            # Validar y usar masa del martillo desde input del usuario
-            MASA_MARTILLO_KG, _ = validar_masa_martillo(masa_martillo)
-
-            # Obtener señales con validación
-            fuerza_g = df['fuerza'].values
-            accel_g = df[seleccion_eje].values
-
-            # Verificar que las señales no están vacías y tienen valores finitos
-            if len(fuerza_g) == 0 or len(accel_g) == 0:
-                raise ValueError("Señales vacías")
-            if not np.isfinite(fuerza_g).any() or not np.isfinite(accel_g).any():
-                raise ValueError("Señales contienen solo valores no finitos")
-
-            # Ventaneo de fuerza y aceleración antes de análisis de FRF
-            fuerza_g = ventana_fuerza_adaptativa(fuerza_g, fs)
-            fuerza_N = fuerza_g * MASA_MARTILLO_KG * 9.81
-            accel_g = ventana_exponencial(accel_g, fs)
-            accel = accel_g * 9.81
-
-            # Verificar que las señales ventaneadas siguen siendo válidas
-            if not np.isfinite(fuerza_N).any() or not np.isfinite(accel).any():
-                raise ValueError("Señales inválidas después de ventaneo")
-
-            # Parámetros adaptativos para Welch según longitud de datos
-            nperseg = min(1024, len(df) // 6)  # Al menos 6 segmentos
-            nperseg = max(256, nperseg)  # Mínimo 256 puntos por segmento
-            noverlap = nperseg // 2
-            print(f"[DEBUG] Parámetros Welch: nperseg={nperseg}, noverlap={noverlap}")
-
-            # Cálculo de espectros
-            fK, S_ff = welch(fuerza_N, fs=fs, window='hann', nperseg=nperseg, noverlap=noverlap)
-            _, S_xf = csd(accel, fuerza_N, fs=fs, window='hann', nperseg=nperseg, noverlap=noverlap)
-            _, S_xx = welch(accel, fs=fs, window='hann', nperseg=nperseg, noverlap=noverlap)
-
-            # Verificar que los espectros son válidos
-            if len(fK) == 0 or not np.isfinite(S_ff).any() or not np.isfinite(S_xf).any() or not np.isfinite(
-                    S_xx).any():
-                raise ValueError("Espectros inválidos")
-
-            # Estimadores robustos de FRF usando los espectros calculados
-            from dynamic_stiffness_analyzer.analysis.frf import (
-                calculate_H1,
-                calculate_H2,
-                calculate_coherence,
-                calculate_Hv,
-            )
-
-            from dynamic_stiffness_analyzer.analysis.dynamic_stiffness import detect_antiresonances, calculate_dynamic_stiffness_robust
-            print(f"[DEBUG] Espectros calculados: fK shape={fK.shape}, S_ff shape={S_ff.shape}")
-
-            # Selección del estimador usando las funciones
-            H_frf = calculate_Hv(S_ff, S_xx, S_xf)
-        else:
-            print(f"[INFO] Eje {seleccion_eje} no válido o columnas faltantes para FRF")
-    except Exception as e:
-        print(f"[ERROR] Error en cálculo de FRF: {e}")
-
-        # Mantener variables inicializadas para evitar errores posteriores
-        fK = np.array([])
-        S_ff = np.array([])
-        magK = np.array([])
-        phaseK = np.array([])
-        fig_damping = html.Div(f"Error calculando amortiguamiento: {str(e)[:100]}")
-
-    # Continuar con el cálculo de rigidez dinámica si hay datos válidos
-    if len(fK) > 0 and len(S_ff) > 0:
-        try:
-
-            # Selección del estimador usando las funciones
-            H_frf = calculate_Hv(S_ff, S_xx, S_xf)
-
-            # Rigidez dinámica
-            K_disp = calculate_dynamic_stiffness_robust(H_frf, fK, fK, S_ff, S_xx, S_xf)
-            magK = np.abs(K_disp)
-            phaseK = np.angle(K_disp, deg=True)
-
-######################################################################################################################################
-                                    # --- Visualización de tablas de amortiguamiento ---
-
-            try:
-                from dynamic_stiffness_analyzer.analysis.damping import calculo_amortiguamiento
-                resultado_amort = calculo_amortiguamiento(df[seleccion_eje].values, fs, frecuencias_centrales)
-                modos = resultado_amort.get('modos', [])
-                zeta_global = resultado_amort.get('zeta_global', None)
-                mensajes = resultado_amort.get('mensajes', [])
-            except Exception as e:
-                print(f"[WARNING] Error en cálculo de amortiguamiento: {e}")
-                modos = []
-                zeta_global = None
-                mensajes = [f"Error en cálculo: {str(e)[:50]}"]
-
-            def fmt(val, dec=4):
-                if val is None or (isinstance(val, float) and (np.isnan(val) or np.isinf(val))):
-                    return '---'
-                return f"{val:.{dec}f}"
-
-            # Tabla de modos (frecuencia y zeta modal)
-            data_modos = []
-            for modo in modos:
-                data_modos.append({
-                    "Frecuencia (Hz)": fmt(modo.get('frecuencia')),
-                    "ζ modal": fmt(modo.get('zeta'))})
-            if not data_modos:
-                data_modos = [{"Frecuencia (Hz)": '---', "ζ modal": '---'}]
-            tabla_modos = dash_table.DataTable(columns=[{"name": "Frecuencia (Hz)", "id": "Frecuencia (Hz)"},
-                                                        {"name": "ζ modal", "id": "ζ modal"}],
-                                               data=data_modos, style_header={"backgroundColor": "#222",
-                                                                              "color": "white",
-                                                                              "fontWeight": "bold",
-                                                                              "fontSize": 16},
-                                               style_cell={"backgroundColor": "#333",
-                                                           "color": "white",
-                                                           "textAlign": "center",
-                                                           "fontSize": 15},
-                                               style_table={"width": "100%",
-                                                            "marginBottom": "20px"},
-                                              )
-
-            # Tabla resumen global (ζ global y amortiguamiento físico por unidad de masa C/m)
-            # Cálculo de C/m = 2*zeta*2*pi*f (N·s/mm), usando la frecuencia del primer modo detectado
-            if zeta_global is not None and len(modos) > 0 and modos[0].get('frecuencia') is not None:
-                freq_1 = modos[0]['frecuencia']
-                zeta_g = zeta_global
-                c_m = 2 * zeta_g * 2 * np.pi * freq_1  # N·s/m
-                c_m_str = f"{c_m:.6f}"
-            else:
-                c_m_str = '---'
-            data_global = [
-                {"ζ global": fmt(zeta_global), "Amortiguamiento físico (por unidad de masa, C/m) [N·s/m]": c_m_str}]
-            tabla_global = dash_table.DataTable(columns=[{"name": "ζ global", "id": "ζ global"},
-                                                         {"name": "Amortiguamiento físico (por unidad de masa, C/m) [N·s/m]",
-                                                          "id": "Amortiguamiento físico (por unidad de masa, C/m) [N·s/m]"}],
-                                                data=data_global, style_header={"backgroundColor": "#222",
-                                                                                "color": "white",
-                                                                                "fontWeight": "bold",
-                                                                                "fontSize": 16},
-                                                style_cell={"backgroundColor": "#333",
-                                                            "color": "white",
-                                                            "textAlign": "center",
-                                                            "fontSize": 15},
-                                                style_table={"width": "100%",
-                                                             "marginBottom": "20px"},
-                                               )
-
-            # Mostrar ambas tablas una debajo de la otra
-            tablas_amort = html.Div([
-                html.H4("Resumen global", style={"color": "white",
-                                                 "marginBottom": "5px",
-                                                 "marginTop": "0"}),
-                tabla_global,
-                html.H4("Resumen Modal", style={"color": "white",
-                                                "marginBottom": "5px",
-                                                "marginTop": "20px"}),
-                tabla_modos,
-                html.Div([
-                    html.Div(msg, style={"color": "orange",
-                                         "fontWeight": "bold",
-                                         "marginTop": "10px"}) for msg in mensajes
-                         ]) if mensajes else None
-                                    ])
-            fig_damping = tablas_amort
-        except Exception as e:
-            print(f"[ERROR] Error en cálculo avanzado de rigidez: {e}")
-
-            # Valores por defecto en caso de error
-            magK = np.array([])
-            phaseK = np.array([])
-            fig_damping = html.Div([
-                html.H4("Error en cálculo de amortiguamiento", style={"color": "red",
-                                                                      "marginBottom": "5px"}),
-                html.Div(f"Error: {str(e)[:100]}", style={"color": "white",
-                                                          "textAlign": "center"})])
-    else:
-
-        # Sin datos válidos para FRF - valores por defecto seguros
-        fK = np.array([])
-        S_ff = np.array([])
-        magK = np.array([])
-        phaseK = np.array([])
-        fig_damping = html.Div("Sin datos suficientes para análisis de rigidez dinámica", style={"color": "orange",
-                                                                                                 "textAlign": "center",
-                                                                                                 "padding": "20px"})
-
-    # Generación del gráfico de rigidez dinámica
-    try:
-        if fK.size > 0 and S_ff.size > 0 and magK.size > 0 and phaseK.size > 0:
-            if not (np.isfinite(fK).any() and np.isfinite(S_ff).any() and np.isfinite(magK).any() and np.isfinite(phaseK).any()):
-                raise ValueError("Arrays contienen solo valores no finitos")
-            umbral_Sff = max(CONFIG.UMBRALES_DATOS['MIN_AMPLITUD_RUIDO'], CONFIG.UMBRALES_DATOS['FACTOR_UMBRAL_SFF'] * np.max(S_ff[np.isfinite(S_ff)]))
-            mask = (fK >= CONFIG.LIMITES_FISICOS['FREQ_MIN']) & (S_ff > umbral_Sff) & np.isfinite(fK) & np.isfinite(S_ff)
-            if not np.any(mask):
-                raise ValueError("No hay datos válidos después de filtrar")
-            f_plot = fK[mask]
-            mag_plot = magK[mask]
-            phase_plot = phaseK[mask]
-            if len(f_plot) == 0 or not np.isfinite(mag_plot).any():
-                raise ValueError("Sin datos válidos para graficar")
-            from dynamic_stiffness_analyzer.visualization.stiffness_plot import generar_grafico_rigidez
-            fig_disp = generar_grafico_rigidez(f_plot, mag_plot, phase_plot, seleccion_eje, escala_x, escala_y)
-        else:
-            raise ValueError("Sin datos válidos para generar gráfico de rigidez")
-    except Exception as e:
-        print(f"[ERROR] Error generando gráfico de rigidez dinámica: {e}")
-        from dynamic_stiffness_analyzer.visualization.shared import generar_figura_vacia
-        fig_disp = generar_figura_vacia("Error en gráfico de rigidez dinámica")
-
-######################################################################################################################################
-                                                    # --- Gráfico de coherencia ROBUSTO ---
+                                        # --- Callbacks de gráficos (uno por figura) ---
 
-    try:
-        from dynamic_stiffness_analyzer.visualization.coherence_plot import generar_grafico_coherencia
-        fig_coherencia = generar_grafico_coherencia(fK, S_ff if 'S_ff' in locals() else np.array([]), S_xx if 'S_xx' in locals() else np.array([]), S_xf if 'S_xf' in locals() else np.array([]))
-    except Exception as e:
-        print(f"[ERROR] Error generando gráfico de coherencia: {e}")
-        from dynamic_stiffness_analyzer.visualization.shared import generar_figura_vacia
-        fig_coherencia = generar_figura_vacia("Error en gráfico de coherencia")
+# Cada figura tiene su propio callback con sus entradas reales y comparte los resultados
+# intermedios memoizados (dataset, tiempo, FRF, amortiguamiento) a través de SESION; los pesados se
+# precalculan en segundo plano (progreso en 'procesamiento-estado', cancelación de trabajos obsoletos)
+from dynamic_stiffness_analyzer.ui.callbacks.graphs import actualizar_waterfall, registrar_callbacks_graficos
+from dynamic_stiffness_analyzer.ui.callbacks.processing import registrar_callbacks_procesamiento
+from dynamic_stiffness_analyzer.ui.callbacks.local_files import registrar_callbacks_archivos_locales
+from dynamic_stiffness_analyzer.ui.callbacks.profiling import registrar_callbacks_perfilado
 
-    # Retorno final con manejo de errores
-    try:
-        return (fig_tiempo, fig_fft, fig_waterfall, fig_damping, fig_disp, fig_coherencia, curvas_enfasis, opciones_curvas,
-                estado_fijar_vista, estilo_fijar, mediana_val, highpass_val, bandpass_multibanda)
-    except Exception as e:
-        print(f"[ERROR CRÍTICO] Error en retorno final: {e}")
-        from dynamic_stiffness_analyzer.visualization.shared import generar_graficos_vacios
-        return generar_graficos_vacios()
+registrar_callbacks_graficos(app)
+registrar_callbacks_procesamiento(app)
+registrar_callbacks_archivos_locales(app)
+registrar_callbacks_perfilado(app)
 
 ######################################################################################################################################
                                             # --- (Amortiguamiento extraído a analysis/damping.py) ---
@@ -1862,9 +1290,9 @@ def mostrar_progreso_simple(mensaje, puntos_totales, puntos_finales=None):
     # Muestra información simple de progreso en consola.
     if puntos_finales:
         reduccion = ((puntos_totales - puntos_finales) / puntos_totales) * 100
-        print(f"[OPTIMIZACIÓN] {mensaje} - {puntos_totales:,} → {puntos_finales:,} puntos ({reduccion:.1f}% reducción)")
+        logger.debug("%s - %d → %d puntos (%.1f%% reducción)", mensaje, puntos_totales, puntos_finales, reduccion)
     else:
-        print(f"[PROGRESO] {mensaje} - Procesando {puntos_totales:,} puntos")
+        logger.debug("%s - Procesando %d puntos", mensaje, puntos_totales)
 
 ######################################################################################################################################
 ######################################################################################################################################
@@ -1921,6 +1349,8 @@ def generar_grafico_tiempo_optimizado(df, seleccion_multi, df_original=None, fil
     return fig_tiempo
 
 def generar_grafico_fft_optimizado(df, seleccion_multi, escala_x, escala_y):
+    from scipy.signal import get_window
+
     fig_fft = go.Figure()
     if df is None or df.empty:
         return fig_fft
@@ -1928,12 +1358,12 @@ def generar_grafico_fft_optimizado(df, seleccion_multi, escala_x, escala_y):
 
     # cálculo dt y fs
     if len(t) < 2:
-        print("[WARNING] Insuficientes puntos de tiempo para FFT")
+        logger.warning("Insuficientes puntos de tiempo para FFT")
         return fig_fft
     dt_values = np.diff(t)
     dt_values_valid = dt_values[dt_values > 0]
     if len(dt_values_valid) == 0:
-        print("[ERROR] No hay intervalos de tiempo válidos para FFT")
+        logger.error("No hay intervalos de tiempo válidos para FFT")
         return fig_fft
     dt = np.median(dt_values_valid)
     if dt <= 0 or not np.isfinite(dt):
@@ -1941,11 +1371,11 @@ def generar_grafico_fft_optimizado(df, seleccion_multi, escala_x, escala_y):
         # Fallback: calcular desde rango total
         dt = (t[-1] - t[0]) / (len(t) - 1) if len(t) > 1 else 0.001
         if dt <= 0:
-            print("[WARNING] dt inválido en FFT - usando valor por defecto")
+            logger.warning("dt inválido en FFT - usando valor por defecto")
             dt = 0.001  # 1ms por defecto
     fs = 1 / dt
-    print(f"[DEBUG] FFT - dt={dt:.6f}, fs={fs:.2f} Hz")
-    print(f"[DEBUG] FFT usa TODOS los {len(df):,} puntos disponibles (sin limitación)")
+    logger.debug("FFT - dt=%.6f, fs=%.2f Hz", dt, fs)
+    logger.debug("FFT usa TODOS los %d puntos disponibles (sin limitación)", len(df))
     for col in seleccion_multi:
         if col not in df.columns:
             continue
@@ -1953,14 +1383,14 @@ def generar_grafico_fft_optimizado(df, seleccion_multi, escala_x, escala_y):
 
         # Validar que la señal no esté vacía o sea toda NaN
         if len(y) == 0 or not np.isfinite(y).any():
-            print(f"[WARNING] Saltando columna {col}: datos inválidos para FFT")
+            logger.warning("Saltando columna %s: datos inválidos para FFT", col)
             continue
-        print(f"[DEBUG] Procesando columna: {col}")
+        logger.debug("Procesando columna: %s", col)
         try:
 
             # Ventaneo exponencial para análisis correcto de aceleración
             if col.startswith('accel_'):
-                print(f"[DEBUG] REACTIVANDO ventana exponencial para {col}")
+                logger.debug("REACTIVANDO ventana exponencial para %s", col)
                 y_proc = ventana_exponencial(y, fs)
 
                 # y_proc = y  # <- Línea comentada para mantener la ventana exponencial
@@ -1970,11 +1400,11 @@ def generar_grafico_fft_optimizado(df, seleccion_multi, escala_x, escala_y):
             else:
                 y_proc = y
         except Exception as e:
-            print(f"[WARNING] Error en ventaneo para {col}: {e}")
+            logger.warning("Error en ventaneo para %s: %s", col, e)
             y_proc = y
         N = len(y_proc)
         if N < 4:  # Mínimo para FFT
-            print(f"[WARNING] Insuficientes puntos para FFT en {col}: {N}")
+            logger.warning("Insuficientes puntos para FFT en %s: %s", col, N)
             continue
         try:
             yf = rfft(y_proc * get_window('hann', N))
@@ -1983,7 +1413,7 @@ def generar_grafico_fft_optimizado(df, seleccion_multi, escala_x, escala_y):
 
             # Validar que FFT es utilizable
             if not np.isfinite(amp).any() or not np.isfinite(xf).any():
-                print(f"[WARNING] FFT inválida para {col}")
+                logger.warning("FFT inválida para %s", col)
                 continue
             if escala_y == 'db':
                 amp = 20 * np.log10(np.maximum(amp, 1e-12))
@@ -1998,14 +1428,14 @@ def generar_grafico_fft_optimizado(df, seleccion_multi, escala_x, escala_y):
                 step_visual = max(1, len(xf) // CONFIG.VISUALIZACION['REDUCCION_VISUAL_FFT'])
                 xf_visual = xf[::step_visual]
                 amp_visual = amp[::step_visual]
-                print(f"[DEBUG] FFT visual: {len(xf)} → {len(xf_visual)} puntos (preserva resolución hasta {xf[-1]:.0f} Hz)")
+                logger.debug("FFT visual: %s → %s puntos (preserva resolución hasta %.0f Hz)", len(xf), len(xf_visual), xf[-1])
             else:
                 xf_visual = xf
                 amp_visual = amp
-                print(f"[DEBUG] FFT completa: {len(xf)} puntos hasta {xf[-1]:.0f} Hz")
+                logger.debug("FFT completa: %s puntos hasta %.0f Hz", len(xf), xf[-1])
             fig_fft.add_trace(go.Scatter(x=xf_visual, y=amp_visual, mode='lines', name=col))
         except Exception as e:
-            print(f"[ERROR] Error en FFT para {col}: {e}")
+            logger.error("Error en FFT para %s: %s", col, e)
             continue
 
     # Título con rango real
@@ -2021,20 +1451,22 @@ def generar_waterfall_optimizado(df_json, seleccion_eje, escala_x, escala_y, cur
     Versión optimizada del gráfico 3D waterfall que detecta automáticamente si necesita optimización.
     Adapta la resolución según el tamaño del dataset para mantener el rendimiento.
     """
+    from scipy.signal import get_window
+
     try:
         if df_json is None or df_json == '':
-            print("[WARNING] df_json vacío en waterfall")
+            logger.warning("df_json vacío en waterfall")
             return go.Figure(), []
-        df_actual = pd.read_json(df_json, orient='split')
-        if df_actual.empty or seleccion_eje not in df_actual.columns:
-            print(f"[WARNING] DataFrame vacío o columna {seleccion_eje} no encontrada")
+        df_actual = leer_dataset(df_json)
+        if df_actual is None or df_actual.empty or seleccion_eje not in df_actual.columns:
+            logger.warning("DataFrame vacío o columna %s no encontrada", seleccion_eje)
             return go.Figure(), []
         t = df_actual['tiempo'].values
         y_wf = df_actual[seleccion_eje].values
 
         # Validación de datos básicos
         if len(t) < 2 or len(y_wf) < 2:
-            print("[WARNING] Insuficientes datos para waterfall")
+            logger.warning("Insuficientes datos para waterfall")
             return go.Figure(), []
 
         # Cálculo robusto de dt y fs
@@ -2049,7 +1481,7 @@ def generar_waterfall_optimizado(df_json, seleccion_eje, escala_x, escala_y, cur
         fs = 1 / dt
         N = len(y_wf)
         nyquist_freq = fs / 2  # Añadido para evitar error de variable no definida
-        print(f"[DEBUG] Waterfall - N={N}, dt={dt:.6f}, fs={fs:.2f}")
+        logger.debug("Waterfall - N=%s, dt=%.6f, fs=%.2f", N, dt, fs)
 
         # Lógica restaurada: el usuario controla window_len por input, solo se fuerza el mínimo físico
         min_window = CONFIG.TOLERANCIAS['MIN_DURACION_SEGMENTO']
@@ -2070,9 +1502,10 @@ def generar_waterfall_optimizado(df_json, seleccion_eje, escala_x, escala_y, cur
             segment_starts = [segment_starts[i] for i in indices]
 
         # Debug: número de segmentos y eje de tiempo
-        print(f"[DEBUG] Número de segmentos: {len(segment_starts)}")
-        print(f"[DEBUG] Duración de cada segmento: {window_len/fs:.2f} s")
-        print(f"[DEBUG] Eje de tiempo waterfall: {[round((t[start] + t[min(start + window_len, N)-1]) / 2, 2) for start in segment_starts]}")
+        logger.debug("Número de segmentos: %s", len(segment_starts))
+        logger.debug("Duración de cada segmento: %.2f s", window_len/fs)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Eje de tiempo waterfall: %s", [round((t[start] + t[min(start + window_len, N)-1]) / 2, 2) for start in segment_starts])
 
         # Procesamiento de segmentos
         segments_data = []
@@ -2111,8 +1544,8 @@ def generar_waterfall_optimizado(df_json, seleccion_eje, escala_x, escala_y, cur
 
             # Debug del primer segmento
             if i == 0:
-                print(f"[DEBUG] Rango frecuencias segmento 1: {freqs_plot[0]:.2f} - {freqs_plot[-1]:.2f} Hz ({len(freqs_plot)} puntos)")
-                print(f"[DEBUG] Frecuencia máxima teórica (Nyquist): {fs / 2:.2f} Hz")
+                logger.debug("Rango frecuencias segmento 1: %.2f - %.2f Hz (%s puntos)", freqs_plot[0], freqs_plot[-1], len(freqs_plot))
+                logger.debug("Frecuencia máxima teórica (Nyquist): %.2f Hz", fs / 2)
 
             # Determinar estilo según énfasis
             if not curvas_enfasis or str(i) in curvas_enfasis:
@@ -2198,10 +1631,10 @@ def generar_waterfall_optimizado(df_json, seleccion_eje, escala_x, escala_y, cur
             fig_waterfall.update_layout(title=dict(text=titulo, font=dict(color='white', size=16)), scene=scene_config,
                                         paper_bgcolor='#111111', plot_bgcolor='black',  # Fondo negro
                                         font=dict(color='white'), margin=dict(l=0, r=0, t=50, b=0))
-        print(f"[DEBUG] Waterfall completado: {len(segment_starts)} segmentos, {len(segments_data)} puntos")
+        logger.debug("Waterfall completado: %s segmentos, %s puntos", len(segment_starts), len(segments_data))
         return fig_waterfall, segments_data
     except Exception as e:
-        print(f"[ERROR] Error crítico en waterfall: {e}")
+        logger.error("Error crítico en waterfall: %s", e)
         traceback.print_exc()
         fig_vacio = go.Figure()
         fig_vacio.update_layout(title=f"Error en Waterfall: {str(e)[:50]}",
@@ -2229,21 +1662,19 @@ def generar_grafico_fft_con_cache(df, seleccion_multi, escala_x, escala_y):
         data_hash = None
         if df is not None and not df.empty:
 
-            # Usar una muestra de los datos para el hash (más eficiente)
-            sample_data = df.iloc[::max(1, len(df) // 1000)].to_string()  # Muestra cada 1000 puntos
-            params = f"{sample_data}_{seleccion_multi}_{escala_x}_{escala_y}"
-            data_hash = cache_computacional.generar_hash_parametros(params)
+            # Huella exacta del contenido completo y de los parámetros
+            data_hash = cache_computacional.generar_hash_parametros('fft', df, seleccion_multi, escala_x, escala_y)
 
         # Intentar obtener del caché
         if data_hash:
             resultado_cache = cache_computacional.obtener_de_cache(data_hash)
             if resultado_cache is not None:
-                print(
-                    f"[CACHE] FFT obtenida del caché (hit rate: {cache_computacional.estadisticas_cache()['hit_rate']:.1f}%)")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("FFT obtenida del caché (hit rate: %.1f%%)", cache_computacional.estadisticas_cache()['hit_rate'])
                 return resultado_cache
 
         # Si no está en caché, calcular usando la función original
-        print("[CACHE] Calculando nueva FFT...")
+        logger.debug("Calculando nueva FFT...")
         resultado = generar_grafico_fft_optimizado(df, seleccion_multi, escala_x, escala_y)
 
         # Guardar en caché
@@ -2251,7 +1682,7 @@ def generar_grafico_fft_con_cache(df, seleccion_multi, escala_x, escala_y):
             cache_computacional.guardar_en_cache(data_hash, resultado)
         return resultado
     except Exception as e:
-        print(f"[CACHE] Error en caché FFT, usando función original: {e}")
+        logger.warning("Error en caché FFT, usando función original: %s", e)
         return generar_grafico_fft_optimizado(df, seleccion_multi, escala_x, escala_y)
 
 def generar_waterfall_con_cache(df_json, seleccion_eje, escala_x, escala_y, curvas_enfasis, estado_fijar_vista,
@@ -2269,20 +1700,21 @@ def generar_waterfall_con_cache(df_json, seleccion_eje, escala_x, escala_y, curv
         data_hash = None
         if df_json and df_json != '':
 
-            # Usar hash del JSON y parámetros
-            params = f"{df_json[:1000]}_{seleccion_eje}_{escala_x}_{escala_y}_{curvas_enfasis}_{estado_fijar_vista}_{duracion_segmento}"
-            data_hash = cache_computacional.generar_hash_parametros(params)
+            # Huella exacta del dataset (contenido de las columnas) y de los parámetros
+            data_hash = cache_computacional.generar_hash_parametros(
+                'waterfall', leer_dataset(df_json), seleccion_eje, escala_x, escala_y, curvas_enfasis,
+                estado_fijar_vista, duracion_segmento)
 
         # Intentar obtener del caché
         if data_hash:
             resultado_cache = cache_computacional.obtener_de_cache(data_hash)
             if resultado_cache is not None:
-                print(
-                    f"[CACHE] Waterfall obtenido del caché (hit rate: {cache_computacional.estadisticas_cache()['hit_rate']:.1f}%)")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Waterfall obtenido del caché (hit rate: %.1f%%)", cache_computacional.estadisticas_cache()['hit_rate'])
                 return resultado_cache
 
         # Si no está en caché, calcular usando la función original
-        print("[CACHE] Calculando nuevo waterfall...")
+        logger.debug("Calculando nuevo waterfall...")
         resultado = generar_waterfall_optimizado(df_json, seleccion_eje, escala_x, escala_y, curvas_enfasis, estado_fijar_vista,
                                                  duracion_segmento)
 
@@ -2291,23 +1723,24 @@ def generar_waterfall_con_cache(df_json, seleccion_eje, escala_x, escala_y, curv
             cache_computacional.guardar_en_cache(data_hash, resultado)
         return resultado
     except Exception as e:
-        print(f"[CACHE] Error en caché waterfall, usando función original: {e}")
+        logger.warning("Error en caché waterfall, usando función original: %s", e)
         return generar_waterfall_optimizado(df_json, seleccion_eje, escala_x, escala_y, curvas_enfasis, estado_fijar_vista,
                                             duracion_segmento)
 
 def limpiar_cache_si_necesario(forzar=False):
-    # Limpia el caché cuando sea necesario para liberar memoria.
+    # Limpia el caché si se fuerza; el LRU ya desaloja por bytes y entradas sin vaciarlo entero.
     try:
         stats = cache_computacional.estadisticas_cache()
-        if forzar or stats['cache_size'] >= cache_computacional.max_cache_size * 0.9:
+        if forzar:
             cache_computacional.limpiar_cache()
-            print(f"[CACHE] Caché limpiado. Estadísticas previas: {stats}")
+            logger.debug("Caché limpiado. Estadísticas previas: %s entradas, %.1f MiB", stats['cache_size'], stats['bytes_totales'] / 1024 ** 2)
             return True
         if stats['hits'] + stats['misses'] > 0:
-            print(f"[CACHE] Stats: {stats['hits']} hits, {stats['misses']} misses, {stats['hit_rate']:.1f}% hit rate, {stats['cache_size']} entradas")
+            logger.debug("Stats: %s hits, %s misses, %.1f%% hit rate, %s entradas, %.1f/%.0f MiB", stats['hits'], stats['misses'],
+                         stats['hit_rate'], stats['cache_size'], stats['bytes_totales'] / 1024 ** 2, stats['max_bytes'] / 1024 ** 2)
         return False
     except Exception as e:
-        print(f"[CACHE] Error al limpiar caché: {e}")
+        logger.warning("Error al limpiar caché: %s", e)
         return False
 
 ######################################################################################################################################
@@ -2329,13 +1762,15 @@ def generar_grafico_fft_adaptativo(df, seleccion_multi, escala_x, escala_y):
 def generar_waterfall_adaptativo(df_json, seleccion_eje, escala_x, escala_y, curvas_enfasis, estado_fijar_vista,
                                  duracion_segmento=None):
     
+    from scipy.signal import get_window
+
     # Función waterfall 3D original sin complicaciones innecesarias
-    print("[DEBUG] *** WATERFALL 3D GENERALIZADO - RANGO COMPLETO DE FRECUENCIAS ***")
+    logger.debug("*** WATERFALL 3D GENERALIZADO - RANGO COMPLETO DE FRECUENCIAS ***")
     try:
         if df_json is None or df_json == '':
             return go.Figure(), []
-        df_actual = pd.read_json(df_json, orient='split')
-        if df_actual.empty or seleccion_eje not in df_actual.columns:
+        df_actual = leer_dataset(df_json)
+        if df_actual is None or df_actual.empty or seleccion_eje not in df_actual.columns:
             return go.Figure(), []
         t = df_actual['tiempo'].values
         y_wf = df_actual[seleccion_eje].values
@@ -2359,16 +1794,16 @@ def generar_waterfall_adaptativo(df_json, seleccion_eje, escala_x, escala_y, cur
 
         # Si hay irregularidad > 5%, recalcular dt
         if irregularidad_relativa > 0.05:
-            print(f"[DEBUG] Waterfall detecta irregularidad temporal: {irregularidad_relativa*100:.2f}%")
+            logger.debug("Waterfall detecta irregularidad temporal: %.2f%%", irregularidad_relativa*100)
 
             # Usar el mismo dt que el del analisis principal
             dt_corregido = (t[-1] - t[0]) / (len(t) - 1) if len(t) > 1 else dt
             dt = dt_corregido
-            print(f"[DEBUG] Waterfall dt corregido: {dt:.6f} s")
+            logger.debug("Waterfall dt corregido: %.6f s", dt)
         fs = 1 / dt
         N = len(y_wf)
         nyquist_freq = fs / 2
-        print(f"[DEBUG] Waterfall corregido - N={N}, dt={dt:.6f}, fs={fs:.2f} Hz, Nyquist={nyquist_freq:.2f} Hz")
+        logger.debug("Waterfall corregido - N=%s, dt=%.6f, fs=%.2f Hz, Nyquist=%.2f Hz", N, dt, fs, nyquist_freq)
 
         # Segmentación para garantizar rango completo
 
@@ -2389,9 +1824,10 @@ def generar_waterfall_adaptativo(df_json, seleccion_eje, escala_x, escala_y, cur
             segment_starts = [segment_starts[i] for i in indices]
 
         # Debug: número de segmentos y eje de tiempo
-        print(f"[DEBUG] Número de segmentos: {len(segment_starts)}")
-        print(f"[DEBUG] Duración de cada segmento: {window_len/fs:.2f} s")
-        print(f"[DEBUG] Eje de tiempo waterfall: {[round((t[start] + t[min(start + window_len, N)-1]) / 2, 2) for start in segment_starts]}")
+        logger.debug("Número de segmentos: %s", len(segment_starts))
+        logger.debug("Duración de cada segmento: %.2f s", window_len/fs)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Eje de tiempo waterfall: %s", [round((t[start] + t[min(start + window_len, N)-1]) / 2, 2) for start in segment_starts])
 
         # Procesamiento de segmentos
         segments_data = []
@@ -2419,15 +1855,15 @@ def generar_waterfall_adaptativo(df_json, seleccion_eje, escala_x, escala_y, cur
 
             # Debug del primer segmento para verificar rango
             if i == 0:
-                print(f"[DEBUG] *** VERIFICACIÓN RANGO PRIMER SEGMENTO ***")
-                print(f"[DEBUG] Longitud segmento: {actual_len} puntos")
-                print(f"[DEBUG] dt utilizado: {dt:.6f} s")
-                print(f"[DEBUG] fs calculado: {fs:.2f} Hz")
-                print(f"[DEBUG] Nyquist teórico: {nyquist_freq:.2f} Hz")
-                print(f"[DEBUG] Frecuencia mínima FFT: {freqs[0]:.2f} Hz")
-                print(f"[DEBUG] Frecuencia máxima FFT: {freqs[-1]:.2f} Hz")
-                print(f"[DEBUG] Puntos de frecuencia: {len(freqs)}")
-                print(f"[DEBUG] Resolución frecuencial: {freqs[1] - freqs[0]:.2f} Hz")
+                logger.debug("*** VERIFICACIÓN RANGO PRIMER SEGMENTO ***")
+                logger.debug("Longitud segmento: %s puntos", actual_len)
+                logger.debug("dt utilizado: %.6f s", dt)
+                logger.debug("fs calculado: %.2f Hz", fs)
+                logger.debug("Nyquist teórico: %.2f Hz", nyquist_freq)
+                logger.debug("Frecuencia mínima FFT: %.2f Hz", freqs[0])
+                logger.debug("Frecuencia máxima FFT: %.2f Hz", freqs[-1])
+                logger.debug("Puntos de frecuencia: %s", len(freqs))
+                logger.debug("Resolución frecuencial: %.2f Hz", freqs[1] - freqs[0])
 
             # Escala Y
             if escala_y == 'db':
@@ -2441,11 +1877,11 @@ def generar_waterfall_adaptativo(df_json, seleccion_eje, escala_x, escala_y, cur
 
             # Debug del rango final
             if i == 0:
-                print(f"[DEBUG] *** RANGO FINAL PARA GRÁFICO ***")
-                print(f"[DEBUG] freqs_plot mín: {freqs_plot[0]:.2f} Hz")
-                print(f"[DEBUG] freqs_plot máx: {freqs_plot[-1]:.2f} Hz")
-                print(f"[DEBUG] Puntos en gráfico: {len(freqs_plot)}")
-                print(f"[DEBUG] ¿Llega hasta Nyquist?: {abs(freqs_plot[-1] - nyquist_freq) < 1.0}")
+                logger.debug("*** RANGO FINAL PARA GRÁFICO ***")
+                logger.debug("freqs_plot mín: %.2f Hz", freqs_plot[0])
+                logger.debug("freqs_plot máx: %.2f Hz", freqs_plot[-1])
+                logger.debug("Puntos en gráfico: %s", len(freqs_plot))
+                logger.debug("¿Llega hasta Nyquist?: %s", abs(freqs_plot[-1] - nyquist_freq) < 1.0)
 
             # Estilo
             if not curvas_enfasis or str(i) in curvas_enfasis:
@@ -2541,15 +1977,15 @@ def generar_waterfall_adaptativo(df_json, seleccion_eje, escala_x, escala_y, cur
             fig_waterfall.update_layout(title=dict(text=titulo, font=dict(color='white', size=16)), scene=scene_config,
                                        paper_bgcolor='#111111', plot_bgcolor='black',  # Fondo negro
                                        font=dict(color='white'), margin=dict(l=0, r=0, t=50, b=0))
-        print(f"[DEBUG] *** WATERFALL COMPLETADO ***")
-        print(f"[DEBUG] ✅ Segmentos: {len(segment_starts)}")
-        print(f"[DEBUG] ✅ Rango real mostrado: 0 - {nyquist_freq:.0f} Hz (fs={fs:.0f} Hz)")
-        print(f"[DEBUG] ✅ Colorscale geológico aplicado")
-        print(f"[DEBUG] ✅ Grid negro con líneas blancas")
-        print(f"[DEBUG] ✅ Waterfall completado: {len(segments_data)} segmentos, máx freq real: {nyquist_freq:.0f} Hz")
+        logger.debug("*** WATERFALL COMPLETADO ***")
+        logger.debug("✅ Segmentos: %s", len(segment_starts))
+        logger.debug("✅ Rango real mostrado: 0 - %.0f Hz (fs=%.0f Hz)", nyquist_freq, fs)
+        logger.debug("✅ Colorscale geológico aplicado")
+        logger.debug("✅ Grid negro con líneas blancas")
+        logger.debug("✅ Waterfall completado: %s segmentos, máx freq real: %.0f Hz", len(segments_data), nyquist_freq)
         return fig_waterfall, segments_data
     except Exception as e:
-        print(f"[ERROR] Error en waterfall: {e}")
+        logger.error("Error en waterfall: %s", e)
         fig_vacio = go.Figure()
         fig_vacio.update_layout(
             title=f"Error: {str(e)[:50]}",
@@ -2561,14 +1997,16 @@ def habilitar_cache():
     # Habilita el sistema de caché para mejor rendimiento
     global USAR_CACHE
     USAR_CACHE = True
-    print("[CACHE] Sistema de caché habilitado")
+    cache_computacional.habilitado = True
+    logger.info("Sistema de caché habilitado")
 
 def deshabilitar_cache():
     # Deshabilita el sistema de caché y limpia el caché actual
     global USAR_CACHE
     USAR_CACHE = False
+    cache_computacional.habilitado = False
     cache_computacional.limpiar_cache()
-    print("[CACHE] Sistema de caché deshabilitado y limpiado")
+    logger.info("Sistema de caché deshabilitado y limpiado")
 
 def toggle_cache():
     """Alterna el estado del sistema de caché"""
@@ -2586,7 +2024,7 @@ def generar_graficos_vacios():
     fig_vacio = go.Figure()
     fig_vacio.update_layout(title="Sin datos disponibles", paper_bgcolor='#111111', plot_bgcolor='#111111',
                             font=dict(color='white'))
-    print("[ERROR] Retornando gráficos vacíos por error o falta de datos")
+    logger.error("Retornando gráficos vacíos por error o falta de datos")
     
     # No mostrar mensajes de error en la interfaz
     return (fig_vacio, fig_vacio, fig_vacio, html.Div(),
@@ -2601,7 +2039,7 @@ def generar_graficos_vacios():
 def generar_figura_vacia(titulo="Sin datos"):
     """Genera una figura vacía con título personalizado"""
     fig = go.Figure()
-    print(f"[ERROR] {titulo}")
+    logger.error("%s", titulo)
     fig.update_layout(title="Sin datos disponibles",
                       paper_bgcolor='#111111',
                       plot_bgcolor='#111111',
@@ -2615,28 +2053,26 @@ def generar_figura_vacia(titulo="Sin datos"):
 
 if __name__ == '__main__':
 
-    # Limpiar caché automáticamente al iniciar la aplicación
-    print("[INICIO] Limpiando caché residual...")
-    cache_computacional.limpiar_cache()
-
     # forzar limpieza de memoria Python para asegurar que las correcciones tomen efecto
     gc.collect()
-    print("[INICIO] Limpieza de memoria forzada - todas las correcciones aplicadas")
+    logger.info("Limpieza de memoria forzada - todas las correcciones aplicadas")
 
     # Confirmar estado del sistema de caché
     estado_cache = "HABILITADO" if USAR_CACHE else "DESHABILITADO"
-    print(f"[CACHÉ] Sistema de caché: {estado_cache}")
+    logger.info("Sistema de caché: %s", estado_cache)
 
     if USAR_CACHE:
-        print("[CACHÉ] Caché activo - FFT y waterfall optimizados")
-        print("[CACHÉ] Estadísticas disponibles con: cache_computacional.estadisticas_cache()")
-        print("[CACHÉ] Limpieza automática: al iniciar y al cargar nuevos archivos")
+        logger.info("Caché activo - FFT y waterfall optimizados")
+        logger.info("Estadísticas disponibles con: cache_computacional.estadisticas_cache()")
+        logger.info("Claves por contenido: cambios de datos o parámetros generan entradas nuevas")
+        if cache_computacional.disco is not None:
+            logger.info("Nivel persistente en disco: %s", cache_computacional.disco.directorio)
     else:
-        print("[CACHÉ] Caché deshabilitado - funcionamiento estándar")
-        print("[CACHÉ] Para habilitar: cambiar USAR_CACHE = True")
+        logger.info("Caché deshabilitado - funcionamiento estándar")
+        logger.info("Para habilitar: cambiar USAR_CACHE = True")
 
     # Confirmación final del bypass
-    print("[WATERFALL] Bypass activo - rango completo 0 Hz a fs/2 garantizado")
+    logger.info("Bypass activo - rango completo 0 Hz a fs/2 garantizado")
 
     webbrowser.open_new("http://127.0.0.1:8050")
     app.run(debug=False, use_reloader=False)
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+"""
+Procesamiento por lotes sin interfaz (no importa Dash):
+
+    python batch.py <carpeta> --salida resultados --procesos 4 --masa 1.0 --bandas "120, 340"
+
+Escribe `rigidez`, `modos`, `amortiguamiento` y `tiempos` (Parquet si hay pyarrow, si no CSV).
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+import time
+
+from dynamic_stiffness_analyzer.services.batch import OpcionesLote, escribir_resultados, listar_archivos, procesar_lote
+from dynamic_stiffness_analyzer.services.logs import configurar_logging
+
+
+def _argumentos(argv=None):
+    parser = argparse.ArgumentParser(description="Análisis de rigidez dinámica por lotes sobre una carpeta.")
+    parser.add_argument("directorio", help="Carpeta con los registros (csv, xlsx, txt Catman, columnares, memmap)")
+    parser.add_argument("--salida", default="resultados_lote", help="Carpeta de salida (por defecto: resultados_lote)")
+    parser.add_argument("--patron", default=None, help="Filtro de nombres tipo glob, p. ej. '*.txt'")
+    parser.add_argument("--recursivo", action="store_true", help="Incluir subcarpetas")
+    parser.add_argument("--procesos", type=int, default=os.cpu_count() or 1, help="Procesos en paralelo (1 = secuencial)")
+    parser.add_argument("--hilos", type=int, default=None,
+                        help="Hilos por proceso para filtros y espectros por canal (por defecto: núcleos / procesos)")
+    parser.add_argument("--masa", type=float, default=1.0, help="Masa del martillo en kg")
+    parser.add_argument("--ejes", default="accel_x,accel_y,accel_z", help="Ejes de aceleración separados por comas")
+    parser.add_argument("--mediana", type=int, default=None, help="Kernel del filtro de mediana (un valor par se ajusta al impar siguiente)")
+    parser.add_argument("--pasa-altos", type=float, default=None, help="Corte del filtro pasa-altos en Hz")
+    parser.add_argument("--bandas", default="", help="Frecuencias centrales 'f1, f2, ...' para el amortiguamiento")
+    parser.add_argument("--filtrar-bandas", action="store_true", help="Aplicar además el filtro multibanda con --bandas")
+    parser.add_argument("--modo-multibanda", choices=("iir", "fft"), default=None,
+                        help="Filtro multibanda: 'iir' (una pasada por banda) o 'fft' (banco en frecuencia)")
+    parser.add_argument("--inicio", type=float, default=None, help="Inicio del corte temporal en s (con --fin)")
+    parser.add_argument("--fin", type=float, default=None, help="Fin del corte temporal en s (con --inicio)")
+    parser.add_argument("--formato", choices=("auto", "parquet", "csv"), default="auto", help="Formato de salida")
+    parser.add_argument("--log-nivel", default=None, choices=("DEBUG", "INFO", "WARNING", "ERROR"),
+                        help="Nivel de los mensajes de diagnóstico (por defecto CONFIG.LOGGING['NIVEL'])")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = _argumentos(argv)
+    configurar_logging(args.log_nivel)
+    if (args.inicio is None) != (args.fin is None):
+        print("[ERROR] --inicio y --fin se deben indicar juntos")
+        return 2
+    formato = args.formato
+    if formato == "auto":
+        formato = "parquet" if importlib.util.find_spec("pyarrow") else "csv"
+    elif formato == "parquet" and not importlib.util.find_spec("pyarrow"):
+        print("[ERROR] La salida Parquet requiere 'pyarrow' (pip install pyarrow)")
+        return 2
+
+    rutas = listar_archivos(args.directorio, args.patron, args.recursivo)
+    if not rutas:
+        print(f"[ERROR] No hay archivos soportados en {args.directorio}")
+        return 1
+    opciones = OpcionesLote(
+        masa_kg=args.masa,
+        ejes=tuple(e.strip() for e in args.ejes.split(",") if e.strip()),
+        mediana=args.mediana,
+        pasa_altos_hz=args.pasa_altos,
+        bandas=args.bandas,
+        filtrar_bandas=args.filtrar_bandas,
+        modo_multibanda=args.modo_multibanda,
+        inicio_s=args.inicio,
+        fin_s=args.fin,
+    )
+
+    def informar(i, n, resultado):
+        detalle = f"{resultado.tiempos.get('total', 0):.2f} s" if resultado.estado == "ok" else f"ERROR: {resultado.error}"
+        print(f"[{i}/{n}] {os.path.relpath(resultado.ruta, args.directorio)}: {detalle}", flush=True)
+
+    inicio = time.perf_counter()
+    print(f"Procesando {len(rutas)} archivo(s) con {max(1, min(args.procesos, len(rutas)))} proceso(s)...")
+    resultados = procesar_lote(rutas, opciones, args.procesos, informar, args.hilos)
+    salidas = escribir_resultados(resultados, args.salida, formato)
+    errores = sum(r.estado != "ok" for r in resultados)
+    print(f"Terminado en {time.perf_counter() - inicio:.2f} s: {len(resultados) - errores} correcto(s), {errores} con error")
+    for nombre, ruta in salidas.items():
+        print(f"  {nombre}: {ruta}")
+    return 1 if errores == len(resultados) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+"""
+Benchmark de arranque en frío: importa cada punto de entrada en un intérprete nuevo y compara la
+mediana con su presupuesto de tiempo. Informa también qué bibliotecas pesadas quedaron cargadas.
+
+    python benchmark_arranque.py                  # app (main.py) y lotes (services.batch)
+    python benchmark_arranque.py --repeticiones 9 --presupuesto-app 1.5
+
+Devuelve 1 si algún punto de entrada supera su presupuesto.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+
+# Punto de entrada → código a medir (sin arrancar el servidor: `main.py` solo llama a `app.run` como script)
+PUNTOS_ENTRADA = {
+    "app": "import main; main.crear_app()",
+    "lotes": "import dynamic_stiffness_analyzer.services.batch",
+}
+# Deben cargarse al usarlas (primer análisis/figura), no al arrancar
+MODULOS_PESADOS = ("scipy.signal", "scipy.stats", "plotly.graph_objs", "plotly.subplots", "dash")
+
+_MEDIR = """
+import io, json, sys, time
+from contextlib import redirect_stdout
+inicio = time.perf_counter()
+with redirect_stdout(io.StringIO()):
+    {codigo}
+duracion = time.perf_counter() - inicio
+print(json.dumps({{"segundos": duracion, "cargados": [m for m in {pesados!r} if m in sys.modules]}}))
+"""
+
+
+def medir(sentencia: str, repeticiones: int) -> dict:
+    tiempos, cargados = [], []
+    codigo = _MEDIR.format(codigo=sentencia, pesados=MODULOS_PESADOS)
+    for _ in range(repeticiones):
+        salida = subprocess.run([sys.executable, "-c", codigo], cwd=Path(__file__).parent,
+                                capture_output=True, text=True, check=True).stdout
+        resultado = json.loads(salida.strip().splitlines()[-1])
+        tiempos.append(resultado["segundos"])
+        cargados = resultado["cargados"]
+    return {"mediana": statistics.median(tiempos), "minimo": min(tiempos), "cargados": cargados}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Tiempo de arranque en frío de los puntos de entrada.")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--presupuesto-app", type=float, default=2.0, help="Segundos (mediana) para crear la app (main.crear_app)")
+    parser.add_argument("--presupuesto-lotes", type=float, default=1.0, help="Segundos (mediana) para importar services.batch")
+    args = parser.parse_args(argv)
+    presupuestos = {"app": args.presupuesto_app, "lotes": args.presupuesto_lotes}
+
+    excedidos = 0
+    for nombre, sentencia in PUNTOS_ENTRADA.items():
+        r = medir(sentencia, args.repeticiones)
+        ok = r["mediana"] <= presupuestos[nombre]
+        excedidos += not ok
+        print(f"{nombre:6s} mediana={r['mediana']:.3f} s  mínimo={r['minimo']:.3f} s  "
+              f"presupuesto={presupuestos[nombre]:.1f} s  {'OK' if ok else 'EXCEDIDO'}")
+        print(f"       cargados al arrancar: {', '.join(r['cargados']) or 'ninguno'}")
+    return 1 if excedidos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,11 +3,15 @@ from __future__ import annotations
 import numpy as np
 from typing import Dict, List, Optional
 from scipy.fft import rfft, rfftfreq
-from scipy.signal import find_peaks, get_window
-from scipy.stats import median_abs_deviation
 
+from dynamic_stiffness_analyzer.services.profiling import PERFILADOR
 
+
+@PERFILADOR.medir('amortiguamiento')
 def calculo_amortiguamiento(accel: np.ndarray, fs: float, frecuencias_centrales: Optional[List[float]] = None, ventana_busqueda_hz: float = 5.0) -> Dict[str, object]:
+    from scipy.signal import find_peaks, get_window
+    from scipy.stats import median_abs_deviation
+
     resultado = {'modos': [], 'zeta_global': None, 'mensajes': []}
     Nfft = len(accel)
     accel_fft = np.abs(rfft(accel * get_window('hann', Nfft)))
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+from typing import Dict, Sequence
+
 import numpy as np
 
-from .frf import calculate_coherence
+from dynamic_stiffness_analyzer.services.profiling import PERFILADOR
+
+from .frf import calculate_coherence, calculate_Hv
+from .spectral import calcular_matriz_espectral
 
 
 def detect_antiresonances(H_frf: np.ndarray, frequencies: np.ndarray, fK: np.ndarray, S_ff: np.ndarray, S_xx: np.ndarray, S_xf: np.ndarray, window_hz: float = 10) -> np.ndarray:
@@ -40,4 +45,41 @@ def calculate_dynamic_stiffness_robust(H_frf: np.ndarray, frequencies: np.ndarra
         return np.zeros_like(H_frf, dtype=complex)
 
 
+def calcular_rigidez_multieje(
+    fuerza: np.ndarray,
+    respuestas: np.ndarray,
+    fs: float,
+    nperseg: int,
+    noverlap: int | None = None,
+    ejes: Sequence[str] = ('accel_x', 'accel_y', 'accel_z'),
+) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    FRF (Hv), coherencia y rigidez dinámica de varios ejes en un único cálculo por lotes.
+
+    Entradas:
+    - fuerza: señal de fuerza ya ventaneada (N), 1-D.
+    - respuestas: matriz (canales × muestras) de aceleraciones ya ventaneadas (m/s²).
+    - fs, nperseg, noverlap: parámetros Welch comunes a todos los canales.
+    - ejes: nombre de cada fila de `respuestas`.
 
+    Salidas:
+    - dict eje -> {'fK', 'S_ff', 'S_xx', 'S_xf', 'H', 'coherencia', 'K'}; cambiar de eje es una consulta.
+    """
+    respuestas = np.atleast_2d(respuestas)
+    if respuestas.shape[0] != len(ejes):
+        raise ValueError("El número de ejes no coincide con las filas de respuestas")
+    fK, S_ff, S_xx, S_xf, coherencia = calcular_matriz_espectral(fuerza, respuestas, fs, nperseg=nperseg, noverlap=noverlap)
+    with PERFILADOR.tramo('frf_rigidez'):
+        H = calculate_Hv(S_ff, S_xx, S_xf)
+        resultado: Dict[str, Dict[str, np.ndarray]] = {}
+        for i, eje in enumerate(ejes):
+            resultado[eje] = {
+                'fK': fK,
+                'S_ff': S_ff,
+                'S_xx': S_xx[i],
+                'S_xf': S_xf[i],
+                'H': H[i],
+                'coherencia': coherencia[i],
+                'K': calculate_dynamic_stiffness_robust(H[i], fK, fK, S_ff, S_xx[i], S_xf[i]),
+            }
+    return resultado
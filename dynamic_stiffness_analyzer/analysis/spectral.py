@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from typing import Iterator, Tuple
+
+import numpy as np
+from scipy.fft import rfft, rfftfreq
+
+from dynamic_stiffness_analyzer.services.parallel import EJECUTOR_CANALES
+from dynamic_stiffness_analyzer.services.profiling import PERFILADOR
+
+from .frf import calculate_coherence
+
+
+# Segmentos procesados por bloque: acota la memoria temporal sin repetir FFTs
+_SEGMENTOS_POR_BLOQUE = 256
+
+
+def _bloques_segmentos(x: np.ndarray, nperseg: int, noverlap: int) -> Iterator[np.ndarray]:
+    """Genera vistas (..., segmentos, nperseg) sin copia sobre el último eje de `x`."""
+    paso = nperseg - noverlap
+    vista = np.lib.stride_tricks.sliding_window_view(x, nperseg, axis=-1)[..., ::paso, :]
+    n_segmentos = vista.shape[-2]
+    for inicio in range(0, n_segmentos, _SEGMENTOS_POR_BLOQUE):
+        yield vista[..., inicio:inicio + _SEGMENTOS_POR_BLOQUE, :]
+
+
+@PERFILADOR.medir('welch_csd')
+def calcular_matriz_espectral(
+    fuerza: np.ndarray,
+    respuesta: np.ndarray,
+    fs: float,
+    nperseg: int,
+    noverlap: int | None = None,
+    window: str = 'hann',
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Estimación Welch conjunta de S_ff, S_xx y S_xf transformando cada canal una sola vez.
+
+    Equivale a `welch(fuerza)`, `welch(respuesta)` y `csd(respuesta, fuerza)` de SciPy
+    (ventana periódica, detrend constante, densidad espectral unilateral, media de segmentos),
+    pero segmenta, ventanea y calcula la FFT de cada señal una única vez y obtiene los tres
+    espectros a partir de los mismos espectros por segmento.
+
+    Entradas:
+    - fuerza: señal de excitación (1-D).
+    - respuesta: señal de respuesta (1-D) o matriz (canales × muestras) con la misma longitud.
+    - fs: frecuencia de muestreo (Hz).
+    - nperseg, noverlap: longitud y solape de los segmentos Welch (noverlap=None → nperseg // 2).
+
+    Salidas:
+    - (f, S_ff, S_xx, S_xf, coherencia); S_xx, S_xf y coherencia conservan los ejes de canal.
+    """
+    fuerza = np.asarray(fuerza, dtype=float)
+    respuesta = np.asarray(respuesta, dtype=float)
+    n_muestras = fuerza.shape[-1]
+    if respuesta.shape[-1] != n_muestras:
+        raise ValueError("Fuerza y respuesta deben tener la misma longitud")
+    nperseg = int(min(nperseg, n_muestras))
+    noverlap = nperseg // 2 if noverlap is None else int(noverlap)
+    if nperseg < 1 or not 0 <= noverlap < nperseg:
+        raise ValueError("Parámetros de segmentación inválidos")
+
+    from scipy.signal import get_window
+
+    ventana = get_window(window, nperseg)
+    escala = 1.0 / (fs * np.sum(ventana ** 2))
+    n_freq = nperseg // 2 + 1
+    canales = respuesta.shape[:-1]
+
+    acum_ff = np.zeros(n_freq)
+    acum_xx = np.zeros(canales + (n_freq,))
+    acum_xf = np.zeros(canales + (n_freq,), dtype=complex)
+    n_segmentos = 0
+    # La FFT de cada bloque (canales × segmentos) se reparte entre los hilos de scipy.fft
+    workers = EJECUTOR_CANALES.workers_fft
+    for seg_f, seg_x in zip(_bloques_segmentos(fuerza, nperseg, noverlap),
+                            _bloques_segmentos(respuesta, nperseg, noverlap)):
+        F = rfft((seg_f - seg_f.mean(axis=-1, keepdims=True)) * ventana, axis=-1, workers=workers)
+        X = rfft((seg_x - seg_x.mean(axis=-1, keepdims=True)) * ventana, axis=-1, workers=workers)
+        acum_ff += np.sum(F.real ** 2 + F.imag ** 2, axis=-2)
+        acum_xx += np.sum(X.real ** 2 + X.imag ** 2, axis=-2)
+        acum_xf += np.sum(np.conj(X) * F, axis=-2)
+        n_segmentos += F.shape[-2]
+
+    # Densidad unilateral: duplicar todo salvo DC (y Nyquist si nperseg es par)
+    factor = np.full(n_freq, 2.0 * escala / n_segmentos)
+    factor[0] /= 2
+    if nperseg % 2 == 0:
+        factor[-1] /= 2
+    S_ff = acum_ff * factor
+    S_xx = acum_xx * factor
+    S_xf = acum_xf * factor
+    f = rfftfreq(nperseg, 1 / fs)
+    return f, S_ff, S_xx, S_xf, calculate_coherence(S_ff, S_xx, S_xf)
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from typing import Dict
+
+import numpy as np
+from scipy.fft import rfft, rfftfreq
+
+from dynamic_stiffness_analyzer.config.settings import CONFIG
+from dynamic_stiffness_analyzer.services.parallel import EJECUTOR_CANALES
+from dynamic_stiffness_analyzer.services.profiling import PERFILADOR
+
+
+@PERFILADOR.medir('espectrograma')
+def calcular_espectrograma(
+    t: np.ndarray,
+    y: np.ndarray,
+    dt: float,
+    window_len: int,
+    overlap: float = 0.5,
+    max_segmentos: int | None = None,
+    window: str = 'hann',
+) -> Dict[str, np.ndarray]:
+    """
+    Espectrograma de amplitud (|FFT| con ventana) por segmentos solapados, calculado en lote.
+
+    Los segmentos se toman como vista 2-D con strides sobre `y`, se ventanean y transforman con
+    una única llamada a `rfft` a lo largo del último eje.
+
+    Entradas:
+    - t, y: vector de tiempo y señal (misma longitud).
+    - dt: paso temporal (s); window_len: muestras por segmento; overlap: fracción de solape.
+    - max_segmentos: si hay más segmentos, se eligen equiespaciados (como en el waterfall original).
+
+    Salidas (dict):
+    - 'segmentos': número de cada fila entre los segmentos mostrados, 0..n-1 (curvas y exportación).
+    - 'posiciones': índice de cada fila dentro de la rejilla completa de segmentos.
+    - 'tiempos': tiempo central de cada segmento (s).
+    - 'frecuencias': eje de frecuencias (Hz).
+    - 'amplitud': matriz float32 (segmentos × frecuencias); se omiten filas sin valores finitos.
+    """
+    y = np.asarray(y, dtype=float)
+    N = len(y)
+    window_len = int(min(window_len, N))
+    vacio = {
+        'segmentos': np.array([], dtype=int),
+        'posiciones': np.array([], dtype=int),
+        'tiempos': np.array([], dtype=float),
+        'frecuencias': np.array([], dtype=float),
+        'amplitud': np.empty((0, 0), dtype=np.float32),
+    }
+    if window_len < CONFIG.VENTANAS_WATERFALL['MINIMO']:
+        return vacio
+
+    step = max(1, int(window_len * (1 - overlap)))
+    inicios = np.arange(0, N - window_len + 1, step)
+    if max_segmentos is not None and len(inicios) > max_segmentos:
+        seleccion = np.linspace(0, len(inicios) - 1, max_segmentos, dtype=int)
+    else:
+        seleccion = np.arange(len(inicios))
+
+    from scipy.signal import get_window
+
+    vista = np.lib.stride_tricks.sliding_window_view(y, window_len)[::step]
+    segmentos = vista[seleccion] * get_window(window, window_len)
+    amplitud = np.abs(rfft(segmentos, axis=-1, workers=EJECUTOR_CANALES.workers_fft)).astype(np.float32)
+
+    validos = np.isfinite(amplitud).any(axis=1)
+    return {
+        'segmentos': np.arange(len(seleccion))[validos],
+        'posiciones': seleccion[validos],
+        'tiempos': np.asarray(t)[inicios[seleccion[validos]] + window_len // 2],
+        'frecuencias': rfftfreq(window_len, dt),
+        'amplitud': amplitud[validos],
+    }
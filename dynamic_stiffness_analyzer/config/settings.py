@@ -14,6 +14,8 @@ class ConfiguracionSistema:
         "MAX_PUNTOS_FFT": 50000,         # Reducir puntos para gráfico FFT si excede
         "REDUCCION_VISUAL_FFT": 20000,   # Objetivo de puntos tras reducción
         "MAX_SEGMENTOS_WATERFALL": 120,  # Máximo segmentos en waterfall 3D
+        "MODO_WATERFALL": "superficie",  # 'superficie' (go.Surface) o 'lineas' (una traza con separadores NaN)
+        "MAX_FRECUENCIAS_WATERFALL": 1024,  # Columnas de frecuencia dibujadas (máximo por bloque, conserva picos)
     }
 
     # Tamaños de ventana para waterfall
@@ -58,12 +60,76 @@ class ConfiguracionSistema:
         "MARGEN_GRAFICO": 0.05,           # 5% margen extra en ejes Y
     }
 
+    # Registro de datasets en servidor (las dcc.Store solo guardan id + versión)
+    REGISTRO_DATASETS = {
+        "MAX_BYTES_MEMORIA": 1024 * 1024 ** 2,  # 1 GiB de arrays en RAM antes de desalojar (LRU)
+        "SPILL_A_DISCO": True,                 # Desalojar a disco (.npz) en lugar de descartar
+        "DIRECTORIO_SPILL": None,              # None → directorio temporal del sistema (se borra al salir)
+        "MAX_BYTES_DISCO": 8 * 1024 ** 3,      # 8 GiB entre spill y memmaps propios; por encima se descartan los usados hace más tiempo
+        "UMBRAL_MEMMAP_BYTES": 256 * 1024 ** 2,  # Datasets mayores se guardan en formato memmap (None → nunca)
+        "DTYPE_MEMMAP": "float64",             # Precisión del archivo memmap ("float32" reduce a la mitad)
+    }
+
+    # Caché de resultados de cálculo (LRU acotado por bytes estimados y por número de entradas)
+    CACHE_COMPUTACIONAL = {
+        "MAX_BYTES": 512 * 1024 ** 2,  # 512 MiB entre espectros, matrices de waterfall y figuras
+        "MAX_ENTRADAS": 50,
+        "USAR_DISCO": True,                  # Nivel persistente (.npz sin comprimir por huella de contenido)
+        "DIRECTORIO_DISCO": None,            # None → ~/.cache/dynamic_stiffness_analyzer
+        "MAX_BYTES_DISCO": 4 * 1024 ** 3,    # 4 GiB; se desalojan los archivos usados hace más tiempo
+        "BYTES_POR_SEGUNDO_DISCO": 400 * 1024 ** 2,  # Lectura estimada para decidir si un resultado merece el disco
+        "FACTOR_COSTE_DISCO": 4.0,           # Solo se persiste si calcularlo cuesta ≥ factor × su lectura estimada
+        "MAX_ENTRADAS_SESION": 4,            # Resultados intermedios memoizados por etapa en AnalysisSession
+    }
+
+    # Trabajos de análisis en segundo plano (pool local de procesos, sin broker externo)
+    PROCESAMIENTO = {
+        "USAR_PROCESOS": True,        # False → los cálculos corren en el hilo del trabajo
+        "MAX_PROCESOS": 2,            # Procesos del pool para FRF, amortiguamiento y espectrograma
+        "INTERVALO_MS": 250,          # Periodo de sondeo del progreso desde la UI
+        "MAX_TRABAJOS": 20,           # Trabajos terminados que se conservan para consultar su estado
+    }
+
+    # Lectura de archivos subidos
+    CARGA_ARCHIVOS = {
+        "BYTES_CABECERA": 64 * 1024,  # Ventana inicial para localizar la cabecera de un TXT Catman (se amplía si hace falta)
+        "FILAS_POR_BLOQUE": 200_000,  # Filas por bloque al leer la región de datos con el parser C de pandas
+        "DIRECTORIO_LOCAL": None,     # Carpeta del servidor con los archivos de los bancos de ensayo (None → desactivada)
+        "DIRECTORIO_PREPARADOS": None,  # Datasets memmap preparados; None → <caché en disco>/datasets_locales
+        "PREPARAR_EN_SEGUNDO_PLANO": True,  # Preparar al formato memmap los archivos nuevos al listar la carpeta
+    }
+
+    # Filtro multibanda
+    FILTROS = {
+        "MODO_MULTIBANDA": "iir",             # 'iir' (sosfiltfilt por banda) o 'fft' (respuesta combinada; coste independiente del nº de bandas)
+        "MAX_MUESTRAS_FFT_DIRECTA": 2 ** 22,  # Modo 'fft': registros más largos se filtran por bloques (overlap-save)
+        "MUESTRAS_BLOQUE_FFT": 2 ** 16,       # Bloque del overlap-save; la respuesta se evalúa con resolución fs / bloque
+    }
+
+    # Reparto por canal en hilos (filtros, ventaneo y espectros; SciPy libera el GIL en esos cálculos)
+    PARALELISMO = {
+        "MAX_HILOS": None,              # None → os.cpu_count(); 1 → todo en serie. Se reparten entre los procesos del pool de trabajos
+        "MIN_MUESTRAS_CANAL": 2 ** 15,  # Canales más cortos se procesan en serie (el reparto no compensa)
+    }
+
+    # Instrumentación de tiempos por etapa (tabla por ejecución en la UI y volcado JSON)
+    PERFILADO = {
+        "HABILITADO": True,           # False → los tramos no miden nada (coste nulo)
+        "MAX_EJECUCIONES": 20,        # Ejecuciones recientes que se conservan
+    }
+
+    # Registro de mensajes (módulo logging): DEBUG muestra diagnósticos por llamada, que no se evalúan con niveles superiores
+    LOGGING = {
+        "NIVEL": "WARNING",           # 'DEBUG' | 'INFO' | 'WARNING' | 'ERROR'
+        "FORMATO": "%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    }
+
 
 # Instancia global de configuración
 CONFIG = ConfiguracionSistema()
 
 
-# Flag global para activar/desactivar caché a nivel de aplicación
-USAR_CACHE: bool = False
+# Flag global para activar/desactivar caché a nivel de aplicación (claves por contenido: seguro por defecto)
+USAR_CACHE: bool = True
 
 
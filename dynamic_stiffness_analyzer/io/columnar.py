@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+"""
+Lectura de formatos binarios columnares (Parquet, Feather/Arrow IPC, NPZ, HDF5).
+
+Cada lector obtiene primero los nombres de columna (metadatos), deja que el llamador elija cuáles
+necesita y lee solo esas. Con una ruta en disco se usa mapeo en memoria cuando el formato lo
+permite; con los bytes de una subida se lee sobre el buffer sin copiarlo.
+
+`pyarrow` (Parquet/Feather) y `h5py` (HDF5) son dependencias opcionales: se importan al leer.
+"""
+
+import importlib
+import io
+import os
+from typing import Callable, Dict, List, Union
+
+import numpy as np
+
+
+Fuente = Union[bytes, str]
+# Recibe los nombres de columna del archivo y devuelve los que se deben leer
+Selector = Callable[[List[str]], List[str]]
+
+FORMATOS_COLUMNARES: Dict[str, str] = {
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".feather": "feather",
+    ".arrow": "feather",
+    ".ipc": "feather",
+    ".npz": "npz",
+    ".h5": "hdf5",
+    ".hdf5": "hdf5",
+    ".hdf": "hdf5",
+}
+
+
+def es_formato_columnar(nombre_archivo: str) -> bool:
+    return os.path.splitext(nombre_archivo)[-1].lower() in FORMATOS_COLUMNARES
+
+
+def _importar_opcional(modulo: str, formato: str):
+    try:
+        return importlib.import_module(modulo)
+    except ImportError as e:
+        paquete = modulo.split(".")[0]
+        raise ImportError(f"El formato {formato} requiere '{paquete}' (pip install {paquete})") from e
+
+
+def _origen_arrow(pa, fuente: Fuente):
+    return pa.memory_map(fuente, "r") if isinstance(fuente, str) else pa.BufferReader(fuente)
+
+
+def _leer_parquet(fuente: Fuente, seleccionar: Selector) -> Dict[str, np.ndarray]:
+    pa = _importar_opcional("pyarrow", "Parquet")
+    pq = _importar_opcional("pyarrow.parquet", "Parquet")
+    archivo = pq.ParquetFile(_origen_arrow(pa, fuente))
+    # Sin el índice que añade pandas al escribir (`__index_level_0__`)
+    columnas = seleccionar([n for n in archivo.schema_arrow.names if not n.startswith("__index_level_")])
+    tabla = archivo.read(columns=columnas)
+    return {col: tabla.column(col).to_numpy() for col in columnas}
+
+
+def _leer_feather(fuente: Fuente, seleccionar: Selector) -> Dict[str, np.ndarray]:
+    pa = _importar_opcional("pyarrow", "Feather/Arrow")
+    feather = _importar_opcional("pyarrow.feather", "Feather/Arrow")
+    # Con mapeo en memoria (o BufferReader) la tabla completa no copia datos: solo se convierten las elegidas
+    tabla = feather.read_table(_origen_arrow(pa, fuente), memory_map=isinstance(fuente, str))
+    columnas = seleccionar(list(tabla.column_names))
+    return {col: tabla.column(col).to_numpy() for col in columnas}
+
+
+def _leer_npz(fuente: Fuente, seleccionar: Selector) -> Dict[str, np.ndarray]:
+    # NPZ es un zip: no admite mmap, pero cada array se descomprime solo al pedirlo
+    with np.load(fuente if isinstance(fuente, str) else io.BytesIO(fuente), allow_pickle=False) as archivo:
+        columnas = seleccionar(list(archivo.files))
+        return {col: archivo[col] for col in columnas}
+
+
+def _leer_hdf5(fuente: Fuente, seleccionar: Selector) -> Dict[str, np.ndarray]:
+    h5py = _importar_opcional("h5py", "HDF5")
+    with h5py.File(fuente if isinstance(fuente, str) else io.BytesIO(fuente), "r") as archivo:
+        # Canales = datasets 1-D del archivo (en la raíz o en grupos), por su nombre final
+        datasets: Dict[str, str] = {}
+
+        def visitar(ruta, objeto):
+            if isinstance(objeto, h5py.Dataset) and objeto.ndim == 1:
+                datasets.setdefault(ruta.rsplit("/", 1)[-1], ruta)
+
+        archivo.visititems(visitar)
+        columnas = seleccionar(list(datasets))
+        return {col: archivo[datasets[col]][()] for col in columnas}
+
+
+_LECTORES: Dict[str, Callable[[Fuente, Selector], Dict[str, np.ndarray]]] = {
+    "parquet": _leer_parquet,
+    "feather": _leer_feather,
+    "npz": _leer_npz,
+    "hdf5": _leer_hdf5,
+}
+
+
+def leer_columnar(fuente: Fuente, nombre_archivo: str, seleccionar: Selector) -> Dict[str, np.ndarray]:
+    """
+    Lee de `fuente` (ruta o bytes) solo las columnas que elija `seleccionar`.
+
+    El formato se deduce de la extensión de `nombre_archivo`. Devuelve `{nombre: array 1-D}`.
+    """
+    formato = FORMATOS_COLUMNARES.get(os.path.splitext(nombre_archivo)[-1].lower())
+    if formato is None:
+        raise ValueError(f"Formato no soportado: {nombre_archivo}")
+    return _LECTORES[formato](fuente, seleccionar)
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+"""
+Formato de dataset en disco para registros largos: un archivo binario crudo por canales
+(`<base>.dsa.bin`, matriz canales × muestras en orden C, float64 o float32) y una cabecera JSON
+pequeña (`<base>.dsa.json`).
+
+Se abre con `np.memmap`: el DataFrame resultante apunta a las páginas del archivo y solo se leen
+(y ocupan RAM) las que se tocan — p. ej. los puntos de la decimación del gráfico de tiempo, el rango
+de un corte o los segmentos de Welch.
+"""
+
+import json
+import os
+import uuid
+from typing import Any, Dict, Mapping, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+
+FORMATO = "dsa-memmap"
+VERSION_FORMATO = 1
+EXTENSION_CABECERA = ".dsa.json"
+EXTENSION_DATOS = ".dsa.bin"
+
+Datos = Union[pd.DataFrame, Mapping[str, np.ndarray]]
+
+
+def es_dataset_memmap(ruta: str) -> bool:
+    return ruta.lower().endswith(EXTENSION_CABECERA)
+
+
+def _ruta_base(ruta: str) -> str:
+    for extension in (EXTENSION_CABECERA, EXTENSION_DATOS):
+        if ruta.lower().endswith(extension):
+            return ruta[:-len(extension)]
+    return ruta
+
+
+def _tiempo_ordenado(tiempo: np.ndarray) -> bool:
+    return len(tiempo) < 2 or bool(np.all(tiempo[1:] >= tiempo[:-1]))
+
+
+def escribir_dataset_memmap(datos: Datos, ruta: str, dtype: str = "float64",
+                            origen: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Escribe `datos` (DataFrame o `{columna: array 1-D}`) en el formato memmap y devuelve la ruta de
+    la cabecera. Se copia canal a canal, sin materializar una matriz completa en memoria.
+
+    `origen` (opcional) se guarda en la cabecera, p. ej. el archivo fuente del que se preparó.
+    """
+    base = _ruta_base(ruta)
+    columnas = [str(col) for col in datos.keys()]
+    if not columnas:
+        raise ValueError("Dataset sin columnas")
+    canales = [np.asarray(datos[col]) for col in datos.keys()]
+    n_muestras = len(canales[0])
+    if any(len(canal) != n_muestras for canal in canales):
+        raise ValueError("Todas las columnas deben tener la misma longitud")
+
+    directorio = os.path.dirname(base)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+    ruta_datos = base + EXTENSION_DATOS
+    # Se escribe en un temporal y se renombra: escrituras concurrentes del mismo dataset no se mezclan
+    tmp_datos = f"{ruta_datos}.{uuid.uuid4().hex[:8]}.tmp"
+    if n_muestras:
+        matriz = np.memmap(tmp_datos, dtype=np.dtype(dtype), mode="w+", shape=(len(columnas), n_muestras))
+        for i, canal in enumerate(canales):
+            matriz[i] = canal
+        matriz.flush()
+        del matriz
+    else:
+        open(tmp_datos, "wb").close()
+    os.replace(tmp_datos, ruta_datos)
+
+    cabecera = {
+        "formato": FORMATO,
+        "version": VERSION_FORMATO,
+        "datos": os.path.basename(ruta_datos),
+        "dtype": np.dtype(dtype).str,
+        "columnas": columnas,
+        "n_muestras": int(n_muestras),
+        "tiempo_ordenado": _tiempo_ordenado(canales[columnas.index("tiempo")]) if "tiempo" in columnas else None,
+    }
+    if origen:
+        cabecera["origen"] = origen
+    ruta_cabecera = base + EXTENSION_CABECERA
+    tmp = f"{ruta_cabecera}.{uuid.uuid4().hex[:8]}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cabecera, f)
+    # La cabecera se publica al final: un lector nunca ve datos a medio escribir
+    os.replace(tmp, ruta_cabecera)
+    return ruta_cabecera
+
+
+def leer_cabecera_memmap(ruta: str) -> Dict[str, Any]:
+    with open(_ruta_base(ruta) + EXTENSION_CABECERA, "r", encoding="utf-8") as f:
+        cabecera = json.load(f)
+    if cabecera.get("formato") != FORMATO or cabecera.get("version") != VERSION_FORMATO:
+        raise ValueError(f"Cabecera de dataset no reconocida: {ruta}")
+    return cabecera
+
+
+def abrir_dataset_memmap(ruta: str, modo: str = "c", cabecera: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+    """
+    DataFrame respaldado por el archivo de datos (sin copia). Con `modo='c'` (por defecto) las
+    escrituras quedan en memoria privada y nunca modifican el archivo.
+
+    `df.attrs['tiempo_ordenado']` conserva el dato de la cabecera para evitar recorrer el tiempo.
+    """
+    cabecera = cabecera or leer_cabecera_memmap(ruta)
+    columnas = cabecera["columnas"]
+    n_muestras = cabecera["n_muestras"]
+    dtype = np.dtype(cabecera["dtype"])
+    if n_muestras == 0:
+        df = pd.DataFrame({col: np.empty(0, dtype=dtype) for col in columnas})
+    else:
+        ruta_datos = os.path.join(os.path.dirname(_ruta_base(ruta)), cabecera["datos"])
+        matriz = np.memmap(ruta_datos, dtype=dtype, mode=modo, shape=(len(columnas), n_muestras))
+        # Traspuesta: pandas guarda los bloques como (columnas × filas), así que reutiliza la matriz tal cual
+        df = pd.DataFrame(matriz.T, columns=columnas, copy=False)
+    df.attrs["tiempo_ordenado"] = cabecera.get("tiempo_ordenado")
+    return df
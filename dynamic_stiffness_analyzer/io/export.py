@@ -3,21 +3,58 @@ from __future__ import annotations
 import os
 import tempfile
 import zipfile
-from typing import Iterable, List, Optional
+from typing import Any, Iterable, Mapping, Optional, Union
 
+import numpy as np
 import pandas as pd
 
 
-def exportar_waterfall_a_zip(datos: Optional[Iterable[dict]]) -> Optional[str]:
+# Máximo de frecuencias por segmento en la exportación (submuestreo como en el waterfall original)
+MAX_FRECUENCIAS_EXPORTACION = 2000
+
+
+def _espectrograma_a_tablas(datos: Mapping[str, Any]):
+    """Construye (formato largo, matriz) a partir del espectrograma denso del waterfall."""
+    frecuencias = np.asarray(datos['frecuencias'])
+    step_export = max(1, len(frecuencias) // MAX_FRECUENCIAS_EXPORTACION)
+    frecuencias = frecuencias[::step_export]
+    amplitud = np.asarray(datos['amplitud'])[:, ::step_export]
+    tiempos = np.asarray(datos['tiempos'])
+    segmentos = np.asarray(datos['segmentos'])
+
+    n_seg, n_freq = amplitud.shape
+    df_export = pd.DataFrame({
+        "segmento": np.repeat(segmentos + 1, n_freq),
+        "tiempo_central": np.repeat(tiempos, n_freq),
+        "frecuencia": np.tile(frecuencias, n_seg),
+        "amplitud": amplitud.ravel(),
+    })
+    df_export = df_export[np.isfinite(df_export["frecuencia"]) & np.isfinite(df_export["amplitud"])]
+
+    matriz = pd.DataFrame(np.where(np.isfinite(amplitud), amplitud, np.nan),
+                          index=pd.Index(tiempos, name="tiempo_central"), columns=frecuencias)
+    matriz = matriz.dropna(axis=1, how="all")
+    return df_export, matriz
+
+
+def exportar_waterfall_a_zip(datos: Optional[Union[Mapping[str, Any], Iterable[dict]]]) -> Optional[str]:
     """
-    Recibe una lista de dicts con claves: 'segmento', 'tiempo_central', 'frecuencia', 'amplitud'.
+    Recibe el espectrograma del waterfall (dict con 'segmentos', 'tiempos', 'frecuencias' y matriz
+    'amplitud') o, por compatibilidad, una lista de dicts con claves: 'segmento', 'tiempo_central',
+    'frecuencia', 'amplitud'.
     Genera dos CSV (formato largo y matriz) y devuelve la ruta de un ZIP temporal con ambos.
     Retorna None si no hay datos.
     """
     if not datos:
         return None
 
-    df_export = pd.DataFrame(list(datos))
+    if isinstance(datos, Mapping):
+        df_export, matriz = _espectrograma_a_tablas(datos)
+    else:
+        df_export = pd.DataFrame(list(datos))
+        matriz = df_export.pivot_table(index="tiempo_central", columns="frecuencia", values="amplitud")
+    if df_export.empty:
+        return None
 
     # CSV largo
     temp_long = tempfile.NamedTemporaryFile(delete=False, suffix=".csv")
@@ -25,7 +62,6 @@ def exportar_waterfall_a_zip(datos: Optional[Iterable[dict]]) -> Optional[str]:
     temp_long.close()
 
     # CSV matriz (pivot)
-    matriz = df_export.pivot_table(index="tiempo_central", columns="frecuencia", values="amplitud")
     matriz = matriz.sort_index(axis=0).sort_index(axis=1)
     matriz.reset_index(inplace=True)
     temp_matrix = tempfile.NamedTemporaryFile(delete=False, suffix=".csv")
@@ -46,5 +82,3 @@ def exportar_waterfall_a_zip(datos: Optional[Iterable[dict]]) -> Optional[str]:
         pass
 
     return temp_zip.name
-
-
@@ -5,14 +5,21 @@ import io
 import os
 import re
 import tempfile
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
+from dynamic_stiffness_analyzer.config.settings import CONFIG
+from dynamic_stiffness_analyzer.io.columnar import Fuente, es_formato_columnar, leer_columnar
+from dynamic_stiffness_analyzer.services.datasets import Referencia, guardar_dataset
+from dynamic_stiffness_analyzer.services.profiling import PERFILADOR
+
 
 Columnas = List[str]
 
+COLUMNAS_ESPERADAS: Columnas = ["tiempo", "fuerza", "accel_x", "accel_y", "accel_z"]
+
 
 def _detectar_separador(linea: str) -> str:
     if "\t" in linea:
@@ -22,50 +29,58 @@ def _detectar_separador(linea: str) -> str:
     return ","
 
 
-def _mapear_columnas_flex(df: pd.DataFrame, columnas_esperadas: Columnas) -> Optional[pd.DataFrame]:
-    columnas_mapeo: Dict[str, Columnas] = {
-        "tiempo": ["tiempo", "time", "t", "tiempo (s)", "time (s)"],
-        "fuerza": ["fuerza", "force", "f", "fuerza (n)", "force (n)"],
-        "accel_x": [
-            "accel_x",
-            "aceleracion_x",
-            "acel_x",
-            "ax",
-            "acc x",
-            "aceleracion x",
-            "aceleración x",
-            "acceleration x",
-        ],
-        "accel_y": [
-            "accel_y",
-            "aceleracion_y",
-            "acel_y",
-            "ay",
-            "acc y",
-            "aceleracion y",
-            "aceleración y",
-            "acceleration y",
-        ],
-        "accel_z": [
-            "accel_z",
-            "aceleracion_z",
-            "acel_z",
-            "az",
-            "acc z",
-            "aceleracion z",
-            "aceleración z",
-            "acceleration z",
-        ],
-    }
-    columnas_encontradas: Dict[str, str] = {}
-    columnas_lower = [c.lower().strip() for c in df.columns]
-    for clave, posibles in columnas_mapeo.items():
+COLUMNAS_MAPEO: Dict[str, Columnas] = {
+    "tiempo": ["tiempo", "time", "t", "tiempo (s)", "time (s)"],
+    "fuerza": ["fuerza", "force", "f", "fuerza (n)", "force (n)"],
+    "accel_x": [
+        "accel_x",
+        "aceleracion_x",
+        "acel_x",
+        "ax",
+        "acc x",
+        "aceleracion x",
+        "aceleración x",
+        "acceleration x",
+    ],
+    "accel_y": [
+        "accel_y",
+        "aceleracion_y",
+        "acel_y",
+        "ay",
+        "acc y",
+        "aceleracion y",
+        "aceleración y",
+        "acceleration y",
+    ],
+    "accel_z": [
+        "accel_z",
+        "aceleracion_z",
+        "acel_z",
+        "az",
+        "acc z",
+        "aceleracion z",
+        "aceleración z",
+        "acceleration z",
+    ],
+}
+
+
+def _resolver_columnas(nombres: List[Any]) -> Optional[Dict[str, Any]]:
+    """Nombre original de cada columna estándar reconocida (`COLUMNAS_MAPEO`); None si se reconocen menos de 3."""
+    columnas_encontradas: Dict[str, Any] = {}
+    columnas_lower = [str(c).lower().strip() for c in nombres]
+    for clave, posibles in COLUMNAS_MAPEO.items():
         for posible in posibles:
             if posible in columnas_lower:
                 idx = columnas_lower.index(posible)
-                columnas_encontradas[clave] = df.columns[idx]
+                columnas_encontradas[clave] = nombres[idx]
                 break
-    if len(columnas_encontradas) >= 3:
+    return columnas_encontradas if len(columnas_encontradas) >= 3 else None
+
+
+def _mapear_columnas_flex(df: pd.DataFrame, columnas_esperadas: Columnas) -> Optional[pd.DataFrame]:
+    columnas_encontradas = _resolver_columnas(list(df.columns))
+    if columnas_encontradas is not None:
         df_estandar = pd.DataFrame()
         for clave in columnas_esperadas:
             if clave in columnas_encontradas:
@@ -76,112 +91,188 @@ def _mapear_columnas_flex(df: pd.DataFrame, columnas_esperadas: Columnas) -> Opt
     return None
 
 
-def cargar_contenidos_upload(contents: str, filename: str) -> Tuple[str, Optional[str], str]:
+def cargar_dataframe_columnar(fuente: Fuente, nombre_archivo: str, columnas_esperadas: Columnas) -> pd.DataFrame:
+    """
+    Lee un archivo Parquet/Feather/NPZ/HDF5 (ruta o bytes) con el mismo mapeo flexible de columnas.
+
+    Solo se leen las columnas reconocidas (o, sin nombres reconocibles, las primeras por posición).
+    """
+    seleccion: Dict[str, str] = {}
+
+    def seleccionar(nombres: Columnas) -> Columnas:
+        mapeo = _resolver_columnas(nombres)
+        if mapeo is None:
+            if len(nombres) < len(columnas_esperadas):
+                raise ValueError(f"Se esperaban al menos {len(columnas_esperadas)} columnas y el archivo tiene {len(nombres)}")
+            mapeo = dict(zip(columnas_esperadas, nombres))
+        seleccion.update(mapeo)
+        return [mapeo[clave] for clave in columnas_esperadas if clave in mapeo]
+
+    arrays = leer_columnar(fuente, nombre_archivo, seleccionar)
+    n = max(len(a) for a in arrays.values())
+    return pd.DataFrame({
+        clave: np.asarray(arrays[seleccion[clave]], dtype=float) if clave in seleccion else np.full(n, np.nan)
+        for clave in columnas_esperadas
+    })
+
+
+def _es_linea_datos(linea: str, ncols_min: int = 5) -> bool:
+    campos = re.split(r"[;,\t ]+", linea.strip())
+    num_ok = 0
+    for campo in campos:
+        if campo == "":
+            continue
+        try:
+            float(campo)
+            num_ok += 1
+        except ValueError:
+            break
+    return num_ok >= ncols_min
+
+
+def _localizar_datos_catman(decoded: bytes, ncols_min: int = 5) -> Optional[int]:
+    """
+    Offset en bytes de la primera línea de datos de un TXT Catman (la primera con `ncols_min` números
+    tras la línea de nombres de canales), o None.
+
+    Solo se decodifica la cabecera: se examina una ventana inicial que se amplía si no basta.
+    """
+    ventana = CONFIG.CARGA_ARCHIVOS["BYTES_CABECERA"]
+    while True:
+        fin = len(decoded) if ventana >= len(decoded) else decoded.rfind(b"\n", 0, ventana) + 1
+        if fin > 0:
+            offset = 0
+            canales_encontrados = False
+            for linea_bytes in decoded[:fin].split(b"\n"):
+                linea = linea_bytes.decode("utf-8", errors="replace")
+                if not canales_encontrados:
+                    canales_encontrados = re.search(r"(time|acc|fuerza|force)", linea, re.IGNORECASE) is not None
+                elif _es_linea_datos(linea, ncols_min):
+                    return offset
+                offset += len(linea_bytes) + 1
+        if fin >= len(decoded):
+            return None
+        ventana *= 4
+
+
+def _leer_datos_catman(decoded: bytes, offset: int, columnas: Columnas) -> pd.DataFrame:
+    """
+    Lee por bloques la región de datos con el parser C de pandas (espacios/tabuladores, o el
+    separador `;`/`,` de la primera línea de datos si lo tiene).
+
+    Cada bloque se limpia (tiempo válido y >= 0, al menos una señal) y se copia a una matriz
+    preasignada por columnas, de modo que el pico de memoria es una copia de los datos numéricos
+    más un bloque.
+    """
+    fin_linea = decoded.find(b"\n", offset)
+    primera_linea = decoded[offset:fin_linea if fin_linea >= 0 else len(decoded)].decode("utf-8", errors="replace")
+    sep = _detectar_separador(primera_linea) if re.search(r"[;,]", primera_linea) else r"\s+"
+    n_max = decoded.count(b"\n", offset) + 1
+    datos = np.empty((len(columnas), n_max))
+    n = 0
+    buffer = io.BytesIO(decoded)  # comparte el buffer de `decoded` (sin copia)
+    buffer.seek(offset)
+    lector = pd.read_csv(
+        buffer,
+        sep=sep,
+        header=None,
+        usecols=range(len(columnas)),
+        chunksize=CONFIG.CARGA_ARCHIVOS["FILAS_POR_BLOQUE"],
+        skip_blank_lines=True,
+    )
+    with lector:
+        for bloque in lector:
+            valores = bloque.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float).T
+            tiempo = valores[0]
+            validas = (tiempo >= 0) & ~np.isnan(valores[1:]).all(axis=0)
+            k = int(np.count_nonzero(validas))
+            datos[:, n:n + k] = valores[:, validas]
+            n += k
+    # Vista transpuesta: cada columna del DataFrame queda contigua en memoria (sin copia al registrarla)
+    return pd.DataFrame(datos[:, :n].T, columns=columnas, copy=False)
+
+
+@PERFILADOR.medir('carga_archivo')
+def leer_dataframe(fuente: Fuente, filename: str) -> Tuple[Optional[pd.DataFrame], str]:
+    """
+    Lee `fuente` (bytes del archivo o ruta local) con autodetección de formato por extensión.
+
+    Retorna `(df_estandar, "")` o `(None, mensaje_de_error)`; los errores de lectura inesperados se propagan.
+    """
+    ext = os.path.splitext(filename)[-1].lower()
+    columnas_esperadas = COLUMNAS_ESPERADAS
+
+    # Formatos binarios columnares: solo las columnas necesarias, sin pasar por texto
+    if es_formato_columnar(filename):
+        return cargar_dataframe_columnar(fuente, filename, columnas_esperadas), ""
+
+    if isinstance(fuente, str):
+        with open(fuente, "rb") as f:
+            decoded = f.read()
+    else:
+        decoded = fuente
+
+    # CSV/XLSX directo
+    if ext in [".csv", ".xlsx"]:
+        try:
+            if ext == ".xlsx" and isinstance(fuente, str):
+                df = pd.read_excel(fuente)
+            elif ext == ".xlsx":
+                with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as tmp:
+                    tmp.write(decoded)
+                    tmp_path = tmp.name
+                df = pd.read_excel(tmp_path)
+                os.remove(tmp_path)
+            else:
+                primera_linea = decoded[:CONFIG.CARGA_ARCHIVOS["BYTES_CABECERA"]].split(b"\n", 1)[0]
+                sep = _detectar_separador(primera_linea.decode("utf-8", errors="replace"))
+                df = pd.read_csv(io.BytesIO(decoded), sep=sep)
+
+            df_estandar = _mapear_columnas_flex(df, columnas_esperadas)
+            if df_estandar is not None:
+                return df_estandar, ""
+            if len(df.columns) >= 5:
+                df_renamed = df.iloc[:, :5].copy()
+                df_renamed.columns = columnas_esperadas
+                return df_renamed, ""
+        except Exception:
+            # Fallback a TXT/Catman
+            pass
+
+    # TXT Catman o CSV problemático: cabecera localizada sin decodificar el archivo completo
+    offset_datos = _localizar_datos_catman(decoded)
+    if offset_datos is None:
+        return None, "No se encontraron datos válidos en el archivo."
+    try:
+        df2 = _leer_datos_catman(decoded, offset_datos, columnas_esperadas)
+    except Exception as e:
+        return None, f"Error procesando datos: {e}"
+    if df2.empty:
+        return None, "Error: Archivo sin datos válidos tras limpieza."
+    return df2, ""
+
+
+def cargar_contenidos_upload(contents: str, filename: str) -> Tuple[str, Optional[Referencia], str]:
     """
     Procesa el contenido subido (Dash dcc.Upload) y retorna:
     - Mensaje a mostrar en UI
-    - DataFrame serializado a JSON (orient='split') o None en caso de error
+    - Referencia `{'id', 'version'}` del DataFrame en el registro de datasets, o None en caso de error
     - Mensaje de carga (vacío si OK)
     """
     if contents is None:
         return "", None, ""
 
+    PERFILADOR.iniciar(f"Carga: {filename}")
     content_type, content_string = contents.split(",")
-    decoded = base64.b64decode(content_string)
+    with PERFILADOR.tramo('decodificacion_base64'):
+        decoded = base64.b64decode(content_string)
 
     try:
-        decoded_str = decoded.decode("utf-8")
-        lineas = decoded_str.splitlines()
-        ext = os.path.splitext(filename)[-1].lower()
-        columnas_esperadas = ["tiempo", "fuerza", "accel_x", "accel_y", "accel_z"]
-
-        # CSV/XLSX directo
-        if ext in [".csv", ".xlsx"]:
-            try:
-                if ext == ".xlsx":
-                    with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as tmp:
-                        tmp.write(decoded)
-                        tmp_path = tmp.name
-                    df = pd.read_excel(tmp_path)
-                    os.remove(tmp_path)
-                else:
-                    sep = _detectar_separador(lineas[0]) if lineas else ","
-                    df = pd.read_csv(io.StringIO(decoded_str), sep=sep)
-
-                df_estandar = _mapear_columnas_flex(df, columnas_esperadas)
-                if df_estandar is not None:
-                    return (
-                        f"Archivo cargado: {filename}",
-                        df_estandar.to_json(date_format="iso", orient="split"),
-                        "",
-                    )
-                if len(df.columns) >= 5:
-                    df_renamed = df.iloc[:, :5].copy()
-                    df_renamed.columns = columnas_esperadas
-                    return (
-                        f"Archivo cargado: {filename}",
-                        df_renamed.to_json(date_format="iso", orient="split"),
-                        "",
-                    )
-            except Exception:
-                # Fallback a TXT/Catman
-                pass
-
-        # TXT Catman o CSV problemático
-        idx_canales = None
-        nombres_canales: Columnas = []
-        for i, linea in enumerate(lineas):
-            if re.search(r"(time|acc|fuerza|force)", linea, re.IGNORECASE):
-                sep = _detectar_separador(linea)
-                nombres_canales = [c.strip() for c in re.split(r"[;,\t]+", linea.strip())]
-                idx_canales = i
-                break
-
-        def es_linea_datos(linea: str, ncols_min: int = 5) -> bool:
-            campos = re.split(r"[;,\t ]+", linea.strip())
-            num_ok = 0
-            for campo in campos:
-                if campo == "":
-                    continue
-                try:
-                    float(campo)
-                    num_ok += 1
-                except ValueError:
-                    break
-            return num_ok >= ncols_min
-
-        idx_datos = None
-        for i in range((idx_canales + 1) if idx_canales is not None else 0, len(lineas)):
-            if es_linea_datos(lineas[i]):
-                idx_datos = i
-                break
-
-        if idx_canales is not None and idx_datos is not None:
-            sep = "\t"
-            contenido_limpio = sep.join(nombres_canales) + "\n" + "\n".join(lineas[idx_datos:])
-            contenido_limpio = re.sub(r"[ \t]+", "\t", contenido_limpio)
-            try:
-                df2 = pd.read_csv(io.StringIO(contenido_limpio), sep=sep, engine="python", usecols=range(5))
-                df2.columns = columnas_esperadas
-                # Limpieza mínima, igual que el monolito
-                df2 = df2[pd.to_numeric(df2["tiempo"], errors="coerce").notnull()]
-                for col in df2.columns:
-                    df2[col] = pd.to_numeric(df2[col], errors="coerce")
-                df2 = df2.dropna(subset=["tiempo"])  # tiempo válido
-                df2 = df2[df2["tiempo"] >= 0]
-                df2 = df2.dropna(subset=["fuerza", "accel_x", "accel_y", "accel_z"], how="all")
-                if df2.empty:
-                    return "Error: Archivo sin datos válidos tras limpieza.", None, ""
-                return (
-                    f"Archivo cargado: {filename}",
-                    df2.to_json(date_format="iso", orient="split"),
-                    "",
-                )
-            except Exception as e:
-                return f"Error procesando datos: {e}", None, ""
-        else:
-            return "No se encontraron datos válidos en el archivo.", None, ""
+        df, error = leer_dataframe(decoded, filename)
+        if df is None:
+            return error, None, ""
+        with PERFILADOR.tramo('registro_dataset'):
+            referencia = guardar_dataset(df)
+        return f"Archivo cargado: {filename}", referencia, ""
     except Exception as e:
         return f"Error al leer el archivo: {e}", None, ""
-
-
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+"""
+Procesamiento por lotes sin interfaz: carga → filtrado → corte → ventaneo → FRF → rigidez →
+amortiguamiento de todos los archivos de una carpeta, en paralelo con un pool de procesos.
+
+Reutiliza `io/`, `signal_processing/`, `analysis/` y las etapas de `services.session` sin importar Dash.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from dynamic_stiffness_analyzer.io.dataset_memmap import abrir_dataset_memmap, es_dataset_memmap
+from dynamic_stiffness_analyzer.io.loader import leer_dataframe
+from dynamic_stiffness_analyzer.analysis.damping import calculo_amortiguamiento
+from dynamic_stiffness_analyzer.services.local_folder import EXTENSIONES_LOCALES
+from dynamic_stiffness_analyzer.services.parallel import configurar_hilos_proceso
+from dynamic_stiffness_analyzer.services.session import (EJES_ACELERACION, calcular_frf_multieje, descartar_filas_no_finitas,
+                                                         parametros_welch, regularizar_tiempo)
+from dynamic_stiffness_analyzer.services.validation import validar_masa_martillo
+from dynamic_stiffness_analyzer.signal_processing.cutting import aplicar_corte_df
+from dynamic_stiffness_analyzer.signal_processing.filters import filtrar_senal, parsear_frecuencias_centrales
+
+
+@dataclass
+class OpcionesLote:
+    """Parámetros del análisis (equivalentes a los controles de la interfaz)."""
+
+    masa_kg: float = 1.0
+    ejes: Tuple[str, ...] = EJES_ACELERACION
+    mediana: Optional[int] = None          # Kernel del filtro de mediana (None → sin filtro)
+    pasa_altos_hz: Optional[float] = None  # Frecuencia de corte del pasa-altos (None → sin filtro)
+    bandas: str = ""                       # Frecuencias centrales "f1, f2, ..." (multibanda y amortiguamiento)
+    filtrar_bandas: bool = False           # Aplicar también el filtro multibanda con `bandas`
+    modo_multibanda: Optional[str] = None  # 'iir' | 'fft' (None → CONFIG.FILTROS['MODO_MULTIBANDA'])
+    inicio_s: Optional[float] = None       # Corte temporal (ambos o ninguno)
+    fin_s: Optional[float] = None
+
+
+@dataclass
+class ResultadoArchivo:
+    archivo: str
+    ruta: str = ''  # Ruta completa: con `--recursivo` varios archivos pueden compartir nombre
+    estado: str = 'ok'  # 'ok' | 'error'
+    error: Optional[str] = None
+    tiempos: Dict[str, float] = field(default_factory=dict)
+    rigidez: Optional[pd.DataFrame] = None
+    modos: Optional[pd.DataFrame] = None
+    amortiguamiento: Optional[pd.DataFrame] = None
+
+
+def _medir(tiempos: Dict[str, float], etapa: str, funcion: Callable[[], Any]) -> Any:
+    inicio = time.perf_counter()
+    try:
+        return funcion()
+    finally:
+        tiempos[etapa] = round(time.perf_counter() - inicio, 4)
+
+
+def _filtrar(df: pd.DataFrame, opciones: OpcionesLote, ejes: List[str]) -> pd.DataFrame:
+    if not (opciones.mediana or opciones.pasa_altos_hz or opciones.filtrar_bandas):
+        return df
+    # fs como en el callback de filtros de la interfaz (mediana de los intervalos)
+    fs = 1 / np.median(np.diff(df['tiempo'].to_numpy()))
+    df_filtrado, _, _ = filtrar_senal(
+        df, ejes, ejes[0], fs, opciones.mediana, opciones.pasa_altos_hz, opciones.bandas,
+        'yes' if opciones.mediana else 'no',
+        'yes' if opciones.pasa_altos_hz else 'no',
+        'yes' if opciones.filtrar_bandas else 'no',
+        opciones.modo_multibanda,
+    )
+    return df_filtrado
+
+
+def procesar_archivo(ruta: str, opciones: OpcionesLote) -> ResultadoArchivo:
+    """
+    Análisis completo de un archivo. Nunca lanza: los errores quedan en el resultado.
+
+    Función de módulo (serializable) para ejecutarse en el pool de procesos.
+    """
+    nombre = os.path.basename(ruta)
+    resultado = ResultadoArchivo(nombre, ruta)
+    tiempos = resultado.tiempos
+    inicio_total = time.perf_counter()
+    try:
+        if es_dataset_memmap(ruta):
+            df, error = _medir(tiempos, 'carga', lambda: (abrir_dataset_memmap(ruta), ''))
+        else:
+            df, error = _medir(tiempos, 'carga', lambda: leer_dataframe(ruta, nombre))
+        if df is None:
+            raise ValueError(error)
+        ejes = [eje for eje in opciones.ejes if eje in df.columns and df[eje].notna().any()]
+        if 'fuerza' not in df.columns or not ejes:
+            raise ValueError("El archivo no tiene fuerza y al menos un eje de aceleración")
+        # Como en la sesión de la interfaz: una muestra no finita anula filtros y Welch (solo columnas usadas)
+        df = descartar_filas_no_finitas(df[['tiempo', 'fuerza'] + ejes])
+        if len(df) < 2:
+            raise ValueError("Sin filas con valores finitos")
+
+        df = _medir(tiempos, 'filtrado', lambda: _filtrar(df, opciones, ejes))
+        if opciones.inicio_s is not None and opciones.fin_s is not None:
+            df, _ = _medir(tiempos, 'corte', lambda: aplicar_corte_df(df, opciones.inicio_s, opciones.fin_s, ejes))
+        temporal = _medir(tiempos, 'regularizacion', lambda: regularizar_tiempo(df))
+        if temporal is None:
+            raise ValueError("Vector de tiempo inválido")
+        df, fs = temporal['df'], temporal['fs']
+        if len(df) < 1024:
+            raise ValueError(f"Datos insuficientes para FRF ({len(df)} < 1024 muestras)")
+
+        # Ventaneo + Welch + FRF + rigidez de todos los ejes en un cálculo por lotes
+        nperseg, noverlap = parametros_welch(len(df))
+        datos_frf = df[['fuerza'] + ejes].to_numpy(dtype=float)
+        masa_kg = validar_masa_martillo(opciones.masa_kg)[0]
+        frf = _medir(tiempos, 'frf_rigidez',
+                     lambda: calcular_frf_multieje(datos_frf, ejes, masa_kg, fs, nperseg, noverlap))
+        resultado.rigidez = pd.concat([
+            pd.DataFrame({
+                'archivo': nombre,
+                'eje': eje,
+                'frecuencia_hz': frf[eje]['fK'],
+                'rigidez_abs_n_m': np.abs(frf[eje]['K']),
+                'rigidez_real_n_m': np.real(frf[eje]['K']),
+                'rigidez_imag_n_m': np.imag(frf[eje]['K']),
+                'frf_abs': np.abs(frf[eje]['H']),
+                'coherencia': frf[eje]['coherencia'],
+            })
+            for eje in ejes
+        ], ignore_index=True)
+
+        frecuencias = parsear_frecuencias_centrales(opciones.bandas)
+        modos, globales = [], []
+
+        def amortiguamiento():
+            for eje in ejes:
+                amort = calculo_amortiguamiento(df[eje].to_numpy(), fs, frecuencias)
+                modos.extend({'archivo': nombre, 'eje': eje, **modo} for modo in amort['modos'])
+                globales.append({'archivo': nombre, 'eje': eje, 'zeta_global': amort['zeta_global'],
+                                 'n_modos': len(amort['modos']), 'mensajes': ' | '.join(amort['mensajes'])})
+
+        _medir(tiempos, 'amortiguamiento', amortiguamiento)
+        resultado.modos = pd.DataFrame(modos, columns=['archivo', 'eje', 'frecuencia', 'zeta', 'f1', 'f2', 'tipo'])
+        resultado.amortiguamiento = pd.DataFrame(globales).astype({'zeta_global': float})
+    except Exception as e:
+        resultado.estado, resultado.error = 'error', str(e)[:300]
+    tiempos['total'] = round(time.perf_counter() - inicio_total, 4)
+    return resultado
+
+
+def listar_archivos(directorio: str, patron: Optional[str] = None, recursivo: bool = False) -> List[str]:
+    """Archivos soportados por el loader (mismas extensiones que la carpeta local), ordenados."""
+    import fnmatch
+
+    rutas = []
+    for raiz, carpetas, archivos in os.walk(directorio):
+        carpetas[:] = sorted(c for c in carpetas if not c.startswith('.')) if recursivo else []
+        for nombre in sorted(archivos):
+            if nombre.startswith('.') or not nombre.lower().endswith(EXTENSIONES_LOCALES):
+                continue
+            if patron and not fnmatch.fnmatch(nombre, patron):
+                continue
+            rutas.append(os.path.join(raiz, nombre))
+    return rutas
+
+
+def _configurar_hilos(hilos: Optional[int]) -> None:
+    """Inicializador de cada proceso del pool: hilos por canal y SciPy cargado antes del primer archivo."""
+    configurar_hilos_proceso(hilos)
+    # Importaciones diferidas de filtros y ventanas: sin ellas la primera tarea de cada proceso las paga
+    import scipy.ndimage  # noqa: F401
+    import scipy.signal  # noqa: F401
+
+
+def procesar_lote(rutas: List[str], opciones: OpcionesLote, procesos: int = 1,
+                  al_terminar: Optional[Callable[[int, int, ResultadoArchivo], None]] = None,
+                  hilos: Optional[int] = None) -> List[ResultadoArchivo]:
+    """
+    Procesa `rutas` con `procesos` procesos (1 → en este proceso); `al_terminar(i, n, resultado)` informa el avance.
+
+    `hilos`: hilos por proceso para el reparto por canal (`EJECUTOR_CANALES`); None → los núcleos se
+    reparten entre los procesos (todos si se procesa en este proceso).
+    """
+    resultados: List[ResultadoArchivo] = []
+    if procesos <= 1 or len(rutas) <= 1:
+        if hilos is not None:
+            _configurar_hilos(hilos)
+        for ruta in rutas:
+            resultados.append(procesar_archivo(ruta, opciones))
+            if al_terminar:
+                al_terminar(len(resultados), len(rutas), resultados[-1])
+    else:
+        n_procesos = min(procesos, len(rutas))
+        hilos_proceso = hilos or max(1, (os.cpu_count() or 1) // n_procesos)
+        with ProcessPoolExecutor(max_workers=n_procesos, initializer=_configurar_hilos,
+                                 initargs=(hilos_proceso,)) as pool:
+            futuros = [pool.submit(procesar_archivo, ruta, opciones) for ruta in rutas]
+            for futuro in as_completed(futuros):
+                resultados.append(futuro.result())
+                if al_terminar:
+                    al_terminar(len(resultados), len(rutas), resultados[-1])
+    orden = {ruta: i for i, ruta in enumerate(rutas)}
+    return sorted(resultados, key=lambda r: orden.get(r.ruta, 0))
+
+
+def _escribir_tabla(df: pd.DataFrame, ruta_base: str, formato: str) -> str:
+    if formato == 'parquet':
+        ruta = ruta_base + '.parquet'
+        df.to_parquet(ruta, index=False)
+    else:
+        ruta = ruta_base + '.csv'
+        df.to_csv(ruta, index=False)
+    return ruta
+
+
+def escribir_resultados(resultados: List[ResultadoArchivo], directorio_salida: str, formato: str = 'parquet') -> Dict[str, str]:
+    """
+    Escribe `rigidez`, `modos`, `amortiguamiento` y `tiempos` (una fila por archivo y etapa en segundos)
+    en `directorio_salida`. `formato`: 'parquet' (requiere pyarrow) o 'csv'.
+    """
+    os.makedirs(directorio_salida, exist_ok=True)
+    tablas = {
+        'rigidez': [r.rigidez for r in resultados if r.rigidez is not None],
+        'modos': [r.modos for r in resultados if r.modos is not None and not r.modos.empty],
+        'amortiguamiento': [r.amortiguamiento for r in resultados if r.amortiguamiento is not None],
+    }
+    rutas = {}
+    for nombre, partes in tablas.items():
+        if partes:
+            rutas[nombre] = _escribir_tabla(pd.concat(partes, ignore_index=True), os.path.join(directorio_salida, nombre), formato)
+    tiempos = pd.DataFrame([{'archivo': r.archivo, 'ruta': r.ruta, 'estado': r.estado, 'error': r.error, **r.tiempos}
+                            for r in resultados])
+    rutas['tiempos'] = _escribir_tabla(tiempos, os.path.join(directorio_salida, 'tiempos'), formato)
+    return rutas
@@ -1,63 +1,256 @@
 from __future__ import annotations
 
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from datetime import datetime
+import functools
 import hashlib
-from typing import Any, Dict, Optional
+import numbers
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from dynamic_stiffness_analyzer.config.settings import CONFIG, USAR_CACHE
+from dynamic_stiffness_analyzer.services.cache_disco import CacheDisco, directorio_cache_por_defecto
+
+
+def _alimentar_hash(h: "hashlib._Hash", obj: Any) -> None:
+    """Serializa `obj` de forma canónica dentro de `h` (arrays por su buffer, sin pasar por texto)."""
+    if isinstance(obj, np.ndarray):
+        arr = np.ascontiguousarray(obj)
+        h.update(f"nd|{arr.dtype.str}|{arr.shape}|".encode())
+        if arr.dtype.hasobject:
+            h.update(repr(arr.tolist()).encode())
+        else:
+            h.update(arr.reshape(-1).view(np.uint8))
+    elif isinstance(obj, pd.DataFrame):
+        h.update(b"df|")
+        _alimentar_hash(h, [str(col) for col in obj.columns])
+        _alimentar_hash(h, obj.index.to_numpy())
+        for col in obj.columns:
+            _alimentar_hash(h, obj[col].to_numpy())
+    elif isinstance(obj, pd.Series):
+        h.update(f"se|{obj.name}|".encode())
+        _alimentar_hash(h, obj.index.to_numpy())
+        _alimentar_hash(h, obj.to_numpy())
+    elif isinstance(obj, Mapping):
+        h.update(f"map|{len(obj)}|".encode())
+        for clave in sorted(obj, key=repr):
+            _alimentar_hash(h, clave)
+            _alimentar_hash(h, obj[clave])
+    elif isinstance(obj, (list, tuple)):
+        h.update(f"seq|{len(obj)}|".encode())
+        for elemento in obj:
+            _alimentar_hash(h, elemento)
+    elif isinstance(obj, (set, frozenset)):
+        _alimentar_hash(h, sorted(obj, key=repr))
+    elif isinstance(obj, (bool, np.bool_)):
+        h.update(f"b|{bool(obj)}|".encode())
+    elif isinstance(obj, numbers.Real):
+        # Parámetros normalizados: 1, 1.0 y np.float64(1.0) generan la misma huella
+        h.update(f"n|{float(obj)!r}|".encode())
+    elif isinstance(obj, str):
+        h.update(f"s|{len(obj)}|".encode())
+        h.update(obj.encode())
+    elif isinstance(obj, bytes):
+        h.update(f"by|{len(obj)}|".encode())
+        h.update(obj)
+    elif obj is None:
+        h.update(b"none|")
+    else:
+        h.update(f"r|{obj!r}|".encode())
+
+
+def huella_contenido(*args: Any, **kwargs: Any) -> str:
+    """
+    Clave de caché direccionada por contenido (BLAKE2b de 128 bits).
+
+    Los arrays NumPy, Series y DataFrames se resumen a partir de sus buffers completos
+    (dtype, forma y bytes), y los parámetros se normalizan antes de resumirse.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    _alimentar_hash(h, args)
+    _alimentar_hash(h, kwargs)
+    return h.hexdigest()
+
+
+# Versión de los algoritmos numéricos: subirla invalida los resultados persistidos aunque el código no cambie
+VERSION_CALCULOS = 1
+
+# Módulos cuyo código determina los resultados cacheados (relativos al paquete)
+_MODULOS_CALCULO = ('analysis', 'signal_processing', os.path.join('services', 'session.py'),
+                    os.path.join('visualization', 'fft_plot.py'), os.path.join('visualization', 'waterfall_plot.py'))
+
+
+@functools.lru_cache(maxsize=1)
+def _huella_codigo() -> str:
+    """Huella del código fuente de los módulos de cálculo: cualquier cambio invalida el caché en disco."""
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    h = hashlib.blake2b(digest_size=16)
+    for modulo in _MODULOS_CALCULO:
+        ruta = os.path.join(raiz, modulo)
+        archivos = sorted(os.path.join(ruta, f) for f in os.listdir(ruta) if f.endswith('.py')) if os.path.isdir(ruta) else [ruta]
+        for archivo in archivos:
+            h.update(os.path.relpath(archivo, raiz).encode())
+            try:
+                with open(archivo, 'rb') as fuente:
+                    h.update(fuente.read())
+            except OSError:
+                pass
+    return h.hexdigest()
+
+
+def sal_calculo(*secciones: str) -> tuple:
+    """
+    Sal para las claves de resultados numéricos: versión de los algoritmos, huella del código de cálculo y
+    contenido de las secciones de `CONFIG` de las que depende el resultado (p. ej. 'TOLERANCIAS').
+    """
+    return (VERSION_CALCULOS, _huella_codigo(), {seccion: getattr(CONFIG, seccion) for seccion in secciones})
+
+
+def _es_figura(obj: Any) -> bool:
+    # Sin importar plotly: si aún no se ha cargado, `obj` no puede ser una figura
+    basedatatypes = sys.modules.get('plotly.basedatatypes')
+    return basedatatypes is not None and isinstance(obj, basedatatypes.BaseFigure)
+
+
+def estimar_tamano(obj: Any) -> int:
+    """Tamaño aproximado en bytes de un resultado (exacto para arrays; estimado para figuras y contenedores)."""
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return int(np.sum(obj.memory_usage(index=True, deep=False)))
+    if _es_figura(obj):
+        return sum(estimar_tamano(traza.to_plotly_json()) for traza in obj.data) + _TAMANO_BASE_FIGURA
+    if isinstance(obj, Mapping):
+        return sys.getsizeof(obj) + sum(estimar_tamano(k) + estimar_tamano(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(estimar_tamano(v) for v in obj)
+    return sys.getsizeof(obj)
+
+
+# Layout y metadatos de una figura Plotly (orden de magnitud)
+_TAMANO_BASE_FIGURA = 4096
+
+
+def _disco_por_defecto() -> Optional[CacheDisco]:
+    if not CONFIG.CACHE_COMPUTACIONAL['USAR_DISCO']:
+        return None
+    return CacheDisco(directorio_cache_por_defecto())
 
 
 @dataclass
 class CacheComputacional:
     """
-    Sistema de caché LRU sencillo para resultados de cálculos costosos.
+    Caché LRU de resultados de cálculos costosos, acotado por bytes y número de entradas.
+
+    El orden de uso se mantiene en un `OrderedDict` (acceso y desalojo O(1)); el tamaño de cada
+    entrada se estima al guardarla (`estimar_tamano`). Seguro para uso concurrente entre hilos.
+
+    Con `disco` (ver `CacheDisco`), los resultados numéricos también se persisten y un fallo en
+    memoria se resuelve desde disco antes de recalcular.
     """
 
-    max_cache_size: int = 50
-    cache: Dict[str, Any] = field(default_factory=dict)
-    cache_access_times: Dict[str, datetime] = field(default_factory=dict)
+    max_cache_size: int = CONFIG.CACHE_COMPUTACIONAL['MAX_ENTRADAS']
+    max_bytes: int = CONFIG.CACHE_COMPUTACIONAL['MAX_BYTES']
+    habilitado: bool = USAR_CACHE
+    disco: Optional[CacheDisco] = field(default_factory=_disco_por_defecto)
+    cache: "OrderedDict[str, Any]" = field(default_factory=OrderedDict)
+    tamanos: Dict[str, int] = field(default_factory=dict)
+    bytes_totales: int = 0
     hits: int = 0
+    hits_disco: int = 0
     misses: int = 0
+    _lock: Any = field(default_factory=threading.RLock)
 
     def generar_hash_parametros(self, *args: Any, **kwargs: Any) -> Optional[str]:
         try:
-            parametros_str = f"{args}_{sorted(kwargs.items())}"
-            return hashlib.md5(parametros_str.encode()).hexdigest()
+            return huella_contenido(*args, **kwargs)
         except Exception:
             return None
 
     def obtener_de_cache(self, cache_key: Optional[str]) -> Optional[Any]:
-        if cache_key and cache_key in self.cache:
-            self.cache_access_times[cache_key] = datetime.now()
-            self.hits += 1
-            return self.cache[cache_key]
-        self.misses += 1
-        return None
+        with self._lock:
+            if cache_key and cache_key in self.cache:
+                self.cache.move_to_end(cache_key)
+                self.hits += 1
+                return self.cache[cache_key]
+        resultado = self.disco.obtener(cache_key) if (cache_key and self.disco is not None) else None
+        with self._lock:
+            if resultado is None:
+                self.misses += 1
+                return None
+            self.hits_disco += 1
+        self._guardar_en_memoria(cache_key, resultado)
+        return resultado
 
-    def guardar_en_cache(self, cache_key: Optional[str], resultado: Any) -> None:
+    def guardar_en_cache(self, cache_key: Optional[str], resultado: Any, costo_s: Optional[float] = None) -> None:
+        """Guarda en memoria; en disco solo si `costo_s` (segundos de cálculo) supera claramente su lectura."""
         if not cache_key:
             return
-        if len(self.cache) >= self.max_cache_size:
-            oldest_key = min(self.cache_access_times.keys(), key=lambda k: self.cache_access_times[k])
-            self.cache.pop(oldest_key, None)
-            self.cache_access_times.pop(oldest_key, None)
-        self.cache[cache_key] = resultado
-        self.cache_access_times[cache_key] = datetime.now()
-
-    def limpiar_cache(self) -> None:
-        self.cache.clear()
-        self.cache_access_times.clear()
-        self.hits = 0
-        self.misses = 0
+        self._guardar_en_memoria(cache_key, resultado)
+        if self.disco is not None and costo_s is not None and self.disco.merece_persistir(resultado, costo_s):
+            self.disco.guardar(cache_key, resultado)
+
+    def obtener_o_calcular(self, cache_key: Optional[str], calcular: Callable[[], Any]) -> Any:
+        """Devuelve el resultado en caché para `cache_key` o lo calcula y lo guarda (si el caché está habilitado)."""
+        if not self.habilitado or not cache_key:
+            return calcular()
+        resultado = self.obtener_de_cache(cache_key)
+        if resultado is None:
+            inicio = time.perf_counter()
+            resultado = calcular()
+            self.guardar_en_cache(cache_key, resultado, time.perf_counter() - inicio)
+        return resultado
+
+    def limpiar_cache(self, incluir_disco: bool = False) -> None:
+        with self._lock:
+            self.cache.clear()
+            self.tamanos.clear()
+            self.bytes_totales = 0
+            self.hits = 0
+            self.hits_disco = 0
+            self.misses = 0
+        if incluir_disco and self.disco is not None:
+            self.disco.limpiar()
 
     def estadisticas_cache(self) -> Dict[str, Any]:
-        total_requests = self.hits + self.misses
-        hit_rate = (self.hits / total_requests * 100) if total_requests > 0 else 0
-        return {
-            "hits": self.hits,
-            "misses": self.misses,
-            "hit_rate": hit_rate,
-            "cache_size": len(self.cache),
-        }
+        with self._lock:
+            total_requests = self.hits + self.hits_disco + self.misses
+            hit_rate = ((self.hits + self.hits_disco) / total_requests * 100) if total_requests > 0 else 0
+            return {
+                "hits": self.hits,
+                "hits_disco": self.hits_disco,
+                "misses": self.misses,
+                "hit_rate": hit_rate,
+                "cache_size": len(self.cache),
+                "bytes_totales": self.bytes_totales,
+                "max_bytes": self.max_bytes,
+                # De menos a más recientemente usada
+                "entradas": [{"clave": clave, "bytes": self.tamanos[clave]} for clave in self.cache],
+                "disco": self.disco.estadisticas() if self.disco is not None else None,
+            }
+
+    def _guardar_en_memoria(self, cache_key: str, resultado: Any) -> None:
+        tamano = estimar_tamano(resultado)
+        with self._lock:
+            self._descartar(cache_key)
+            if tamano > self.max_bytes:
+                return
+            self.cache[cache_key] = resultado
+            self.tamanos[cache_key] = tamano
+            self.bytes_totales += tamano
+            while len(self.cache) > self.max_cache_size or self.bytes_totales > self.max_bytes:
+                self._descartar(next(iter(self.cache)))
+
+    def _descartar(self, cache_key: str) -> None:
+        if cache_key in self.cache:
+            del self.cache[cache_key]
+            self.bytes_totales -= self.tamanos.pop(cache_key)
 
 
 # Instancia global reutilizable (inyectable si se desea)
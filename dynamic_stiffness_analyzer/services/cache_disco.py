@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import queue
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from dynamic_stiffness_analyzer.config.settings import CONFIG
+
+
+logger = logging.getLogger(__name__)
+
+
+# Versión del formato de archivo; un cambio invalida las entradas anteriores
+_VERSION_FORMATO = 2
+# Lectura de un archivo pequeño (apertura, cabeceras del .npz, estructura JSON)
+_SEGUNDOS_APERTURA = 0.002
+_CLAVE_ESTRUCTURA = "__estructura__"
+
+
+class _NoPersistible(TypeError):
+    """El resultado contiene objetos que no se guardan en disco (p. ej. figuras)."""
+
+
+def _aplanar(obj: Any, arrays: Dict[str, np.ndarray]) -> Any:
+    """Describe `obj` como JSON y mueve sus arrays a `arrays` (nombres a0, a1, ...)."""
+    if isinstance(obj, np.ndarray):
+        if obj.dtype.hasobject:
+            raise _NoPersistible("array de objetos")
+        nombre = f"a{len(arrays)}"
+        arrays[nombre] = obj
+        return {"nd": nombre}
+    if isinstance(obj, dict):
+        if not all(isinstance(k, str) for k in obj):
+            raise _NoPersistible("claves no textuales")
+        return {"dict": {k: _aplanar(v, arrays) for k, v in obj.items()}}
+    if isinstance(obj, (list, tuple)):
+        return {"list" if isinstance(obj, list) else "tuple": [_aplanar(v, arrays) for v in obj]}
+    if isinstance(obj, np.generic):
+        obj = obj.item()
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return {"v": obj}
+    raise _NoPersistible(type(obj).__name__)
+
+
+def _bytes_arrays(obj: Any) -> int:
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, dict):
+        return sum(_bytes_arrays(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(_bytes_arrays(v) for v in obj)
+    return 0
+
+
+def _reconstruir(nodo: Any, datos: Any) -> Any:
+    if "nd" in nodo:
+        return datos[nodo["nd"]]
+    if "dict" in nodo:
+        return {k: _reconstruir(v, datos) for k, v in nodo["dict"].items()}
+    if "list" in nodo:
+        return [_reconstruir(v, datos) for v in nodo["list"]]
+    if "tuple" in nodo:
+        return tuple(_reconstruir(v, datos) for v in nodo["tuple"])
+    return nodo["v"]
+
+
+@dataclass
+class CacheDisco:
+    """
+    Nivel persistente del caché: resultados numéricos (espectros, FRF, rigidez, matrices de waterfall)
+    guardados como `.npz` sin comprimir con nombre igual a su huella de contenido.
+
+    Solo se persisten estructuras de arrays NumPy, escalares y dict/list/tuple; el resto (figuras)
+    permanece únicamente en memoria, igual que los resultados cuyo cálculo no cuesta al menos
+    `factor_coste` veces su lectura estimada. La escritura la hace un hilo en segundo plano, fuera del
+    cerrojo, para no retrasar al callback que calculó el resultado. El tamaño total se acota desalojando
+    los archivos usados hace más tiempo.
+    """
+
+    directorio: str
+    max_bytes: int = CONFIG.CACHE_COMPUTACIONAL['MAX_BYTES_DISCO']
+    bytes_por_segundo: float = CONFIG.CACHE_COMPUTACIONAL['BYTES_POR_SEGUNDO_DISCO']
+    factor_coste: float = CONFIG.CACHE_COMPUTACIONAL['FACTOR_COSTE_DISCO']
+    _indice: Optional["OrderedDict[str, int]"] = None
+    _bytes_totales: int = 0
+    _pendientes: set = field(default_factory=set)
+    _cola: "queue.Queue[Tuple[str, str, Dict[str, np.ndarray]]]" = field(default_factory=queue.Queue)
+    _escritor: Optional[threading.Thread] = None
+    _lock: Any = field(default_factory=threading.RLock)
+
+    def __post_init__(self) -> None:
+        atexit.register(self.esperar_escrituras)
+
+    def obtener(self, clave: str) -> Optional[Any]:
+        ruta = self._ruta(clave)
+        nombre = os.path.basename(ruta)
+        with self._lock:
+            self._cargar_indice()
+            if nombre not in self._indice:
+                return None
+        # La lectura no toma el cerrojo: otras lecturas y el escritor no esperan al disco
+        try:
+            with np.load(ruta, allow_pickle=False) as datos:
+                estructura = json.loads(str(datos[_CLAVE_ESTRUCTURA]))
+                if estructura.get("version") != _VERSION_FORMATO:
+                    raise ValueError("formato de caché obsoleto")
+                resultado = _reconstruir(estructura["raiz"], {k: datos[k] for k in datos.files})
+        except Exception:
+            with self._lock:
+                self._eliminar(nombre)
+            return None
+        with self._lock:
+            # Registrar el uso (orden LRU persistente entre sesiones vía mtime)
+            if nombre in self._indice:
+                self._indice.move_to_end(nombre)
+        try:
+            os.utime(ruta)
+        except OSError:
+            pass
+        return resultado
+
+    def merece_persistir(self, resultado: Any, costo_s: float) -> bool:
+        """El cálculo (`costo_s` segundos) cuesta claramente más que leer `resultado` del disco."""
+        lectura_s = _SEGUNDOS_APERTURA + _bytes_arrays(resultado) / self.bytes_por_segundo
+        return costo_s >= self.factor_coste * lectura_s
+
+    def guardar(self, clave: str, resultado: Any) -> bool:
+        """
+        Encola la escritura de `resultado`; devuelve False si su contenido no es persistible.
+        Los arrays se escriben tal cual: no se deben modificar después de guardarlos.
+        """
+        arrays: Dict[str, np.ndarray] = {}
+        try:
+            raiz = _aplanar(resultado, arrays)
+        except _NoPersistible:
+            return False
+        estructura = json.dumps({"version": _VERSION_FORMATO, "raiz": raiz})
+        nombre = os.path.basename(self._ruta(clave))
+        with self._lock:
+            if nombre in self._pendientes:
+                return True
+            self._pendientes.add(nombre)
+            # Tras un fork el hilo heredado no existe en el proceso hijo
+            if self._escritor is None or not self._escritor.is_alive():
+                self._escritor = threading.Thread(target=self._escribir_pendientes, daemon=True, name="cache-disco")
+                self._escritor.start()
+        self._cola.put((nombre, estructura, arrays))
+        return True
+
+    def esperar_escrituras(self) -> None:
+        """Bloquea hasta que las escrituras encoladas terminan (salida del proceso, pruebas)."""
+        if self._escritor is not None and self._escritor.is_alive():
+            self._cola.join()
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._cargar_indice()
+            for nombre in list(self._indice):
+                self._eliminar(nombre)
+
+    def estadisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            self._cargar_indice()
+            return {
+                "directorio": self.directorio,
+                "archivos": len(self._indice),
+                "bytes_totales": self._bytes_totales,
+                "max_bytes": self.max_bytes,
+            }
+
+    # --- Gestión interna ---
+
+    def _escribir_pendientes(self) -> None:
+        while True:
+            nombre, estructura, arrays = self._cola.get()
+            try:
+                self._escribir(nombre, estructura, arrays)
+            except Exception as e:
+                logger.warning("No se pudo escribir %s en el caché en disco: %s", nombre, e)
+            finally:
+                with self._lock:
+                    self._pendientes.discard(nombre)
+                self._cola.task_done()
+
+    def _escribir(self, nombre: str, estructura: str, arrays: Dict[str, np.ndarray]) -> None:
+        """Escribe a un temporal sin el cerrojo y lo publica con un `os.replace` atómico."""
+        if sum(a.nbytes for a in arrays.values()) > self.max_bytes:
+            return
+        os.makedirs(self.directorio, exist_ok=True)
+        fd, temporal = tempfile.mkstemp(dir=self.directorio, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as archivo:
+                np.savez(archivo, **{_CLAVE_ESTRUCTURA: np.array(estructura)}, **arrays)
+            tamano = os.path.getsize(temporal)
+            os.replace(temporal, os.path.join(self.directorio, nombre))
+        except OSError:
+            try:
+                os.remove(temporal)
+            except OSError:
+                pass
+            raise
+        with self._lock:
+            self._cargar_indice()
+            self._bytes_totales -= self._indice.pop(nombre, 0)
+            self._indice[nombre] = tamano
+            self._bytes_totales += tamano
+            while self._bytes_totales > self.max_bytes and len(self._indice) > 1:
+                self._eliminar(next(iter(self._indice)))
+
+    # (llamar con el lock tomado)
+
+    def _ruta(self, clave: str) -> str:
+        # Las huellas de `huella_contenido` ya son hexadecimales; otras claves se resumen
+        if not re.fullmatch(r"[0-9a-f]{8,128}", clave):
+            clave = hashlib.blake2b(clave.encode(), digest_size=16).hexdigest()
+        return os.path.join(self.directorio, f"{clave}.npz")
+
+    def _cargar_indice(self) -> None:
+        """Indexa los archivos existentes (del más antiguo al más reciente por mtime)."""
+        if self._indice is not None:
+            return
+        entradas = []
+        if os.path.isdir(self.directorio):
+            for entrada in os.scandir(self.directorio):
+                if entrada.is_file() and entrada.name.endswith(".npz"):
+                    info = entrada.stat()
+                    entradas.append((info.st_mtime, entrada.name, info.st_size))
+        entradas.sort()
+        self._indice = OrderedDict((nombre, tamano) for _, nombre, tamano in entradas)
+        self._bytes_totales = sum(self._indice.values())
+
+    def _eliminar(self, nombre: str) -> None:
+        self._bytes_totales -= self._indice.pop(nombre, 0)
+        try:
+            os.remove(os.path.join(self.directorio, nombre))
+        except OSError:
+            pass
+
+
+def directorio_cache_por_defecto() -> str:
+    """Directorio configurado o `~/.cache/dynamic_stiffness_analyzer` si no se especifica."""
+    directorio = CONFIG.CACHE_COMPUTACIONAL['DIRECTORIO_DISCO']
+    if directorio:
+        return directorio
+    return os.path.join(os.path.expanduser("~"), ".cache", "dynamic_stiffness_analyzer")
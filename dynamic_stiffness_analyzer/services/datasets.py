@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import atexit
+import io
+import itertools
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from dynamic_stiffness_analyzer.config.settings import CONFIG
+from dynamic_stiffness_analyzer.io.dataset_memmap import (
+    EXTENSION_CABECERA,
+    EXTENSION_DATOS,
+    abrir_dataset_memmap,
+    escribir_dataset_memmap,
+    leer_cabecera_memmap,
+)
+from dynamic_stiffness_analyzer.services.profiling import PERFILADOR
+
+
+Referencia = Dict[str, Any]
+
+
+@dataclass
+class _EntradaDataset:
+    version: int
+    columnas: List[str]
+    arrays: Optional[Dict[str, np.ndarray]]
+    indice: Optional[np.ndarray]
+    nbytes: int
+    ruta_disco: Optional[str] = None
+    ruta_memmap: Optional[str] = None  # Cabecera `.dsa.json`: los datos se leen del archivo bajo demanda
+    memmap_propio: bool = False        # El archivo lo creó el registro (se borra al descartar)
+
+
+def _rutas_memmap(ruta_cabecera: str) -> List[str]:
+    """Cabecera `.dsa.json` y datos `.dsa.bin` de un dataset memmap."""
+    return [ruta_cabecera, ruta_cabecera[:-len(EXTENSION_CABECERA)] + EXTENSION_DATOS]
+
+
+@dataclass
+class RegistroDatasets:
+    """
+    Registro en servidor de DataFrames como arrays NumPy por columna.
+
+    Las stores de Dash guardan solo una referencia `{'id', 'version'}`; los datos viven aquí.
+    Nivel en memoria con desalojo LRU por bytes y nivel opcional en disco (`.npz`) al que se
+    desalojan los datasets menos usados en lugar de descartarlos. Los archivos del registro en disco
+    (spill y memmaps propios) se acotan a `max_bytes_disco` descartando los usados hace más tiempo; un
+    directorio de spill temporal se borra al salir.
+    Los callbacks que recalculan un dataset derivado (filtrado, corte) pasan la referencia anterior para
+    reemplazarla en lugar de acumular versiones.
+
+    Los datasets grandes (`umbral_memmap_bytes`) o ya guardados en el formato memmap no ocupan el
+    nivel en memoria: se sirven como DataFrames sobre `np.memmap` (ver `io.dataset_memmap`).
+    """
+
+    max_bytes_memoria: int = CONFIG.REGISTRO_DATASETS['MAX_BYTES_MEMORIA']
+    spill_a_disco: bool = CONFIG.REGISTRO_DATASETS['SPILL_A_DISCO']
+    directorio_spill: Optional[str] = CONFIG.REGISTRO_DATASETS['DIRECTORIO_SPILL']
+    max_bytes_disco: int = CONFIG.REGISTRO_DATASETS['MAX_BYTES_DISCO']
+    umbral_memmap_bytes: Optional[int] = CONFIG.REGISTRO_DATASETS['UMBRAL_MEMMAP_BYTES']
+    dtype_memmap: str = CONFIG.REGISTRO_DATASETS['DTYPE_MEMMAP']
+    entradas: Dict[str, _EntradaDataset] = field(default_factory=dict)
+    _lru: "OrderedDict[str, None]" = field(default_factory=OrderedDict)
+    _bytes_memoria: int = 0
+    _disco: "OrderedDict[str, int]" = field(default_factory=OrderedDict)  # id → bytes en disco, del más antiguo al más reciente
+    _bytes_disco: int = 0
+    _directorio_temporal: bool = False
+    _versiones: Any = field(default_factory=lambda: itertools.count(1))
+    _lock: Any = field(default_factory=threading.RLock)
+
+    def registrar(self, df: pd.DataFrame, dataset_id: Optional[str] = None) -> Referencia:
+        """Guarda `df` y devuelve su referencia. Con `dataset_id` existente lo reemplaza (nueva versión)."""
+        arrays = {str(col): np.ascontiguousarray(df[col].to_numpy()) for col in df.columns}
+        indice = None
+        if not isinstance(df.index, pd.RangeIndex) or df.index.start != 0 or df.index.step != 1:
+            indice = df.index.to_numpy()
+        nbytes = sum(a.nbytes for a in arrays.values()) + (indice.nbytes if indice is not None else 0)
+        if self._usar_memmap(arrays, nbytes):
+            ruta = escribir_dataset_memmap(arrays, os.path.join(self._directorio(), uuid.uuid4().hex), self.dtype_memmap)
+            return self.registrar_memmap(ruta, dataset_id, indice=indice, propio=True)
+        with self._lock:
+            dataset_id = self._nuevo_id(dataset_id)
+            version = next(self._versiones)
+            self.entradas[dataset_id] = _EntradaDataset(version, list(arrays), arrays, indice, nbytes)
+            self._lru[dataset_id] = None
+            self._bytes_memoria += nbytes
+            self._desalojar_si_necesario(proteger=dataset_id)
+        return {'id': dataset_id, 'version': version}
+
+    def registrar_memmap(self, ruta: str, dataset_id: Optional[str] = None, indice: Optional[np.ndarray] = None,
+                         propio: bool = False) -> Referencia:
+        """Registra un dataset en formato memmap (ruta de su cabecera) sin cargarlo en memoria."""
+        cabecera = leer_cabecera_memmap(ruta)
+        with self._lock:
+            dataset_id = self._nuevo_id(dataset_id)
+            version = next(self._versiones)
+            self.entradas[dataset_id] = _EntradaDataset(version, list(cabecera['columnas']), None, indice, 0,
+                                                        ruta_memmap=ruta, memmap_propio=propio)
+            if propio:
+                # Los archivos que escribió el registro cuentan en el presupuesto de disco (los ajenos no)
+                self._disco[dataset_id] = sum(os.path.getsize(r) for r in _rutas_memmap(ruta))
+                self._bytes_disco += self._disco[dataset_id]
+                self._recortar_disco(proteger=dataset_id)
+        return {'id': dataset_id, 'version': version}
+
+    def obtener(self, referencia: Optional[Referencia]) -> Optional[pd.DataFrame]:
+        """Reconstruye el DataFrame de `referencia`; None si no existe o la versión no coincide."""
+        if not referencia or 'id' not in referencia:
+            return None
+        with self._lock:
+            entrada = self.entradas.get(referencia['id'])
+            if entrada is None or entrada.version != referencia.get('version', entrada.version):
+                return None
+            if entrada.ruta_memmap is not None:
+                if referencia['id'] in self._disco:
+                    self._disco.move_to_end(referencia['id'])
+                # Copia en escritura: quien modifique el DataFrame no altera el archivo
+                df = abrir_dataset_memmap(entrada.ruta_memmap)
+                if entrada.indice is not None:
+                    df.index = entrada.indice
+                return df
+            if entrada.arrays is None:
+                self._cargar_de_disco(referencia['id'], entrada)
+            self._lru.move_to_end(referencia['id'])
+            arrays, indice, columnas = entrada.arrays, entrada.indice, entrada.columnas
+            self._desalojar_si_necesario(proteger=referencia['id'])
+        return pd.DataFrame({col: arrays[col] for col in columnas}, index=indice, copy=True)
+
+    def eliminar(self, dataset_id: str) -> None:
+        with self._lock:
+            if dataset_id in self.entradas:
+                self._descartar(dataset_id)
+
+    def limpiar(self) -> None:
+        with self._lock:
+            for dataset_id in list(self.entradas):
+                self._descartar(dataset_id)
+
+    def estadisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            en_memmap = sum(1 for e in self.entradas.values() if e.ruta_memmap is not None)
+            en_disco = sum(1 for e in self.entradas.values() if e.arrays is None) - en_memmap
+            return {
+                "datasets": len(self.entradas),
+                "en_memoria": len(self.entradas) - en_disco - en_memmap,
+                "en_disco": en_disco,
+                "en_memmap": en_memmap,
+                "bytes_memoria": self._bytes_memoria,
+                "bytes_disco": self._bytes_disco,
+                "max_bytes_memoria": self.max_bytes_memoria,
+            }
+
+    # --- Gestión interna (llamar con el lock tomado) ---
+
+    def _usar_memmap(self, arrays: Dict[str, np.ndarray], nbytes: int) -> bool:
+        return (
+            self.umbral_memmap_bytes is not None
+            and nbytes >= self.umbral_memmap_bytes
+            and all(a.ndim == 1 and a.dtype.kind == 'f' for a in arrays.values())
+        )
+
+    def _nuevo_id(self, dataset_id: Optional[str]) -> str:
+        if dataset_id is not None and dataset_id in self.entradas:
+            self._descartar(dataset_id)
+            return dataset_id
+        return uuid.uuid4().hex
+
+    def _directorio(self) -> str:
+        if self.directorio_spill is None:
+            self.directorio_spill = tempfile.mkdtemp(prefix="dsa_datasets_")
+            self._directorio_temporal = True
+            atexit.register(self._borrar_directorio_temporal)
+        os.makedirs(self.directorio_spill, exist_ok=True)
+        return self.directorio_spill
+
+    def _descartar(self, dataset_id: str) -> None:
+        entrada = self.entradas.pop(dataset_id)
+        self._lru.pop(dataset_id, None)
+        self._bytes_disco -= self._disco.pop(dataset_id, 0)
+        if entrada.arrays is not None:
+            self._bytes_memoria -= entrada.nbytes
+        rutas = [entrada.ruta_disco]
+        if entrada.memmap_propio:
+            rutas += _rutas_memmap(entrada.ruta_memmap)
+        for ruta in rutas:
+            if not ruta:
+                continue
+            try:
+                os.remove(ruta)
+            except OSError:
+                pass
+
+    def _desalojar_si_necesario(self, proteger: str) -> None:
+        for dataset_id in list(self._lru):
+            if self._bytes_memoria <= self.max_bytes_memoria:
+                break
+            if dataset_id == proteger:
+                continue
+            if self.spill_a_disco:
+                self._mover_a_disco(dataset_id, self.entradas[dataset_id])
+            else:
+                self._descartar(dataset_id)
+
+    def _mover_a_disco(self, dataset_id: str, entrada: _EntradaDataset) -> None:
+        ruta = os.path.join(self._directorio(), f"{dataset_id}.npz")
+        datos = {f"c{i}": entrada.arrays[col] for i, col in enumerate(entrada.columnas)}
+        if entrada.indice is not None:
+            datos["indice"] = entrada.indice
+        np.savez(ruta, **datos)
+        entrada.ruta_disco = ruta
+        entrada.arrays = None
+        self._lru.pop(dataset_id, None)
+        self._bytes_memoria -= entrada.nbytes
+        self._disco[dataset_id] = os.path.getsize(ruta)
+        self._bytes_disco += self._disco[dataset_id]
+        self._recortar_disco(proteger=dataset_id)
+
+    def _recortar_disco(self, proteger: str) -> None:
+        for dataset_id in list(self._disco):
+            if self._bytes_disco <= self.max_bytes_disco:
+                break
+            if dataset_id != proteger:
+                self._descartar(dataset_id)
+
+    def _borrar_directorio_temporal(self) -> None:
+        # Al salir del proceso: el directorio lo creó el registro y solo contiene sus archivos
+        if self._directorio_temporal and self.directorio_spill:
+            shutil.rmtree(self.directorio_spill, ignore_errors=True)
+
+    def _cargar_de_disco(self, dataset_id: str, entrada: _EntradaDataset) -> None:
+        with np.load(entrada.ruta_disco, allow_pickle=True) as datos:
+            entrada.arrays = {col: datos[f"c{i}"] for i, col in enumerate(entrada.columnas)}
+            if "indice" in datos.files:
+                entrada.indice = datos["indice"]
+        try:
+            os.remove(entrada.ruta_disco)
+        except OSError:
+            pass
+        entrada.ruta_disco = None
+        self._bytes_disco -= self._disco.pop(dataset_id, 0)
+        self._lru[dataset_id] = None
+        self._bytes_memoria += entrada.nbytes
+
+
+# Instancia global reutilizable (inyectable si se desea)
+REGISTRO = RegistroDatasets()
+
+
+def guardar_dataset(df: pd.DataFrame, reemplazar: Any = None) -> Referencia:
+    """
+    Registra `df` en el registro global y devuelve la referencia para una dcc.Store.
+
+    `reemplazar`: contenido anterior de la store (p. ej. el filtrado previo); su dataset se sustituye por `df`.
+    """
+    dataset_id = reemplazar.get('id') if isinstance(reemplazar, dict) else None
+    return REGISTRO.registrar(df, dataset_id)
+
+
+@PERFILADOR.medir('lectura_dataset')
+def leer_dataset(datos: Any) -> Optional[pd.DataFrame]:
+    """
+    Devuelve el DataFrame asociado al contenido de una dcc.Store.
+
+    Acepta la referencia `{'id', 'version'}` del registro o, por compatibilidad, un JSON
+    `orient='split'` de versiones anteriores. Retorna None si no hay datos.
+    """
+    if datos is None or (isinstance(datos, str) and datos == ''):
+        return None
+    if isinstance(datos, str):
+        return pd.read_json(io.StringIO(datos), orient='split')
+    return REGISTRO.obtener(datos)
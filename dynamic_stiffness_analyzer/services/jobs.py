@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as TiempoAgotado
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from dynamic_stiffness_analyzer.config.settings import CONFIG
+from dynamic_stiffness_analyzer.services.parallel import EJECUTOR_CANALES, configurar_hilos_proceso
+from dynamic_stiffness_analyzer.services.profiling import PERFILADOR, medir_en_proceso
+
+
+logger = logging.getLogger(__name__)
+
+
+# Módulos que el servidor `forkserver` importa una vez (los procesos del pool los heredan ya cargados)
+_PRECARGA_PROCESOS = ['dynamic_stiffness_analyzer.services.session', 'dynamic_stiffness_analyzer.analysis.spectrogram']
+
+
+def contexto_procesos() -> multiprocessing.context.BaseContext:
+    """
+    Contexto del pool sin `fork` del servidor: un hijo creado con fork heredaría los hilos del servidor
+    Flask y cerrojos que otro hilo tuviera tomados (caché, registro de datasets, trabajos) y podría
+    bloquearse. `forkserver` (o `spawn` donde no existe) arranca los procesos desde un intérprete limpio.
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        contexto = multiprocessing.get_context('forkserver')
+        contexto.set_forkserver_preload(_PRECARGA_PROCESOS)
+        return contexto
+    return multiprocessing.get_context('spawn')
+
+
+# Un paso recibe `ejecutar(funcion, *args)` para delegar sus cálculos pesados al pool de procesos
+Paso = Tuple[str, Callable[[Callable[..., Any]], Any]]
+
+ESTADOS_ACTIVOS = ('pendiente', 'ejecutando')
+
+
+class TrabajoCancelado(Exception):
+    """El trabajo se canceló (por el usuario o por quedar obsoleto) antes de terminar."""
+
+
+@dataclass
+class Trabajo:
+    id: str
+    clave: str
+    grupo: str
+    pasos: List[Paso]
+    estado: str = 'pendiente'  # 'pendiente' | 'ejecutando' | 'completado' | 'cancelado' | 'error'
+    paso: int = 0
+    mensaje: str = 'En cola'
+    error: Optional[str] = None
+    resultados: Dict[str, Any] = field(default_factory=dict)
+    inicio: float = field(default_factory=time.perf_counter)
+    fin: Optional[float] = None
+    cancelado: threading.Event = field(default_factory=threading.Event)
+
+    @property
+    def activo(self) -> bool:
+        return self.estado in ESTADOS_ACTIVOS
+
+    def resumen(self) -> Dict[str, Any]:
+        """Estado serializable para una dcc.Store (`procesamiento-estado`)."""
+        return {
+            'activo': self.activo,
+            'trabajo': self.id,
+            'estado': self.estado,
+            'paso': self.paso,
+            'max_pasos': len(self.pasos),
+            'mensaje': self.mensaje,
+            'error': self.error,
+            'duracion': round((self.fin or time.perf_counter()) - self.inicio, 3),
+        }
+
+
+@dataclass
+class GestorTrabajos:
+    """
+    Ejecuta análisis largos fuera del worker de Dash con progreso por pasos y cancelación.
+
+    Cada trabajo corre sus pasos en un hilo propio; los cálculos pesados de cada paso se envían a un
+    pool local de procesos (sin broker externo). Un trabajo nuevo de un grupo cancela los trabajos
+    activos del mismo grupo (obsoletos) y una petición con la misma clave que uno activo lo reutiliza.
+    La cancelación se atiende entre pasos y mientras se espera a un cálculo del pool; el resultado de
+    un cálculo ya en curso se descarta.
+    """
+
+    usar_procesos: bool = CONFIG.PROCESAMIENTO['USAR_PROCESOS']
+    max_procesos: int = CONFIG.PROCESAMIENTO['MAX_PROCESOS']
+    max_trabajos: int = CONFIG.PROCESAMIENTO['MAX_TRABAJOS']
+    _trabajos: "OrderedDict[str, Trabajo]" = field(default_factory=OrderedDict)
+    _pool: Optional[ProcessPoolExecutor] = None
+    _lock: Any = field(default_factory=threading.RLock)
+
+    def enviar(self, pasos: List[Paso], clave: str, grupo: str = 'analisis') -> Trabajo:
+        with self._lock:
+            for trabajo in self._trabajos.values():
+                if trabajo.clave == clave and trabajo.activo:
+                    return trabajo
+            for trabajo in self._trabajos.values():
+                if trabajo.grupo == grupo and trabajo.activo:
+                    self._cancelar(trabajo, 'Cancelado: entradas modificadas')
+            trabajo = Trabajo(uuid.uuid4().hex, clave, grupo, list(pasos))
+            self._trabajos[trabajo.id] = trabajo
+            self._recortar()
+        threading.Thread(target=self._ejecutar_trabajo, args=(trabajo,), daemon=True,
+                         name=f"trabajo-{trabajo.id[:8]}").start()
+        return trabajo
+
+    def obtener(self, trabajo_id: Optional[str]) -> Optional[Trabajo]:
+        with self._lock:
+            return self._trabajos.get(trabajo_id) if trabajo_id else None
+
+    def cancelar(self, trabajo_id: Optional[str]) -> bool:
+        with self._lock:
+            trabajo = self._trabajos.get(trabajo_id) if trabajo_id else None
+            if trabajo is None or not trabajo.activo:
+                return False
+            self._cancelar(trabajo, 'Cancelado por el usuario')
+            return True
+
+    def ejecutar(self, trabajo: Trabajo, funcion: Callable[..., Any], *args: Any) -> Any:
+        """Ejecuta `funcion(*args)` en el pool y espera atendiendo a la cancelación del trabajo."""
+        if trabajo.cancelado.is_set():
+            raise TrabajoCancelado()
+        pool = self._obtener_pool()
+        if pool is None:
+            return funcion(*args)
+        medir = PERFILADOR.habilitado
+        with PERFILADOR.tramo(f"pool:{getattr(funcion, '__name__', 'calculo')}"):
+            try:
+                futuro = pool.submit(medir_en_proceso, funcion, *args) if medir else pool.submit(funcion, *args)
+            except (BrokenProcessPool, RuntimeError):
+                self._descartar_pool()
+                return funcion(*args)
+            while True:
+                try:
+                    resultado = futuro.result(timeout=0.1)
+                    break
+                except TiempoAgotado:
+                    if trabajo.cancelado.is_set():
+                        futuro.cancel()
+                        raise TrabajoCancelado()
+                except BrokenProcessPool:
+                    # Un proceso murió (p. ej. sin memoria): recrear el pool y calcular en este hilo
+                    self._descartar_pool()
+                    return funcion(*args)
+        if not medir:
+            return resultado
+        # Los tramos medidos en el proceso hijo se suman a la ejecución activa
+        resultado, medidas = resultado
+        PERFILADOR.fusionar(medidas)
+        return resultado
+
+    def cerrar(self) -> None:
+        with self._lock:
+            for trabajo in self._trabajos.values():
+                if trabajo.activo:
+                    self._cancelar(trabajo, 'Cancelado: cierre de la aplicación')
+            self._descartar_pool()
+
+    def estadisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            activos = sum(1 for t in self._trabajos.values() if t.activo)
+            return {
+                'trabajos': len(self._trabajos),
+                'activos': activos,
+                'procesos': self.max_procesos if self._pool is not None else 0,
+            }
+
+    # --- Gestión interna ---
+
+    def _ejecutar_trabajo(self, trabajo: Trabajo) -> None:
+        trabajo.estado = 'ejecutando'
+        try:
+            for i, (descripcion, paso) in enumerate(trabajo.pasos):
+                if trabajo.cancelado.is_set():
+                    raise TrabajoCancelado()
+                trabajo.paso, trabajo.mensaje = i, descripcion
+                trabajo.resultados[descripcion] = paso(lambda funcion, *args: self.ejecutar(trabajo, funcion, *args))
+            trabajo.paso, trabajo.mensaje = len(trabajo.pasos), 'Procesamiento completado'
+            trabajo.estado = 'completado'
+        except TrabajoCancelado:
+            trabajo.estado = 'cancelado'
+        except Exception as e:
+            logger.error("Trabajo %s falló en '%s': %s", trabajo.id[:8], trabajo.mensaje, e)
+            trabajo.estado, trabajo.error = 'error', str(e)[:200]
+        finally:
+            trabajo.fin = time.perf_counter()
+
+    def _cancelar(self, trabajo: Trabajo, mensaje: str) -> None:
+        trabajo.cancelado.set()
+        trabajo.mensaje = mensaje
+
+    def _recortar(self) -> None:
+        terminados = [tid for tid, t in self._trabajos.items() if not t.activo]
+        for tid in terminados[:max(0, len(self._trabajos) - self.max_trabajos)]:
+            del self._trabajos[tid]
+
+    def _obtener_pool(self) -> Optional[ProcessPoolExecutor]:
+        if not self.usar_procesos or self.max_procesos < 1:
+            return None
+        with self._lock:
+            if self._pool is None:
+                n_procesos = min(self.max_procesos, os.cpu_count() or 1)
+                try:
+                    # Los núcleos (o `PARALELISMO['MAX_HILOS']`) se reparten entre los procesos del pool
+                    self._pool = ProcessPoolExecutor(max_workers=n_procesos, mp_context=contexto_procesos(),
+                                                     initializer=configurar_hilos_proceso,
+                                                     initargs=(max(1, EJECUTOR_CANALES.hilos // n_procesos),))
+                except (OSError, NotImplementedError) as e:
+                    logger.warning("Pool de procesos no disponible, se calcula en hilos: %s", e)
+                    self.usar_procesos = False
+            return self._pool
+
+    def _descartar_pool(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Instancia global reutilizable (inyectable si se desea)
+GESTOR_TRABAJOS = GestorTrabajos()
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import glob
+import hashlib
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Tuple
+
+from dynamic_stiffness_analyzer.config.settings import CONFIG
+from dynamic_stiffness_analyzer.io.columnar import FORMATOS_COLUMNARES
+from dynamic_stiffness_analyzer.io.dataset_memmap import EXTENSION_CABECERA, EXTENSION_DATOS, es_dataset_memmap, escribir_dataset_memmap
+from dynamic_stiffness_analyzer.io.loader import leer_dataframe
+from dynamic_stiffness_analyzer.services.cache import huella_contenido
+from dynamic_stiffness_analyzer.services.cache_disco import directorio_cache_por_defecto
+from dynamic_stiffness_analyzer.services.datasets import REGISTRO, Referencia
+from dynamic_stiffness_analyzer.services.jobs import GESTOR_TRABAJOS, Trabajo, TrabajoCancelado
+from dynamic_stiffness_analyzer.services.profiling import PERFILADOR
+
+
+logger = logging.getLogger(__name__)
+
+
+EXTENSIONES_LOCALES = (".csv", ".xlsx", ".txt", EXTENSION_CABECERA) + tuple(FORMATOS_COLUMNARES)
+
+
+@dataclass
+class ArchivoLocal:
+    nombre: str
+    ruta: str
+    tamano: int
+    modificado: int  # st_mtime_ns
+    preparado: Optional[str] = None  # Cabecera del dataset memmap ya preparado (o el propio archivo si lo es)
+
+
+def _huella_corta(*partes: Any) -> str:
+    return hashlib.blake2b("|".join(str(p) for p in partes).encode("utf-8"), digest_size=4).hexdigest()
+
+
+def preparar_archivo(ruta: str, destino: str, dtype: str) -> str:
+    """
+    Lee `ruta` con el loader y la guarda como dataset memmap en `destino`; devuelve la cabecera.
+
+    Función de módulo (serializable) para poder ejecutarse en otro proceso.
+    """
+    df, error = leer_dataframe(ruta, os.path.basename(ruta))
+    if df is None:
+        raise ValueError(error)
+    estado = os.stat(ruta)
+    origen = {"ruta": ruta, "tamano": estado.st_size, "modificado": estado.st_mtime_ns}
+    return escribir_dataset_memmap(df, destino, dtype, origen=origen)
+
+
+@dataclass
+class CarpetaLocal:
+    """
+    Ingesta directa desde una carpeta del servidor (sin `dcc.Upload`, base64 ni JSON).
+
+    Los archivos soportados de `directorio` se pueden preparar en segundo plano al formato memmap
+    (`io.dataset_memmap`) en `directorio_preparados`; cargar un archivo preparado solo abre el
+    memmap, de modo que el tiempo de carga lo marca el disco. Un archivo modificado (tamaño o fecha)
+    se vuelve a preparar y las versiones anteriores que no estén registradas se eliminan.
+    """
+
+    directorio: Optional[str] = CONFIG.CARGA_ARCHIVOS['DIRECTORIO_LOCAL']
+    directorio_preparados: Optional[str] = CONFIG.CARGA_ARCHIVOS['DIRECTORIO_PREPARADOS']
+    preparar_en_segundo_plano: bool = CONFIG.CARGA_ARCHIVOS['PREPARAR_EN_SEGUNDO_PLANO']
+    dtype: str = CONFIG.REGISTRO_DATASETS['DTYPE_MEMMAP']
+    _lock: Any = field(default_factory=threading.Lock)
+
+    @property
+    def habilitada(self) -> bool:
+        return bool(self.directorio) and os.path.isdir(self.directorio)
+
+    def listar(self) -> List[ArchivoLocal]:
+        """Archivos soportados del nivel superior de `directorio`, por nombre."""
+        if not self.habilitada:
+            return []
+        archivos = []
+        with os.scandir(self.directorio) as entradas:
+            for entrada in entradas:
+                if entrada.name.startswith(".") or not entrada.is_file():
+                    continue
+                if not entrada.name.lower().endswith(EXTENSIONES_LOCALES):
+                    continue
+                estado = entrada.stat()
+                archivo = ArchivoLocal(entrada.name, entrada.path, estado.st_size, estado.st_mtime_ns)
+                archivo.preparado = self._preparado(archivo)
+                archivos.append(archivo)
+        return sorted(archivos, key=lambda a: a.nombre.lower())
+
+    def cargar(self, nombre: str) -> Tuple[str, Optional[Referencia], str]:
+        """Registra el archivo `nombre` (preparándolo antes si hace falta); mismo retorno que `cargar_contenidos_upload`."""
+        try:
+            archivo = self._archivo(nombre)
+            if archivo is None:
+                return f"Archivo no disponible en la carpeta local: {nombre}", None, ""
+            PERFILADOR.iniciar(f"Carga local: {nombre}")
+            with PERFILADOR.tramo('carga_archivo' if archivo.preparado is None else 'apertura_preparado'):
+                cabecera = archivo.preparado or self._preparar(archivo)
+                referencia = REGISTRO.registrar_memmap(cabecera)
+            return f"Archivo cargado: {nombre}", referencia, ""
+        except Exception as e:
+            return f"Error al leer el archivo: {e}", None, ""
+
+    def preparar_pendientes(self) -> Optional[Trabajo]:
+        """Lanza un trabajo en segundo plano que prepara los archivos aún no preparados (uno por paso)."""
+        pendientes = [a for a in self.listar() if a.preparado is None]
+        if not pendientes:
+            return None
+        clave = huella_contenido('preparar_locales', [(a.ruta, a.tamano, a.modificado) for a in pendientes])
+        pasos = [(f"Preparando {a.nombre}", self._paso_preparar(a)) for a in pendientes]
+        return GESTOR_TRABAJOS.enviar(pasos, clave, grupo='carpeta_local')
+
+    # --- Gestión interna ---
+
+    def _archivo(self, nombre: str) -> Optional[ArchivoLocal]:
+        # `nombre` llega del navegador: solo se aceptan archivos listados (sin rutas fuera de la carpeta)
+        for archivo in self.listar():
+            if archivo.nombre == nombre:
+                return archivo
+        return None
+
+    def _destino(self, archivo: ArchivoLocal) -> str:
+        directorio = self.directorio_preparados or os.path.join(directorio_cache_por_defecto(), "datasets_locales")
+        nombre = os.path.splitext(archivo.nombre)[0]
+        return os.path.join(directorio, f"{nombre}-{_huella_corta(os.path.abspath(archivo.ruta))}-"
+                                        f"{_huella_corta(archivo.tamano, archivo.modificado)}")
+
+    def _preparado(self, archivo: ArchivoLocal) -> Optional[str]:
+        if es_dataset_memmap(archivo.ruta):
+            return archivo.ruta
+        cabecera = self._destino(archivo) + EXTENSION_CABECERA
+        return cabecera if os.path.exists(cabecera) else None
+
+    def _preparar(self, archivo: ArchivoLocal, ejecutar=None) -> str:
+        destino = self._destino(archivo)
+        if ejecutar is None:
+            cabecera = preparar_archivo(archivo.ruta, destino, self.dtype)
+        else:
+            cabecera = ejecutar(preparar_archivo, archivo.ruta, destino, self.dtype)
+        self._eliminar_versiones_anteriores(destino)
+        return cabecera
+
+    def _paso_preparar(self, archivo: ArchivoLocal):
+        def paso(ejecutar):
+            try:
+                return self._preparar(archivo, ejecutar)
+            except TrabajoCancelado:
+                raise
+            except Exception as e:
+                # Un archivo ilegible no impide preparar los demás; al cargarlo se mostrará el error
+                logger.warning("No se pudo preparar %s: %s", archivo.nombre, e)
+                return None
+        return paso
+
+    def _eliminar_versiones_anteriores(self, destino: str) -> None:
+        prefijo = destino.rsplit("-", 1)[0]
+        # Las versiones registradas siguen en uso (el registro reabre el memmap en cada lectura)
+        en_uso = {e.ruta_memmap[:-len(EXTENSION_CABECERA)] for e in list(REGISTRO.entradas.values()) if e.ruta_memmap}
+        with self._lock:
+            for ruta in glob.glob(glob.escape(prefijo) + "-*"):
+                if not ruta.endswith((EXTENSION_CABECERA, EXTENSION_DATOS)):
+                    continue
+                base = ruta[:-len(EXTENSION_CABECERA if ruta.endswith(EXTENSION_CABECERA) else EXTENSION_DATOS)]
+                if base == destino or base in en_uso:
+                    continue
+                try:
+                    os.remove(ruta)
+                except OSError:
+                    pass
+
+
+# Instancia global reutilizable (inyectable si se desea)
+CARPETA_LOCAL = CarpetaLocal()
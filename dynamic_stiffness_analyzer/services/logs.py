@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+"""
+Configuración del registro de mensajes del paquete (logger `dynamic_stiffness_analyzer`).
+
+Los módulos solo piden `logging.getLogger(__name__)`; los puntos de entrada (aplicación y lotes)
+llaman a `configurar_logging()`. Los mensajes usan argumentos `%` (se formatean solo si el nivel está
+activo) y los diagnósticos costosos se protegen con `logger.isEnabledFor(logging.DEBUG)`.
+"""
+
+import logging
+from typing import Optional, Union
+
+from dynamic_stiffness_analyzer.config.settings import CONFIG
+
+
+LOGGER_RAIZ = 'dynamic_stiffness_analyzer'
+
+
+def configurar_logging(nivel: Optional[Union[str, int]] = None) -> logging.Logger:
+    """Nivel (`CONFIG.LOGGING['NIVEL']` por defecto) y un único manejador a stderr para el paquete; idempotente."""
+    logger = logging.getLogger(LOGGER_RAIZ)
+    nivel = nivel if nivel is not None else CONFIG.LOGGING['NIVEL']
+    logger.setLevel(nivel.upper() if isinstance(nivel, str) else nivel)
+    if not any(getattr(h, '_dsa', False) for h in logger.handlers):
+        manejador = logging.StreamHandler()
+        manejador.setFormatter(logging.Formatter(CONFIG.LOGGING['FORMATO']))
+        manejador._dsa = True
+        logger.addHandler(manejador)
+        logger.propagate = False
+    return logger
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+"""
+Reparto por canal (fuerza, accel_x, accel_y, accel_z) de filtros, ventaneo y espectros en un pool de hilos.
+
+Los núcleos que dominan esas etapas (`sosfiltfilt`, `scipy.fft`, operaciones de NumPy) liberan el GIL, de modo
+que los canales se procesan en paralelo dentro del mismo proceso sin copiar los arrays. Las FFT por lotes
+reciben además `workers=EJECUTOR_CANALES.workers_fft`. `medfilt` (`scipy.ndimage.median_filter`) retiene el
+GIL: la mediana no se reparte.
+
+Dentro de una tarea del pool todo vuelve a ser secuencial (sin pools anidados ni sobresuscripción), y los
+procesos hijos (pool de `GestorTrabajos` o de `batch.py`) crean su propio pool al primer uso, con los núcleos
+repartidos entre los procesos (`configurar_hilos_proceso` como inicializador).
+"""
+
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, List, Optional
+
+import numpy as np
+
+from dynamic_stiffness_analyzer.config.settings import CONFIG
+
+
+# Marca los hilos del pool: una tarea que vuelve a repartir trabajo lo ejecuta en serie
+_EN_POOL = threading.local()
+
+
+def _marcar_hilo() -> None:
+    _EN_POOL.activo = True
+
+
+@dataclass
+class EjecutorCanales:
+    """
+    Pool de hilos perezoso para trabajo independiente por canal.
+
+    `max_hilos` None → `os.cpu_count()`; 1 desactiva el reparto. Los elementos con menos de
+    `min_muestras` muestras por canal se procesan en serie (el reparto no compensa).
+    """
+
+    max_hilos: Optional[int] = CONFIG.PARALELISMO['MAX_HILOS']
+    min_muestras: int = CONFIG.PARALELISMO['MIN_MUESTRAS_CANAL']
+    _pool: Optional[ThreadPoolExecutor] = None
+    _tamano: int = 0
+    _lock: Any = field(default_factory=threading.Lock)
+
+    @property
+    def hilos(self) -> int:
+        return max(1, int(self.max_hilos or os.cpu_count() or 1))
+
+    @property
+    def workers_fft(self) -> int:
+        """Argumento `workers=` de `scipy.fft`: 1 dentro de una tarea del pool (ya reparte por canal)."""
+        return 1 if getattr(_EN_POOL, 'activo', False) else self.hilos
+
+    def mapear(self, funcion: Callable[[Any], Any], elementos: Iterable[Any], n_muestras: Optional[int] = None) -> List[Any]:
+        """`[funcion(e) for e in elementos]` repartido entre los hilos; conserva el orden y propaga la primera excepción."""
+        elementos = list(elementos)
+        pool = None
+        if len(elementos) > 1 and (n_muestras is None or n_muestras >= self.min_muestras):
+            pool = self._obtener_pool()
+        if pool is None:
+            return [funcion(e) for e in elementos]
+        # Cada tarea corre en una copia del contexto (p. ej. el recolector de tramos de `medir_en_proceso`)
+        futuros = [pool.submit(contextvars.copy_context().run, funcion, e) for e in elementos]
+        return [futuro.result() for futuro in futuros]
+
+    def por_filas(self, funcion: Callable[..., np.ndarray], y: np.ndarray, *args: Any) -> np.ndarray:
+        """Aplica `funcion(fila, *args)` a cada fila de `y` (canales × muestras) y apila los resultados."""
+        filas = self.mapear(lambda fila: funcion(fila, *args), y, y.shape[-1])
+        return np.vstack(filas) if filas else y
+
+    def cerrar(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False)
+            self._pool, self._tamano = None, 0
+
+    def _reiniciar_tras_fork(self) -> None:
+        # Los hilos del pool heredado no existen en el proceso hijo (y el cerrojo pudo quedar tomado)
+        self._pool, self._tamano, self._lock = None, 0, threading.Lock()
+
+    def _obtener_pool(self) -> Optional[ThreadPoolExecutor]:
+        if self.hilos < 2 or getattr(_EN_POOL, 'activo', False):
+            return None
+        with self._lock:
+            if self._pool is None or self._tamano != self.hilos:
+                if self._pool is not None:
+                    self._pool.shutdown(wait=False)
+                self._pool = ThreadPoolExecutor(max_workers=self.hilos, thread_name_prefix='canal',
+                                                initializer=_marcar_hilo)
+                self._tamano = self.hilos
+            return self._pool
+
+
+# Instancia global reutilizable (inyectable si se desea)
+EJECUTOR_CANALES = EjecutorCanales()
+
+
+def configurar_hilos_proceso(hilos: Optional[int]) -> None:
+    """Inicializador de pools de procesos: hilos por canal del proceso hijo (reparto de núcleos entre procesos)."""
+    EJECUTOR_CANALES.max_hilos = hilos
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=EJECUTOR_CANALES._reiniciar_tras_fork)
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+"""
+Instrumentación ligera de tiempos: tramos (`with PERFILADOR.tramo('welch'):`) agregados por ejecución.
+
+Una ejecución agrupa los tramos de una carga, un filtrado o un análisis completo, incluidos los
+callbacks de figuras que la siguen. La ejecución activa es única para el proceso (herramienta de un
+usuario): los tramos de cualquier hilo se suman a ella. Los cálculos enviados al pool de procesos se
+miden allí con `medir_en_proceso` y sus tramos se fusionan al volver.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from dynamic_stiffness_analyzer.config.settings import CONFIG
+
+
+# (nombre, segundos) de cada tramo cerrado
+Medida = Tuple[str, float]
+
+# Recolector local (sin cerrojos) mientras se ejecuta un cálculo dentro de `medir_en_proceso`
+_RECOLECTOR: ContextVar[Optional[List[Medida]]] = ContextVar('recolector_tramos', default=None)
+
+
+@dataclass
+class Tramo:
+    nombre: str
+    llamadas: int = 0
+    total_s: float = 0.0
+    max_s: float = 0.0
+
+    def sumar(self, duracion: float) -> None:
+        self.llamadas += 1
+        self.total_s += duracion
+        self.max_s = max(self.max_s, duracion)
+
+    def resumen(self) -> Dict[str, Any]:
+        return {
+            'etapa': self.nombre,
+            'llamadas': self.llamadas,
+            'total_ms': round(self.total_s * 1000, 2),
+            'media_ms': round(self.total_s * 1000 / self.llamadas, 2) if self.llamadas else 0.0,
+            'max_ms': round(self.max_s * 1000, 2),
+        }
+
+
+@dataclass
+class EjecucionPerfilada:
+    id: str
+    descripcion: str
+    inicio: float = field(default_factory=time.time)
+    tramos: "OrderedDict[str, Tramo]" = field(default_factory=OrderedDict)
+
+    def tabla(self) -> List[Dict[str, Any]]:
+        """Una fila por etapa, de mayor a menor tiempo total."""
+        return sorted((t.resumen() for t in self.tramos.values()), key=lambda fila: -fila['total_ms'])
+
+    def a_dict(self) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'descripcion': self.descripcion,
+            'inicio': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.inicio)),
+            'etapas': self.tabla(),
+        }
+
+
+@dataclass
+class Perfilador:
+    habilitado: bool = CONFIG.PERFILADO['HABILITADO']
+    max_ejecuciones: int = CONFIG.PERFILADO['MAX_EJECUCIONES']
+    _ejecuciones: "OrderedDict[str, EjecucionPerfilada]" = field(default_factory=OrderedDict)
+    _activa: Optional[EjecucionPerfilada] = None
+    _lock: Any = field(default_factory=threading.Lock)
+
+    def iniciar(self, descripcion: str) -> Optional[str]:
+        """Abre una ejecución nueva, que pasa a ser la activa; devuelve su id."""
+        if not self.habilitado:
+            return None
+        ejecucion = EjecucionPerfilada(uuid.uuid4().hex[:12], descripcion)
+        with self._lock:
+            self._ejecuciones[ejecucion.id] = ejecucion
+            while len(self._ejecuciones) > self.max_ejecuciones:
+                self._ejecuciones.popitem(last=False)
+            self._activa = ejecucion
+        return ejecucion.id
+
+    @contextmanager
+    def tramo(self, nombre: str) -> Iterator[None]:
+        if not self.habilitado:
+            yield
+            return
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(nombre, time.perf_counter() - inicio)
+
+    def medir(self, nombre: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """Decorador equivalente a envolver la función en `tramo(nombre)` (conserva nombre y módulo: sigue siendo serializable)."""
+        def decorador(funcion):
+            @functools.wraps(funcion)
+            def envoltura(*args, **kwargs):
+                with self.tramo(nombre):
+                    return funcion(*args, **kwargs)
+            return envoltura
+        return decorador
+
+    def registrar(self, nombre: str, duracion: float) -> None:
+        recolector = _RECOLECTOR.get()
+        if recolector is not None:
+            recolector.append((nombre, duracion))
+            return
+        with self._lock:
+            if self._activa is None:
+                return
+            tramo = self._activa.tramos.get(nombre)
+            if tramo is None:
+                tramo = self._activa.tramos[nombre] = Tramo(nombre)
+            tramo.sumar(duracion)
+
+    def fusionar(self, medidas: List[Medida]) -> None:
+        for nombre, duracion in medidas:
+            self.registrar(nombre, duracion)
+
+    def activa(self) -> Optional[str]:
+        with self._lock:
+            return self._activa.id if self._activa is not None else None
+
+    def resumenes(self) -> List[Dict[str, Any]]:
+        """Tabla de cada ejecución conservada (`a_dict`), de la más reciente a la más antigua."""
+        with self._lock:
+            return [e.a_dict() for e in reversed(self._ejecuciones.values())]
+
+    def exportar_json(self, ejecucion_id: Optional[str] = None) -> str:
+        """JSON de una ejecución o, sin id, de todas las conservadas."""
+        resumenes = self.resumenes()
+        if ejecucion_id:
+            return json.dumps(next((r for r in resumenes if r['id'] == ejecucion_id), {}), ensure_ascii=False, indent=2)
+        return json.dumps(resumenes, ensure_ascii=False, indent=2)
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._ejecuciones.clear()
+            self._activa = None
+
+    def _reiniciar_en_hijo(self) -> None:
+        # Tras un fork el cerrojo podía estar tomado por otro hilo del padre; el hijo no hereda ejecuciones
+        self._lock = threading.Lock()
+        self._ejecuciones = OrderedDict()
+        self._activa = None
+
+
+def medir_en_proceso(funcion: Callable[..., Any], *args: Any) -> Tuple[Any, List[Medida]]:
+    """
+    Ejecuta `funcion(*args)` recogiendo sus tramos en una lista local y devuelve `(resultado, tramos)`.
+
+    Función de módulo (serializable) para el pool de procesos: en el proceso hijo no hay ejecución activa.
+    """
+    medidas: List[Medida] = []
+    token = _RECOLECTOR.set(medidas)
+    try:
+        return funcion(*args), medidas
+    finally:
+        _RECOLECTOR.reset(token)
+
+
+# Instancia global reutilizable (inyectable si se desea)
+PERFILADOR = Perfilador()
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=PERFILADOR._reiniciar_en_hijo)
@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from dynamic_stiffness_analyzer.analysis.damping import calculo_amortiguamiento
+from dynamic_stiffness_analyzer.analysis.dynamic_stiffness import calcular_rigidez_multieje
+from dynamic_stiffness_analyzer.config.settings import CONFIG
+from dynamic_stiffness_analyzer.services.cache import CACHE, huella_contenido, sal_calculo
+from dynamic_stiffness_analyzer.services.datasets import leer_dataset
+from dynamic_stiffness_analyzer.services.parallel import EJECUTOR_CANALES
+from dynamic_stiffness_analyzer.services.profiling import PERFILADOR
+from dynamic_stiffness_analyzer.signal_processing.windowing import ventana_exponencial, ventana_fuerza_adaptativa
+
+
+logger = logging.getLogger(__name__)
+
+
+EJES_ACELERACION = ('accel_x', 'accel_y', 'accel_z')
+
+# ejecutar(funcion, *args): permite delegar los cálculos pesados (p. ej. a un proceso del gestor de trabajos)
+Ejecutor = Callable[..., Any]
+
+
+@dataclass
+class EtapaDatos:
+    """Dataset a analizar (corte > filtrado > original) ya validado."""
+
+    clave: str
+    df: pd.DataFrame
+    df_original: pd.DataFrame
+    origen: str  # 'corte' | 'filtrado' | 'original'
+
+    @property
+    def filtro_aplicado(self) -> bool:
+        return self.origen == 'filtrado'
+
+
+@dataclass
+class EtapaTiempo:
+    """Datos con vector de tiempo regularizado y parámetros de muestreo."""
+
+    clave: str
+    df: pd.DataFrame
+    dt: float
+    fs: float
+    regenerado: bool
+
+
+def _leer_valido(datos: Any) -> Optional[pd.DataFrame]:
+    try:
+        df = leer_dataset(datos)
+    except Exception:
+        return None
+    if df is None or df.empty or 'tiempo' not in df.columns:
+        return None
+    return df
+
+
+def filas_finitas(df: pd.DataFrame) -> np.ndarray:
+    """
+    Máscara de filas con `tiempo`, `accel_*` y `fuerza` finitos (columna a columna: sin copiar la matriz
+    completa, que puede estar respaldada por un memmap).
+    """
+    columnas_criticas = ['tiempo'] + [col for col in df.columns if col.startswith(('accel_', 'fuerza'))]
+    finitas = np.ones(len(df), dtype=bool)
+    for col in columnas_criticas:
+        finitas &= np.isfinite(df[col].to_numpy(dtype=float))
+    return finitas
+
+
+def descartar_filas_no_finitas(df: pd.DataFrame) -> pd.DataFrame:
+    """Elimina las filas con NaN o infinitos en columnas críticas (una sola muestra anula todo el Welch)."""
+    finitas = filas_finitas(df)
+    if finitas.all():
+        return df
+    logger.debug("Descartadas %d filas con valores no finitos", len(df) - np.count_nonzero(finitas))
+    return df[finitas]
+
+
+def _cargar(df_json: Any, df_corte_json: Any, df_filtrado_json: Any) -> Optional[Dict[str, Any]]:
+    df_original = _leer_valido(df_json)
+    if df_original is None:
+        logger.error("Sin datos cargados o DataFrame inválido")
+        return None
+    if df_corte_json:
+        df, origen = _leer_valido(df_corte_json), 'corte'
+    elif df_filtrado_json:
+        df, origen = _leer_valido(df_filtrado_json), 'filtrado'
+    else:
+        df, origen = df_original, 'original'
+    if df is None or len(df) < 2:
+        return None
+
+    # Debe haber al menos dos filas con tiempo y señales finitas; el resto de filas se descarta
+    df = descartar_filas_no_finitas(df)
+    if len(df) < 2:
+        return None
+    if not [col for col in df.columns if col != 'tiempo']:
+        logger.error("No hay columnas de datos disponibles")
+        return None
+    logger.debug("DataFrame para graficar (%s): columnas=%s, shape=%s", origen, list(df.columns), df.shape)
+    return {'df': df, 'df_original': df_original, 'origen': origen}
+
+
+@PERFILADOR.medir('regularizacion_tiempo')
+def regularizar_tiempo(df: pd.DataFrame) -> Optional[Dict[str, Any]]:
+    """Diagnóstico de regularidad temporal; regenera un tiempo uniforme si la irregularidad supera la tolerancia."""
+    t = df['tiempo'].values
+    dt_values = np.diff(t)
+    dt_values_valid = dt_values[dt_values > 0]
+    if len(dt_values_valid) == 0:
+        logger.error("No hay intervalos de tiempo válidos")
+        return None
+    dt_original = np.median(dt_values_valid)
+    if dt_original <= 0:
+        logger.warning("Intervalo de tiempo inválido calculado")
+        dt_original = (t[-1] - t[0]) / (len(t) - 1)
+        if dt_original <= 0:
+            logger.error("No se puede calcular dt válido - usando valor por defecto")
+            dt_original = 0.001
+
+    dt_std = np.std(dt_values_valid)
+    dt_mean = np.mean(dt_values_valid)
+    irregularidad_relativa = dt_std / dt_mean if dt_mean > 0 else 1.0
+    logger.debug("Diagnóstico temporal: dt_mean=%.6f s, dt_std=%.6f s, irregularidad=%.2f%%, dt válidos=%d/%d",
+                 dt_mean, dt_std, irregularidad_relativa * 100, len(dt_values_valid), len(dt_values))
+
+    umbral_irregularidad = CONFIG.TOLERANCIAS['IRREGULARIDAD_TEMPORAL']
+    regenerado = False
+    if irregularidad_relativa > umbral_irregularidad:
+        logger.warning("Irregularidad temporal detectada (%.2f%% > %.1f%%); regenerando tiempo uniforme",
+                       irregularidad_relativa * 100, umbral_irregularidad * 100)
+        n_puntos = len(t)
+        if t[-1] <= t[0]:
+            t_nuevo = np.linspace(0, n_puntos * dt_original, n_puntos)
+        else:
+            t_nuevo = np.linspace(t[0], t[-1], n_puntos)
+        df = df.copy()
+        df['tiempo'] = t_nuevo
+        dt = (t_nuevo[-1] - t_nuevo[0]) / (n_puntos - 1) if n_puntos > 1 else dt_original
+        regenerado = True
+    else:
+        dt = dt_original
+
+    if dt <= 0 or not np.isfinite(dt):
+        logger.error("dt final inválido - forzando valor por defecto")
+        dt = 0.001
+        regenerado = True
+    fs = 1 / dt
+    logger.debug("Parámetros temporales finales: dt=%.6f, fs=%.2f Hz, regenerado=%s", dt, fs, regenerado)
+    return {'df': df, 'dt': dt, 'fs': fs, 'regenerado': regenerado}
+
+
+def calcular_frf_multieje(datos_frf: np.ndarray, ejes: Sequence[str], masa_kg: float, fs: float,
+                          nperseg: int, noverlap: int) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Ventaneo + FRF/rigidez por lotes a partir de la matriz (muestras × [fuerza, ejes...]).
+
+    Función de módulo (serializable) para poder ejecutarse en otro proceso.
+    """
+    def ventanear(i: int) -> np.ndarray:
+        canal = np.ascontiguousarray(datos_frf[:, i])
+        if i == 0:
+            return ventana_fuerza_adaptativa(canal, fs) * masa_kg * 9.81
+        return ventana_exponencial(canal, fs) * 9.81
+
+    # Ventaneo de fuerza y aceleraciones antes de análisis de FRF (un canal por hilo)
+    with PERFILADOR.tramo('ventaneo'):
+        fuerza_N, *accels = EJECUTOR_CANALES.mapear(ventanear, range(len(ejes) + 1), len(datos_frf))
+        accels = np.vstack(accels)
+    if not np.isfinite(fuerza_N).any():
+        raise ValueError("Señales inválidas después de ventaneo")
+    # Espectros de todos los ejes con una sola segmentación/FFT por canal
+    return calcular_rigidez_multieje(fuerza_N, accels, fs, nperseg, noverlap, list(ejes))
+
+
+def _ejecutar_local(funcion: Callable, *args: Any) -> Any:
+    return funcion(*args)
+
+
+def parametros_welch(n_muestras: int) -> tuple:
+    """(nperseg, noverlap) adaptativos: al menos 6 segmentos, entre 256 y 1024 muestras."""
+    nperseg = max(256, min(1024, n_muestras // 6))
+    return nperseg, nperseg // 2
+
+
+@dataclass
+class AnalysisSession:
+    """
+    Pipeline de análisis por etapas con memoización por etapa.
+
+    Etapas: carga (dataset original/filtrado/cortado) → regularización temporal → ventaneo +
+    espectros + FRF + rigidez (un cálculo por lotes para todos los ejes) → amortiguamiento.
+    Cada etapa se indexa por sus propias entradas más la clave de la etapa anterior, de modo que
+    los cambios solo de vista (escalas, curvas enfatizadas, vista fijada) reutilizan todos los
+    resultados y únicamente se regeneran las figuras. Los cálculos pesados además pasan por
+    `CACHE` (claves por contenido, nivel en disco).
+
+    El filtrado y el corte los realizan sus propios callbacks y producen datasets versionados;
+    aquí se consumen como entradas de la etapa de carga.
+    """
+
+    max_entradas_por_etapa: int = CONFIG.CACHE_COMPUTACIONAL['MAX_ENTRADAS_SESION']
+    _memo: Dict[str, "OrderedDict[str, Any]"] = field(default_factory=dict)
+    _calculando: Dict[tuple, Any] = field(default_factory=dict)
+    _lock: Any = field(default_factory=threading.RLock)
+
+    # --- Etapas ---
+
+    def datos(self, df_json: Any, df_corte_json: Any = None, df_filtrado_json: Any = None) -> Optional[EtapaDatos]:
+        if not df_json:
+            return None
+        clave = huella_contenido('datos', df_json, df_corte_json or None, df_filtrado_json or None)
+        resultado = self._etapa('datos', clave, lambda: _cargar(df_json, df_corte_json, df_filtrado_json))
+        return EtapaDatos(clave, **resultado) if resultado is not None else None
+
+    def tiempo(self, datos: Optional[EtapaDatos]) -> Optional[EtapaTiempo]:
+        if datos is None:
+            return None
+        clave = huella_contenido('tiempo', datos.clave)
+        resultado = self._etapa('tiempo', clave, lambda: regularizar_tiempo(datos.df))
+        return EtapaTiempo(clave, **resultado) if resultado is not None else None
+
+    def frf(self, tiempo: EtapaTiempo, masa_kg: float, ejecutar: Optional[Ejecutor] = None) -> Dict[str, Dict[str, np.ndarray]]:
+        """Espectros, FRF (Hv), coherencia y rigidez de todos los ejes de aceleración presentes."""
+        df, fs = tiempo.df, tiempo.fs
+        ejes = [eje for eje in EJES_ACELERACION if eje in df.columns]
+        nperseg, noverlap = parametros_welch(len(df))
+        clave = huella_contenido('frf', tiempo.clave, masa_kg, ejes)
+        ejecutar = ejecutar or _ejecutar_local
+
+        def calcular():
+            logger.debug("Parámetros Welch: nperseg=%d, noverlap=%d", nperseg, noverlap)
+            datos_frf = df[['fuerza'] + ejes].to_numpy(dtype=float)
+            return CACHE.obtener_o_calcular(
+                huella_contenido('frf_multieje', datos_frf, ejes, masa_kg, fs, nperseg, noverlap, sal_calculo('TOLERANCIAS')),
+                lambda: ejecutar(calcular_frf_multieje, datos_frf, ejes, masa_kg, fs, nperseg, noverlap),
+            )
+
+        return self._etapa('frf', clave, calcular)
+
+    def amortiguamiento(self, tiempo: EtapaTiempo, eje: str, frecuencias_centrales: Sequence[float],
+                        ejecutar: Optional[Ejecutor] = None) -> Dict[str, Any]:
+        frecuencias = [float(f) for f in frecuencias_centrales or []]
+        clave = huella_contenido('amortiguamiento', tiempo.clave, eje, frecuencias)
+        ejecutar = ejecutar or _ejecutar_local
+
+        def calcular():
+            y = tiempo.df[eje].values
+            return CACHE.obtener_o_calcular(
+                huella_contenido('amortiguamiento', y, tiempo.fs, frecuencias, sal_calculo()),
+                lambda: ejecutar(calculo_amortiguamiento, y, tiempo.fs, frecuencias),
+            )
+
+        return self._etapa('amortiguamiento', clave, calcular)
+
+    # --- Gestión ---
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._memo.clear()
+
+    def estadisticas(self) -> Dict[str, int]:
+        with self._lock:
+            return {etapa: len(memo) for etapa, memo in self._memo.items()}
+
+    def _etapa(self, nombre: str, clave: str, calcular: Callable[[], Any]) -> Any:
+        """Devuelve el resultado memoizado de la etapa o lo calcula una sola vez aunque lo pidan varios hilos."""
+        with self._lock:
+            memo = self._memo.setdefault(nombre, OrderedDict())
+            if clave in memo:
+                memo.move_to_end(clave)
+                return memo[clave]
+            cerrojo = self._calculando.setdefault((nombre, clave), threading.Lock())
+        with cerrojo:
+            with self._lock:
+                if clave in memo:
+                    memo.move_to_end(clave)
+                    return memo[clave]
+            try:
+                resultado = calcular()
+                with self._lock:
+                    memo[clave] = resultado
+                    while len(memo) > self.max_entradas_por_etapa:
+                        memo.popitem(last=False)
+            finally:
+                with self._lock:
+                    self._calculando.pop((nombre, clave), None)
+        return resultado
+
+
+# Instancia global reutilizable (inyectable si se desea)
+SESION = AnalysisSession()
@@ -6,8 +6,22 @@ import numpy as np
 import pandas as pd
 
 from dynamic_stiffness_analyzer.config.settings import CONFIG
+from dynamic_stiffness_analyzer.services.profiling import PERFILADOR
 
 
+def _extender(limite: float, objetivo: float, paso: float, tope: float, adelante: bool) -> float:
+    """Desplaza `limite` el mínimo número entero de pasos `paso` hasta alcanzar `objetivo`, sin pasar de `tope`."""
+    if not np.isfinite(paso) or paso <= 0:
+        return objetivo
+    n_pasos = max(0, int(np.ceil(((objetivo - limite) if adelante else (limite - objetivo)) / paso - 1e-9)))
+    nuevo = limite + n_pasos * paso if adelante else limite - n_pasos * paso
+    # Corrección de redondeo: un paso extra si el múltiplo quedó justo por debajo del objetivo
+    if (adelante and nuevo < objetivo) or (not adelante and nuevo > objetivo):
+        nuevo = nuevo + paso if adelante else nuevo - paso
+    return min(nuevo, tope) if adelante else max(nuevo, tope)
+
+
+@PERFILADOR.medir('corte')
 def aplicar_corte_df(
     df: pd.DataFrame,
     inicio: float,
@@ -23,7 +37,10 @@ def aplicar_corte_df(
     - señales_seleccionadas: columnas adicionales a incluir si existen.
 
     Salidas:
-    - (df_corte, mensaje)
+    - (df_corte, mensaje). Con 'tiempo' ordenado, `df_corte` es una vista sin copia de las columnas de `df`.
+
+    Los límites se localizan por búsqueda binaria y la ampliación automática (fin hacia adelante,
+    luego inicio hacia atrás, en pasos de un periodo de muestreo) se calcula de forma cerrada.
     """
     if df is None or df.empty or 'tiempo' not in df.columns:
         raise ValueError("Datos inválidos para corte")
@@ -43,33 +60,52 @@ def aplicar_corte_df(
     min_welch = nperseg_welch + (min_segments_welch - 1) * int(nperseg_welch * 0.5)
     min_puntos = max(min_fft, min_waterfall, min_welch)
 
-    t_min = df['tiempo'].min()
-    t_max = df['tiempo'].max()
-    paso = df['tiempo'].iloc[1] - df['tiempo'].iloc[0] if len(df) > 1 else 0.01
+    tiempo = df['tiempo'].to_numpy()
+    # Los datasets memmap traen el orden en la cabecera: no se recorre todo el tiempo (solo la búsqueda binaria)
+    ordenado = df.attrs.get('tiempo_ordenado')
+    if ordenado is None:
+        ordenado = len(tiempo) < 2 or bool(np.all(tiempo[1:] >= tiempo[:-1]))
+    t = tiempo if ordenado else np.sort(tiempo[~np.isnan(tiempo)])
+    t_min = t[0]
+    t_max = t[-1]
+    paso = t[1] - t[0] if len(t) > 1 else 0.01
     ampliado = False
     inicio_solicitado, fin_solicitado = inicio, fin
-    mask = (df['tiempo'] >= inicio) & (df['tiempo'] <= fin)
+    n_total = len(t)
 
-    # 1. Ampliar solo el fin hacia adelante
+    # 1. Ampliar solo el fin hacia adelante (en pasos de `paso`, como el barrido original)
+    izq = int(np.searchsorted(t, inicio, side='left'))
     fin_temp = fin
-    while mask.sum() < min_puntos and fin_temp < t_max:
+    if np.searchsorted(t, fin_temp, side='right') - izq < min_puntos and fin_temp < t_max:
         ampliado = True
-        fin_temp = min(fin_temp + paso, t_max)
-        mask = (df['tiempo'] >= inicio) & (df['tiempo'] <= fin_temp)
+        if izq + min_puntos <= n_total:
+            fin_temp = _extender(fin_temp, t[izq + min_puntos - 1], paso, t_max, adelante=True)
+        else:
+            fin_temp = t_max
 
     # 2. Si aún no hay suficientes puntos, ampliar el inicio hacia atrás
+    der = int(np.searchsorted(t, fin_temp, side='right'))
     inicio_temp = inicio
-    while mask.sum() < min_puntos and inicio_temp > t_min:
+    if der - izq < min_puntos and inicio_temp > t_min:
         ampliado = True
-        inicio_temp = max(inicio_temp - paso, t_min)
-        mask = (df['tiempo'] >= inicio_temp) & (df['tiempo'] <= fin_temp)
+        if der - min_puntos >= 0:
+            inicio_temp = _extender(inicio_temp, t[der - min_puntos], paso, t_min, adelante=False)
+        else:
+            inicio_temp = t_min
 
     # Usar los valores ampliados
     inicio, fin = inicio_temp, fin_temp
     columnas_clave = ['tiempo', 'fuerza', 'accel_x', 'accel_y', 'accel_z']
     columnas_corte = list(dict.fromkeys(columnas_clave + [col for col in señales_seleccionadas if col in df.columns]))
     columnas_corte = [col for col in columnas_corte if col in df.columns]
-    df_corte = df.loc[(df['tiempo'] >= inicio) & (df['tiempo'] <= fin), columnas_corte].copy()
+    if ordenado:
+        # Vista sin copia sobre las columnas originales
+        izq = int(np.searchsorted(t, inicio, side='left'))
+        der = int(np.searchsorted(t, fin, side='right'))
+        df_corte = pd.DataFrame({col: df[col].to_numpy()[izq:der] for col in columnas_corte},
+                                index=df.index[izq:der], copy=False)
+    else:
+        df_corte = df.loc[(tiempo >= inicio) & (tiempo <= fin), columnas_corte]
     if df_corte[columnas_corte].dropna(how='all').empty:
         raise ValueError('No hay datos en el rango seleccionado')
 
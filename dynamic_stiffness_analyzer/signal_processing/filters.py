@@ -1,12 +1,155 @@
 from __future__ import annotations
 
+import functools
 from typing import Iterable, List, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
-from scipy.signal import butter, medfilt, sosfiltfilt
+from scipy.fft import irfft, next_fast_len, rfft, rfftfreq
 
 from dynamic_stiffness_analyzer.config.settings import CONFIG
+from dynamic_stiffness_analyzer.services.parallel import EJECUTOR_CANALES
+from dynamic_stiffness_analyzer.services.profiling import PERFILADOR
+
+
+ORDEN_BUTTERWORTH = 4
+# La pérdida prevista del multibanda solo evalúa la respuesta a ±N anchos de banda de los bordes
+# (más lejos, |H|⁴ del pasa-banda Butterworth de orden 4 es < 1e-13)
+ANCHOS_EVALUACION_RESPUESTA = 3
+# Modos del filtro multibanda (etiqueta en la interfaz); por defecto CONFIG.FILTROS['MODO_MULTIBANDA']
+MODOS_MULTIBANDA = {'iir': 'IIR', 'fft': 'FFT'}
+
+
+@functools.lru_cache(maxsize=64)
+def disenar_sos(orden: int, corte: float | Tuple[float, float], btype: str, fs: float) -> np.ndarray:
+    """Secciones de segundo orden de un Butterworth; se diseñan una vez por (orden, banda, tipo, fs)."""
+    from scipy.signal import butter
+
+    return butter(orden, list(corte) if isinstance(corte, tuple) else corte, btype=btype, fs=fs, output='sos')
+
+
+def _sosfiltfilt_canales(sos: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """`sosfiltfilt(sos, y, axis=-1)` con los canales (filas) repartidos en `EJECUTOR_CANALES`."""
+    from scipy.signal import sosfiltfilt
+
+    return EJECUTOR_CANALES.por_filas(lambda fila: sosfiltfilt(sos, fila), y)
+
+
+def _ganancia_filtfilt(sos: np.ndarray, frecuencias: np.ndarray, fs: float) -> np.ndarray:
+    """Ganancia en potencia |H(f)|⁴ de `sosfiltfilt(sos, ...)` (el filtro se aplica en ambos sentidos)."""
+    z = np.exp(-2j * np.pi * frecuencias / fs)
+    ganancia = np.ones(len(frecuencias))
+    for b0, b1, b2, a0, a1, a2 in sos:
+        ganancia *= np.abs((b0 + z * (b1 + z * b2)) / (a0 + z * (a1 + z * a2))) ** 2
+    return ganancia ** 2
+
+
+def _filtrar_overlap_save(y: np.ndarray, respuesta: np.ndarray, bloque: int) -> np.ndarray:
+    """
+    Aplica por bloques (overlap-save) una respuesta de fase cero `respuesta` (canales × bloque // 2 + 1).
+
+    El núcleo es la transformada inversa de la respuesta recortada a ±bloque // 4 muestras, así que cada
+    bloque aporta bloque // 2 muestras válidas; los extremos del registro se completan con ceros.
+    """
+    canales, n = y.shape
+    mitad = bloque // 4
+    workers = EJECUTOR_CANALES.workers_fft
+    nucleo = irfft(respuesta, n=bloque, axis=-1, workers=workers)
+    nucleo[:, mitad + 1:bloque - mitad] = 0.0
+    respuesta_nucleo = rfft(nucleo, axis=-1, workers=workers)
+    paso = bloque - 2 * mitad
+    y_ext = np.zeros((canales, n + 2 * mitad + paso))
+    y_ext[:, mitad:mitad + n] = y
+    salida = np.empty_like(y)
+    for inicio in range(0, n, paso):
+        transformada = rfft(y_ext[:, inicio:inicio + bloque], axis=-1, workers=workers)
+        tramo = irfft(transformada * respuesta_nucleo, n=bloque, axis=-1, workers=workers)
+        fin = min(inicio + paso, n)
+        salida[:, inicio:fin] = tramo[:, mitad:mitad + fin - inicio]
+    return salida
+
+
+def _filtro_multibanda_fft(
+    y_original: np.ndarray,
+    fs: float,
+    frecuencias_centrales: Sequence[float],
+    ancho_banda: float = 20.0,
+    perdida_max: float = 0.10,
+    max_iter: int = 5,
+) -> Tuple[np.ndarray, List[str]]:
+    """
+    Banco de filtros en frecuencia con el mismo criterio de anchos que `_filtro_multibanda_adaptativo`.
+
+    La respuesta combinada (producto de la respuesta de fase cero |H|² de cada banda aceptada) se construye
+    sobre la rejilla de frecuencias y se aplica una sola vez: una rfft directa y una inversa del registro
+    o, por encima de `CONFIG.FILTROS['MAX_MUESTRAS_FFT_DIRECTA']` muestras, overlap-save por bloques (la
+    predicción usa entonces el espectro de Welch). El coste no depende del número de bandas. La pérdida
+    de los mensajes es la prevista.
+
+    La rfft directa se rellena con ceros tantas muestras como el soporte del núcleo que usa el overlap-save
+    (±bloque // 4, o el registro entero si es más corto): sin relleno la convolución es circular y el final
+    del registro se filtra al principio.
+    """
+    y = np.array(y_original, dtype=float, ndmin=2)
+    n = y.shape[-1]
+    mensajes: List[List[str]] = [[] for _ in range(y.shape[0])]
+    if not frecuencias_centrales:
+        return y, ["Sin frecuencias centrales para filtro multibanda"] * len(mensajes)
+    directo = n <= CONFIG.FILTROS['MAX_MUESTRAS_FFT_DIRECTA']
+    if directo:
+        relleno = min(n, CONFIG.FILTROS['MUESTRAS_BLOQUE_FFT'] // 4)
+        n_fft = next_fast_len(n + relleno, real=True)
+        transformada = rfft(y, n=n_fft, axis=-1, workers=EJECUTOR_CANALES.workers_fft)
+        espectro = transformada.real ** 2 + transformada.imag ** 2
+        frecuencias = rfftfreq(n_fft, 1 / fs)
+    else:
+        from scipy.signal import welch
+
+        bloque = CONFIG.FILTROS['MUESTRAS_BLOQUE_FFT']
+        frecuencias, espectro = welch(y, fs, nperseg=bloque, nfft=bloque, axis=-1)
+    espectro[:, 0] = 0.0
+    respuesta = np.ones_like(espectro)
+    for fc in frecuencias_centrales:
+        try:
+            if fc <= 0 or fc >= fs / 2:
+                for mensajes_canal in mensajes:
+                    mensajes_canal.append(f"Frecuencia {fc:.1f} Hz fuera del rango válido (0-{fs / 2:.1f} Hz)")
+                continue
+            ancho_actual = ancho_banda
+            pendientes = np.arange(y.shape[0])
+            energia = espectro.sum(axis=-1)
+            for _ in range(max_iter):
+                f_low = max(CONFIG.LIMITES_FISICOS['FREQ_MIN'], fc - ancho_actual / 2)
+                f_high = min(fs / 2 - CONFIG.LIMITES_FISICOS['FREQ_MIN'], fc + ancho_actual / 2)
+                if f_low >= f_high:
+                    break
+                sos = disenar_sos(ORDEN_BUTTERWORTH, (f_low, f_high), 'band', fs)
+                margen = ANCHOS_EVALUACION_RESPUESTA * (f_high - f_low)
+                tramo = slice(*np.searchsorted(frecuencias, [f_low - margen, f_high + margen]))
+                ganancia = _ganancia_filtfilt(sos, frecuencias[tramo], fs)
+                perdida = 1 - espectro[pendientes, tramo] @ ganancia / np.maximum(energia[pendientes], np.finfo(float).tiny)
+                aceptados = pendientes[perdida <= perdida_max]
+                # Fuera del tramo la ganancia es despreciable: espectro y respuesta quedan solo en la banda
+                for matriz, factor in ((espectro, ganancia), (respuesta, np.sqrt(ganancia))):
+                    banda = matriz[aceptados, tramo] * factor
+                    matriz[aceptados] = 0.0
+                    matriz[aceptados, tramo] = banda
+                for canal, perdida_canal in zip(aceptados, perdida[perdida <= perdida_max]):
+                    mensajes[canal].append(f"FC {fc:.1f} Hz: BW={ancho_actual:.1f} Hz, pérdida={perdida_canal:.2%}")
+                pendientes = pendientes[perdida > perdida_max]
+                if len(pendientes) == 0:
+                    break
+                ancho_actual *= 1.2
+            for canal in pendientes:
+                mensajes[canal].append(f"No se pudo optimizar filtro para {fc:.1f} Hz")
+        except Exception as e:
+            for mensajes_canal in mensajes:
+                mensajes_canal.append(f"Error en filtro {fc:.1f} Hz: {str(e)[:30]}")
+    if directo:
+        y = irfft(transformada * respuesta, n=n_fft, axis=-1, workers=EJECUTOR_CANALES.workers_fft)[:, :n]
+    else:
+        y = _filtrar_overlap_save(y, respuesta, CONFIG.FILTROS['MUESTRAS_BLOQUE_FFT'])
+    return y, ["; ".join(m) for m in mensajes]
 
 
 def _filtro_multibanda_adaptativo(
@@ -16,47 +159,116 @@ def _filtro_multibanda_adaptativo(
     ancho_banda: float = 20.0,
     perdida_max: float = 0.10,
     max_iter: int = 5,
-) -> Tuple[np.ndarray, str]:
+) -> Tuple[np.ndarray, List[str]]:
+    """
+    Pasa-banda en cascada (una banda por frecuencia central) sobre `y_original` (canales × muestras).
+
+    Por banda, el ancho crece un 20 % por intento hasta que la pérdida de energía de cada canal no supera
+    `perdida_max`. La pérdida de cada intento se predice con el espectro de potencia de la señal y la
+    respuesta del filtro, sin filtrar; solo el ancho previsto se aplica con `sosfiltfilt` (a la vez para
+    los canales que lo comparten), se confirma con la pérdida real y el espectro se actualiza con su
+    ganancia para la banda siguiente.
+    Devuelve la señal filtrada y los mensajes de cada canal (con la pérdida real).
+    """
+    y_filtrado = np.array(y_original, dtype=float, ndmin=2)
+    mensajes: List[List[str]] = [[] for _ in range(y_filtrado.shape[0])]
     if not frecuencias_centrales:
-        return y_original, "Sin frecuencias centrales para filtro multibanda"
-    y_filtrado = y_original.copy()
-    mensaje_debug: List[str] = []
+        return y_filtrado, ["Sin frecuencias centrales para filtro multibanda"] * len(mensajes)
+    # Sin el bin de continua la suma del espectro es proporcional a np.var
+    espectro = np.abs(rfft(y_filtrado, axis=-1, workers=EJECUTOR_CANALES.workers_fft)) ** 2
+    espectro[:, 0] = 0.0
+    frecuencias = rfftfreq(y_filtrado.shape[-1], 1 / fs)
     for fc in frecuencias_centrales:
         try:
             if fc <= 0 or fc >= fs / 2:
-                mensaje_debug.append(
-                    f"Frecuencia {fc:.1f} Hz fuera del rango válido (0-{fs / 2:.1f} Hz)"
-                )
+                for mensajes_canal in mensajes:
+                    mensajes_canal.append(f"Frecuencia {fc:.1f} Hz fuera del rango válido (0-{fs / 2:.1f} Hz)")
                 continue
             ancho_actual = ancho_banda
-            mejor_resultado = None
+            pendientes = np.arange(y_filtrado.shape[0])
+            energia = espectro.sum(axis=-1)
             for _ in range(max_iter):
                 f_low = max(CONFIG.LIMITES_FISICOS['FREQ_MIN'], fc - ancho_actual / 2)
                 f_high = min(fs / 2 - CONFIG.LIMITES_FISICOS['FREQ_MIN'], fc + ancho_actual / 2)
                 if f_low >= f_high:
                     break
-                sos = butter(4, [f_low, f_high], btype='band', fs=fs, output='sos')
-                y_temp = sosfiltfilt(sos, y_filtrado)
-                energia_original = np.var(y_filtrado)
-                energia_filtrada = np.var(y_temp)
-                perdida = 1 - (energia_filtrada / max(energia_original, 1e-10))
-                if perdida <= perdida_max:
-                    mejor_resultado = y_temp
-                    mensaje_debug.append(
-                        f"FC {fc:.1f} Hz: BW={ancho_actual:.1f} Hz, pérdida={perdida:.2%}"
-                    )
+                sos = disenar_sos(ORDEN_BUTTERWORTH, (f_low, f_high), 'band', fs)
+                margen = ANCHOS_EVALUACION_RESPUESTA * (f_high - f_low)
+                tramo = slice(*np.searchsorted(frecuencias, [f_low - margen, f_high + margen]))
+                ganancia = _ganancia_filtfilt(sos, frecuencias[tramo], fs)
+                retenida = espectro[pendientes, tramo] @ ganancia
+                perdida_prevista = 1 - retenida / np.maximum(energia[pendientes], np.finfo(float).tiny)
+                candidatos = pendientes[perdida_prevista <= perdida_max]
+                if len(candidatos):
+                    y_banda = _sosfiltfilt_canales(sos, y_filtrado[candidatos])
+                    perdida = 1 - np.var(y_banda, axis=-1) / np.maximum(np.var(y_filtrado[candidatos], axis=-1), 1e-10)
+                    # La predicción no ve el efecto de bordes de sosfiltfilt: se confirma con la pérdida real
+                    validos = perdida <= perdida_max
+                    aceptados = candidatos[validos]
+                    y_filtrado[aceptados] = y_banda[validos]
+                    # Fuera del tramo la ganancia es despreciable: el espectro filtrado queda solo en la banda
+                    espectro_banda = espectro[aceptados, tramo] * ganancia
+                    espectro[aceptados] = 0.0
+                    espectro[aceptados, tramo] = espectro_banda
+                    for canal, perdida_canal in zip(aceptados, perdida[validos]):
+                        mensajes[canal].append(f"FC {fc:.1f} Hz: BW={ancho_actual:.1f} Hz, pérdida={perdida_canal:.2%}")
+                    pendientes = np.setdiff1d(pendientes, aceptados)
+                if len(pendientes) == 0:
                     break
-                else:
-                    ancho_actual *= 1.2
-            if mejor_resultado is not None:
-                y_filtrado = mejor_resultado
-            else:
-                mensaje_debug.append(f"No se pudo optimizar filtro para {fc:.1f} Hz")
+                ancho_actual *= 1.2
+            for canal in pendientes:
+                mensajes[canal].append(f"No se pudo optimizar filtro para {fc:.1f} Hz")
         except Exception as e:
-            mensaje_debug.append(f"Error en filtro {fc:.1f} Hz: {str(e)[:30]}")
-    return y_filtrado, "; ".join(mensaje_debug)
+            for mensajes_canal in mensajes:
+                mensajes_canal.append(f"Error en filtro {fc:.1f} Hz: {str(e)[:30]}")
+    return y_filtrado, ["; ".join(m) for m in mensajes]
 
 
+def normalizar_kernel_mediana(valor: float, n_muestras: int) -> Tuple[int, str | None]:
+    """
+    Kernel impar válido para la mediana: se redondea al entero más cercano, un par sube al impar siguiente y
+    se limita al mayor impar ≤ `n_muestras`. Devuelve `(kernel, aviso)`; `aviso` es None si no hubo ajuste.
+    Lanza ValueError si `valor` no es un número ≥ 1.
+    """
+    try:
+        kernel = int(round(float(valor)))
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(f"Kernel de mediana inválido: {valor}")
+    if kernel < 1:
+        raise ValueError(f"Kernel de mediana inválido: {valor}")
+    if kernel % 2 == 0:
+        kernel += 1
+    maximo = max(1, n_muestras if n_muestras % 2 else n_muestras - 1)
+    kernel = min(kernel, maximo)
+    aviso = None if kernel == valor else f"kernel {valor} ajustado a {kernel}"
+    return kernel, aviso
+
+
+def _filtro_mediana(y: np.ndarray, kernel: int) -> np.ndarray:
+    """
+    `medfilt` de cada canal de `y` (canales × muestras), con el kernel ya normalizado. El cálculo es el de
+    siempre (en SciPy ≥ 1.x `medfilt` delega en `ndimage.median_filter`); no se reparte en hilos porque
+    retiene el GIL.
+    """
+    from scipy.signal import medfilt
+
+    if kernel == 1:
+        return y
+    salida = np.empty_like(y)
+    for fila, destino in zip(y, salida):
+        destino[:] = medfilt(fila, kernel)
+    return salida
+
+
+def parsear_frecuencias_centrales(bandpass_multibanda: str | None) -> List[float]:
+    """Frecuencias centrales (Hz) del texto 'f1, f2, ...'; lista vacía si no es válido."""
+    try:
+        return [float(f.strip()) for f in (bandpass_multibanda or '').split(',') if f.strip()]
+    except Exception:
+        return []
+
+
+@PERFILADOR.medir('filtrado')
 def filtrar_senal(
     df: pd.DataFrame,
     seleccion_multi: Sequence[str],
@@ -68,51 +280,66 @@ def filtrar_senal(
     toggle_mediana: str,
     toggle_highpass: str,
     toggle_bandpass: str,
+    modo_multibanda: str | None = None,
 ):
-    mensajes_filtro: List[str] = []
+    """
+    Filtros de mediana, pasa-altos y multibanda sobre las columnas seleccionadas.
+
+    Las columnas se apilan en una matriz (canales × muestras) y cada etapa se aplica a todas de una vez.
+    `modo_multibanda` ('iir' | 'fft', ver `MODOS_MULTIBANDA`; None → `CONFIG.FILTROS['MODO_MULTIBANDA']`).
+    Pasa-altos y multibanda reparten los canales entre los hilos de `EJECUTOR_CANALES`.
+    Devuelve `(df_filtrado, mensajes, True)`.
+    """
     df_filtrado = df.copy()
-    señales_a_filtrar = set(seleccion_multi or [])
+    columnas = [col for col in df_filtrado.columns if col in set(seleccion_multi or [])]
+    if not columnas:
+        return df_filtrado, [], True
+    mensajes = {col: [] for col in columnas}
+    y = np.vstack([df_filtrado[col].to_numpy(dtype=float) for col in columnas])
+    modificado = False
 
-    try:
-        frecuencias_centrales = [
-            float(f.strip()) for f in (bandpass_multibanda or '').split(',') if f.strip()
-        ]
-    except Exception:
-        frecuencias_centrales = []
-
-    for col in señales_a_filtrar:
-        if col not in df_filtrado.columns:
-            continue
-        y_original = df_filtrado[col].values.copy()
-
-        if toggle_mediana == 'yes' and mediana_val and mediana_val > 0:
-            try:
-                y_filtrado = medfilt(y_original, kernel_size=int(mediana_val))
-                df_filtrado[col] = y_filtrado
-                mensajes_filtro.append(f"Mediana aplicada a {col}: kernel={mediana_val}")
-            except Exception as e:
-                mensajes_filtro.append(f"Error mediana {col}: {str(e)[:30]}")
-
-        if toggle_highpass == 'yes' and highpass_val and highpass_val > 0:
-            try:
-                if highpass_val < fs / 2:
-                    sos = butter(4, highpass_val, btype='high', fs=fs, output='sos')
-                    y_filtrado = sosfiltfilt(sos, df_filtrado[col].values)
-                    df_filtrado[col] = y_filtrado
-                    mensajes_filtro.append(f"Pasa-altos aplicado a {col}: fc={highpass_val} Hz")
-            except Exception as e:
-                mensajes_filtro.append(f"Error pasa-altos {col}: {str(e)[:30]}")
-
-        if toggle_bandpass == 'yes' and frecuencias_centrales:
-            try:
-                y_filtrado, msg_debug = _filtro_multibanda_adaptativo(
-                    df_filtrado[col].values, fs, frecuencias_centrales
-                )
-                df_filtrado[col] = y_filtrado
-                mensajes_filtro.append(f"Multibanda {col}: {msg_debug}")
-            except Exception as e:
-                mensajes_filtro.append(f"Error multibanda {col}: {str(e)[:30]}")
-
-    return df_filtrado, mensajes_filtro, True
+    frecuencias_centrales = parsear_frecuencias_centrales(bandpass_multibanda)
+
+    if toggle_mediana == 'yes' and mediana_val and mediana_val > 0:
+        try:
+            kernel, aviso = normalizar_kernel_mediana(mediana_val, y.shape[1])
+            y = _filtro_mediana(y, kernel)
+            modificado = True
+            detalle = f" ({aviso})" if aviso else ""
+            for col in columnas:
+                mensajes[col].append(f"Mediana aplicada a {col}: kernel={kernel}{detalle}")
+        except Exception as e:
+            for col in columnas:
+                mensajes[col].append(f"Error mediana {col}: {str(e)[:30]}")
 
+    if toggle_highpass == 'yes' and highpass_val and highpass_val > 0:
+        try:
+            if highpass_val < fs / 2:
+                sos = disenar_sos(ORDEN_BUTTERWORTH, float(highpass_val), 'high', fs)
+                y = _sosfiltfilt_canales(sos, y)
+                modificado = True
+                for col in columnas:
+                    mensajes[col].append(f"Pasa-altos aplicado a {col}: fc={highpass_val} Hz")
+        except Exception as e:
+            for col in columnas:
+                mensajes[col].append(f"Error pasa-altos {col}: {str(e)[:30]}")
+
+    if toggle_bandpass == 'yes' and frecuencias_centrales:
+        try:
+            modo = modo_multibanda or CONFIG.FILTROS['MODO_MULTIBANDA']
+            if modo not in MODOS_MULTIBANDA:
+                raise ValueError(f"Modo multibanda desconocido: {modo}")
+            filtro_multibanda = _filtro_multibanda_fft if modo == 'fft' else _filtro_multibanda_adaptativo
+            y, mensajes_bandas = filtro_multibanda(y, fs, frecuencias_centrales)
+            modificado = True
+            for col, msg_debug in zip(columnas, mensajes_bandas):
+                mensajes[col].append(f"Multibanda {col}: {msg_debug}")
+        except Exception as e:
+            for col in columnas:
+                mensajes[col].append(f"Error multibanda {col}: {str(e)[:30]}")
 
+    if modificado:
+        for fila, col in zip(y, columnas):
+            df_filtrado[col] = fila
+    # Mensajes agrupados por columna, en el orden de las etapas
+    return df_filtrado, [msg for col in columnas for msg in mensajes[col]], True
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import numpy as np
-from scipy.signal import periodogram
 
 from dynamic_stiffness_analyzer.config.settings import CONFIG
 
@@ -17,6 +16,8 @@ def estimate_adaptive_tau(signal: np.ndarray, fs: float, damping_estimate: float
         tau_exp = decay_time_sec / 3
     else:
         def estimate_dominant_frequency(sig: np.ndarray, fs_local: float) -> float:
+            from scipy.signal import periodogram
+
             f, Pxx = periodogram(sig, fs=fs_local)
             idx = np.argmax(Pxx)
             return f[idx] if len(f) > 0 else 1.0
@@ -1,10 +1,4 @@
 from __future__ import annotations
 
-# Importar módulos para registrar callbacks al importarse
-from . import control  # noqa: F401
-from . import export  # noqa: F401
-from . import filters  # noqa: F401
-from . import cutting  # noqa: F401
-from . import mass  # noqa: F401
-
-
+# Los módulos de callbacks se registran explícitamente desde `graphs.register_callbacks(app)`.
+# No se importan aquí: el módulo legado importa `graphs` mientras `app_legacy` aún se está cargando.
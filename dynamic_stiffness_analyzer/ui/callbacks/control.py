@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dash import Output, Input, no_update, html
+from dash._callback import GLOBAL_CALLBACK_MAP
 import threading
 import time
 import os
@@ -9,20 +10,22 @@ from app_legacy import app
 
 
 def _output_exists(component_id: str, prop: str) -> bool:
+    # Incluye callbacks globales (`@callback`) y de varias salidas ("..a.b...c.d..")
     key = f"{component_id}.{prop}"
     try:
-        return key in getattr(app, "callback_map", {})
+        mapas = (getattr(app, "callback_map", {}), GLOBAL_CALLBACK_MAP)
+        return any(key in clave.strip('.').split('...') for mapa in mapas for clave in mapa)
     except Exception:
         return False
 
 
 if not getattr(app, "_callbacks_control_registered", False):
     if not _output_exists('estado-cierre', 'data'):
-    @app.callback(Output('estado-cierre', 'data'), Input('boton-cerrar-app', 'n_clicks'), prevent_initial_call=True)
-    def activar_cierre(n_clicks):
-        if n_clicks:
-            return True
-        return no_update
+        @app.callback(Output('estado-cierre', 'data'), Input('boton-cerrar-app', 'n_clicks'), prevent_initial_call=True)
+        def activar_cierre(n_clicks):
+            if n_clicks:
+                return True
+            return no_update
 
 
     if not _output_exists('overlay-cierre', 'children'):
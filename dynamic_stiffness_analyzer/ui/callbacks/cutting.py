@@ -1,16 +1,20 @@
 from __future__ import annotations
 
 from dash import Output, Input, State, no_update, ctx
-import pandas as pd
+from dash._callback import GLOBAL_CALLBACK_MAP
 
 from app_legacy import app
+from dynamic_stiffness_analyzer.services.datasets import guardar_dataset, leer_dataset
+from dynamic_stiffness_analyzer.services.profiling import PERFILADOR
 from dynamic_stiffness_analyzer.signal_processing.cutting import aplicar_corte_df
 
 
 def _output_exists(component_id: str, prop: str) -> bool:
+    # Incluye callbacks globales (`@callback`) y de varias salidas ("..a.b...c.d..")
     key = f"{component_id}.{prop}"
     try:
-        return key in getattr(app, "callback_map", {})
+        mapas = (getattr(app, "callback_map", {}), GLOBAL_CALLBACK_MAP)
+        return any(key in clave.strip('.').split('...') for mapa in mapas for clave in mapa)
     except Exception:
         return False
 
@@ -26,18 +30,22 @@ if not getattr(app, "_callbacks_cutting_registered", False):
             State('store-df-filtrado', 'data'),
             State('store-df', 'data'),
             State('selector-multi', 'value'),
+            State('store-df-corte', 'data'),
             prevent_initial_call=True,
         )
-        def aplicar_corte(n_clicks, inicio, fin, df_filtrado_json, df_json, senales_seleccionadas):
+        def aplicar_corte(n_clicks, inicio, fin, df_filtrado_json, df_json, senales_seleccionadas, df_corte_anterior):
             if n_clicks is None or (df_filtrado_json is None and df_json is None):
                 return no_update, ''
+            PERFILADOR.iniciar("Corte")
             try:
-                df = pd.read_json(df_filtrado_json or df_json, orient='split')
+                df = leer_dataset(df_filtrado_json or df_json)
             except Exception:
                 return no_update, 'Datos inválidos.'
+            if df is None:
+                return no_update, 'Datos inválidos.'
             try:
                 df_corte, mensaje = aplicar_corte_df(df, inicio, fin, senales_seleccionadas)
-                return df_corte.to_json(date_format='iso', orient='split'), mensaje
+                return guardar_dataset(df_corte, df_corte_anterior), mensaje
             except Exception as e:
                 return no_update, str(e)
 
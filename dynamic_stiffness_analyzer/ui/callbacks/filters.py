@@ -1,18 +1,27 @@
 from __future__ import annotations
 
+import logging
+
 from dash import Output, Input, State, no_update, html, ctx
-import pandas as pd
+from dash._callback import GLOBAL_CALLBACK_MAP
 import numpy as np
 
 from app_legacy import app
 from dynamic_stiffness_analyzer.config.settings import CONFIG
+from dynamic_stiffness_analyzer.services.datasets import guardar_dataset, leer_dataset
+from dynamic_stiffness_analyzer.services.profiling import PERFILADOR
 from dynamic_stiffness_analyzer.signal_processing.filters import filtrar_senal
 
 
+logger = logging.getLogger(__name__)
+
+
 def _output_exists(component_id: str, prop: str) -> bool:
+    # Incluye callbacks globales (`@callback`) y de varias salidas ("..a.b...c.d..")
     key = f"{component_id}.{prop}"
     try:
-        return key in getattr(app, "callback_map", {})
+        mapas = (getattr(app, "callback_map", {}), GLOBAL_CALLBACK_MAP)
+        return any(key in clave.strip('.').split('...') for mapa in mapas for clave in mapa)
     except Exception:
         return False
 
@@ -24,6 +33,7 @@ if not getattr(app, "_callbacks_filters_registered", False):
             Output('input-mediana', 'disabled'),
             Output('input-highpass', 'disabled'),
             Output('input-bandpass-multibanda', 'disabled'),
+            Output('selector-modo-multibanda', 'disabled'),
             Input('toggle-mediana', 'value'),
             Input('toggle-highpass', 'value'),
             Input('toggle-bandpass', 'value'),
@@ -33,6 +43,7 @@ if not getattr(app, "_callbacks_filters_registered", False):
                 toggle_mediana != 'yes',
                 toggle_highpass != 'yes',
                 toggle_bandpass != 'yes',
+                toggle_bandpass != 'yes',
             )
 
     # Limites min/max del input de duración de segmento
@@ -47,13 +58,7 @@ if not getattr(app, "_callbacks_filters_registered", False):
         def actualizar_limites_duracion_segmento(df_json, df_corte_json, df_filtrado_json):
             min_val = CONFIG.TOLERANCIAS['MIN_DURACION_SEGMENTO']
             max_val = 9999
-            df_base = None
-            if df_corte_json:
-                df_base = pd.read_json(df_corte_json, orient='split')
-            elif df_filtrado_json:
-                df_base = pd.read_json(df_filtrado_json, orient='split')
-            elif df_json:
-                df_base = pd.read_json(df_json, orient='split')
+            df_base = leer_dataset(df_corte_json or df_filtrado_json or df_json)
             if df_base is not None and 'tiempo' in df_base.columns:
                 t = df_base['tiempo'].values
                 if len(t) > 1:
@@ -112,33 +117,38 @@ if not getattr(app, "_callbacks_filters_registered", False):
             State('toggle-mediana', 'value'),
             State('toggle-highpass', 'value'),
             State('toggle-bandpass', 'value'),
+            State('selector-modo-multibanda', 'value'),
+            State('store-df-filtrado', 'data'),
             prevent_initial_call=True,
         )
         def aplicar_filtros(n_clicks, df_json, df_corte_json, seleccion_multi, seleccion_eje, mediana_val, highpass_val,
-                            bandpass_multibanda, toggle_mediana, toggle_highpass, toggle_bandpass):
+                            bandpass_multibanda, toggle_mediana, toggle_highpass, toggle_bandpass, modo_multibanda,
+                            df_filtrado_anterior):
             if n_clicks is None or n_clicks == 0:
                 return no_update, no_update
             if df_json is None:
                 return None, html.Div("No hay datos para filtrar", style={'color': 'red'})
+            PERFILADOR.iniciar("Filtrado")
             try:
-                df = pd.read_json(df_json, orient='split')
-                if df.empty or 'tiempo' not in df.columns:
+                df = leer_dataset(df_json)
+                if df is None or df.empty or 'tiempo' not in df.columns:
                     return None, html.Div("Datos inválidos", style={'color': 'red'})
                 t = df['tiempo'].values
                 dt = np.median(np.diff(t))
                 fs = 1 / dt
                 df_filtrado, mensajes_filtro, _ = filtrar_senal(
                     df, seleccion_multi, seleccion_eje, fs, mediana_val, highpass_val,
-                    bandpass_multibanda, toggle_mediana, toggle_highpass, toggle_bandpass
+                    bandpass_multibanda, toggle_mediana, toggle_highpass, toggle_bandpass, modo_multibanda
                 )
                 mensaje = html.Div([
                     html.Span("✅ Filtros aplicados correctamente", style={'color': 'green', 'fontWeight': 'bold'}),
                     html.Br(),
                     html.Span(f"Señales procesadas: {len(seleccion_multi or [])}", style={'color': 'white'})
                 ])
-                return df_filtrado.to_json(orient='split'), mensaje
+                # El filtrado anterior se reemplaza (no se acumula una versión por clic)
+                return guardar_dataset(df_filtrado, df_filtrado_anterior), mensaje
             except Exception as e:
-                print(f"[ERROR] Error aplicando filtros: {e}")
+                logger.error("Error aplicando filtros: %s", e)
                 return None, html.Div(f"Error: {str(e)[:50]}", style={'color': 'red'})
 
     # Estilo visual del botón de filtros
@@ -1,39 +1,352 @@
 from __future__ import annotations
 
 """
-Registro de callbacks principales de gráficos.
-Mientras migramos, seguimos cargando el módulo legado para el callback
-"actualizar_graficos" y otros que aún no se han extraído.
+Callbacks de gráficos: uno por figura, cada uno con sus entradas reales.
+
+Los resultados intermedios (dataset, tiempo regularizado, FRF, amortiguamiento) se comparten a
+través de `SESION`, de modo que la latencia de cada interacción depende solo de lo que cambió.
+Los gráficos pesados (waterfall, rigidez, coherencia, amortiguamiento) se actualizan al terminar el
+trabajo en segundo plano (`procesamiento-resultados`, ver `processing.py`) y ante cambios de vista.
+`registrar_callbacks_graficos(app)` los registra sobre la instancia de Dash del módulo legado.
 """
 
-import importlib.util
-from pathlib import Path
+import logging
+
+import numpy as np
+from dash import Input, Output, State, ctx, dash_table, html, no_update
+
+from dynamic_stiffness_analyzer.config.settings import CONFIG
+from dynamic_stiffness_analyzer.services.session import SESION
+from dynamic_stiffness_analyzer.services.validation import validar_masa_martillo
+from dynamic_stiffness_analyzer.signal_processing.filters import parsear_frecuencias_centrales
+from dynamic_stiffness_analyzer.ui.callbacks.profiling import medir_callback
+from dynamic_stiffness_analyzer.ui.legacy import cargar_modulo_legado
+from dynamic_stiffness_analyzer.visualization.coherence_plot import generar_grafico_coherencia
+from dynamic_stiffness_analyzer.visualization.fft_plot import generar_grafico_fft_optimizado
+from dynamic_stiffness_analyzer.visualization.shared import ESTILO_CELDAS_TABLA, generar_figura_vacia
+from dynamic_stiffness_analyzer.visualization.stiffness_plot import generar_grafico_rigidez
+from dynamic_stiffness_analyzer.visualization.time_plot import generar_grafico_tiempo_optimizado
+from dynamic_stiffness_analyzer.visualization.waterfall_plot import generar_waterfall_adaptativo
+
+
+logger = logging.getLogger(__name__)
+
+
+ESTILO_BOTON_VISTA = {'color': 'white', 'fontWeight': 'bold', 'borderRadius': '4px', 'border': 'none', 'padding': '8px 15px'}
+ENTRADAS_DATASET = (
+    Input('store-df', 'data'),
+    Input('store-df-corte', 'data'),
+    Input('store-df-filtrado', 'data'),
+)
+ESTADOS_DATASET = tuple(State(e.component_id, e.component_property) for e in ENTRADAS_DATASET)
+MENSAJE_CANCELADO = "Análisis cancelado"
+
+
+def _datos_temporales(df_json, df_corte_json, df_filtrado_json):
+    """(EtapaDatos, EtapaTiempo) memoizadas o (None, None) si no hay datos válidos."""
+    datos = SESION.datos(df_json, df_corte_json, df_filtrado_json)
+    temporal = SESION.tiempo(datos)
+    if datos is None or temporal is None:
+        return None, None
+    return datos, temporal
+
+
+def _cancelado(resultados) -> bool:
+    """True si el último trabajo publicado se canceló: los gráficos pesados se vacían sin recalcular."""
+    return (resultados or {}).get('estado') == 'cancelado'
+
+
+def _columnas_disponibles(df):
+    return [col for col in df.columns if col != 'tiempo']
+
+
+def _ajustar_seleccion_multi(df, seleccion_multi):
+    """Columnas a graficar existentes en `df` (por defecto accel_x o la primera disponible)."""
+    seleccion = [col for col in (seleccion_multi or []) if col in df.columns]
+    if not seleccion:
+        seleccion = ['accel_x'] if 'accel_x' in df.columns else _columnas_disponibles(df)[:1]
+        logger.debug("Seleccion_multi ajustada a: %s", seleccion)
+    return seleccion
+
+
+def _ajustar_seleccion_eje(df, seleccion_eje):
+    if seleccion_eje and seleccion_eje in df.columns:
+        return seleccion_eje
+    seleccion_eje = 'accel_x' if 'accel_x' in df.columns else _columnas_disponibles(df)[0]
+    logger.debug("Seleccion_eje ajustada a: %s", seleccion_eje)
+    return seleccion_eje
+
+
+def _frf_eje(temporal, seleccion_eje, masa_martillo):
+    """Espectros, FRF y rigidez del eje seleccionado; ValueError si no se puede calcular."""
+    df = temporal.df
+    if seleccion_eje not in ('accel_x', 'accel_y', 'accel_z') or seleccion_eje not in df.columns or 'fuerza' not in df.columns:
+        raise ValueError(f"Eje {seleccion_eje} no válido o columnas faltantes para FRF")
+
+    # Verificar que hay suficientes datos para FRF
+    if len(df) < 1024:
+        raise ValueError(f"Insuficientes datos para análisis FRF: {len(df)} puntos")
+    if not np.isfinite(df['fuerza'].values).any() or not np.isfinite(df[seleccion_eje].values).any():
+        raise ValueError("Señales contienen solo valores no finitos")
+
+    masa_kg, _ = validar_masa_martillo(masa_martillo)
+    frf_eje = SESION.frf(temporal, masa_kg)[seleccion_eje]
+    if len(frf_eje['fK']) == 0 or not all(np.isfinite(frf_eje[k]).any() for k in ('S_ff', 'S_xx', 'S_xf')):
+        raise ValueError("Espectros inválidos")
+    return frf_eje
+
+
+def _fmt(val, dec=4):
+    if val is None or (isinstance(val, float) and (np.isnan(val) or np.isinf(val))):
+        return '---'
+    return f"{val:.{dec}f}"
+
 
+def _tablas_amortiguamiento(resultado_amort):
+    """Tablas de resumen global (ζ global, C/m) y modal (frecuencia, ζ modal) con los avisos del cálculo."""
+    modos = resultado_amort.get('modos', [])
+    zeta_global = resultado_amort.get('zeta_global', None)
+    mensajes = resultado_amort.get('mensajes', [])
 
-def _resolve_legacy_path() -> Path:
-    candidates = [
-        Path(__file__).parents[2] / "Programa_finaal(RD_V10.4).py",
-        Path(__file__).parents[1] / "Programa_finaal(RD_V10.4).py",
-        Path.cwd() / "Programa_finaal(RD_V10.4).py",
-    ]
-    for c in candidates:
-        if c.exists():
-            return c
-    return candidates[0]
+    data_modos = [{"Frecuencia (Hz)": _fmt(modo.get('frecuencia')), "ζ modal": _fmt(modo.get('zeta'))} for modo in modos]
+    if not data_modos:
+        data_modos = [{"Frecuencia (Hz)": '---', "ζ modal": '---'}]
+    tabla_modos = dash_table.DataTable(columns=[{"name": "Frecuencia (Hz)", "id": "Frecuencia (Hz)"},
+                                                {"name": "ζ modal", "id": "ζ modal"}],
+                                       data=data_modos, **ESTILO_CELDAS_TABLA)
 
+    # C/m = 2*zeta*2*pi*f (N·s/m), usando la frecuencia del primer modo detectado
+    columna_cm = "Amortiguamiento físico (por unidad de masa, C/m) [N·s/m]"
+    if zeta_global is not None and len(modos) > 0 and modos[0].get('frecuencia') is not None:
+        c_m_str = f"{2 * zeta_global * 2 * np.pi * modos[0]['frecuencia']:.6f}"
+    else:
+        c_m_str = '---'
+    tabla_global = dash_table.DataTable(columns=[{"name": "ζ global", "id": "ζ global"},
+                                                 {"name": columna_cm, "id": columna_cm}],
+                                        data=[{"ζ global": _fmt(zeta_global), columna_cm: c_m_str}],
+                                        **ESTILO_CELDAS_TABLA)
 
-def _load_legacy_module():
-    legacy_path = _resolve_legacy_path()
-    spec = importlib.util.spec_from_file_location("legacy_app", str(legacy_path))
-    module = importlib.util.module_from_spec(spec)
-    assert spec is not None and spec.loader is not None
-    spec.loader.exec_module(module)  # type: ignore[attr-defined]
-    return module
+    return html.Div([
+        html.H4("Resumen global", style={"color": "white", "marginBottom": "5px", "marginTop": "0"}),
+        tabla_global,
+        html.H4("Resumen Modal", style={"color": "white", "marginBottom": "5px", "marginTop": "20px"}),
+        tabla_modos,
+        html.Div([
+            html.Div(msg, style={"color": "orange", "fontWeight": "bold", "marginTop": "10px"}) for msg in mensajes
+        ]) if mensajes else None
+    ])
+
+
+# --- Callbacks (se registran en `registrar_callbacks_graficos`) ---
+
+def actualizar_grafico_tiempo(seleccion_multi, df_json, df_corte_json, df_filtrado_json):
+    try:
+        datos, temporal = _datos_temporales(df_json, df_corte_json, df_filtrado_json)
+        if datos is None:
+            return generar_figura_vacia()
+        df = temporal.df
+        return generar_grafico_tiempo_optimizado(df, _ajustar_seleccion_multi(df, seleccion_multi), datos.df_original,
+                                                 datos.filtro_aplicado, df_corte_json)
+    except Exception as e:
+        logger.error("Error generando gráfico de tiempo: %s", e)
+        return generar_figura_vacia("Error en gráfico de tiempo")
+
+
+def actualizar_grafico_fft(seleccion_multi, escala_x, escala_y, df_json, df_corte_json, df_filtrado_json):
+    try:
+        _, temporal = _datos_temporales(df_json, df_corte_json, df_filtrado_json)
+        if temporal is None:
+            return generar_figura_vacia()
+        df = temporal.df
+        return generar_grafico_fft_optimizado(df, _ajustar_seleccion_multi(df, seleccion_multi), escala_x, escala_y)
+    except Exception as e:
+        logger.error("Error generando gráfico FFT: %s", e)
+        return generar_figura_vacia("Error en gráfico FFT")
+
+
+def actualizar_waterfall(resultados, escala_x, escala_y, curvas_enfasis, estado_fijar_vista, seleccion_eje,
+                         df_json, df_corte_json, df_filtrado_json, duracion_segmento):
+    """Waterfall 3D y opciones del selector de curvas; guarda el espectrograma para la exportación."""
+    try:
+        if _cancelado(resultados):
+            actualizar_waterfall.datos_waterfall = {}
+            return generar_figura_vacia(MENSAJE_CANCELADO), []
+        _, temporal = _datos_temporales(df_json, df_corte_json, df_filtrado_json)
+        if temporal is None:
+            actualizar_waterfall.datos_waterfall = {}
+            return generar_figura_vacia(), []
+        seleccion_eje = _ajustar_seleccion_eje(temporal.df, seleccion_eje)
+        df_waterfall_json = df_corte_json or df_filtrado_json or df_json
+        fig_waterfall, datos_waterfall = generar_waterfall_adaptativo(df_waterfall_json, seleccion_eje, escala_x, escala_y,
+                                                                      curvas_enfasis or [], estado_fijar_vista, duracion_segmento)
+
+        # Opciones de curvas para el selector (una por fila del espectrograma)
+        opciones_curvas = []
+        if datos_waterfall:
+            opciones_curvas = [{'label': f'Curva {seg + 1} - {tiempo:.2f}s', 'value': str(seg)}
+                               for seg, tiempo in zip(datos_waterfall['segmentos'], datos_waterfall['tiempos'])]
+        actualizar_waterfall.datos_waterfall = datos_waterfall
+        return fig_waterfall, opciones_curvas
+    except Exception as e:
+        logger.error("Error generando waterfall: %s", e)
+        return generar_figura_vacia("Error en gráfico Waterfall"), []
+
+
+def controlar_vista_waterfall(n_clicks_reset, n_clicks_fijar, estado_fijar_vista):
+    """Restablece las curvas enfatizadas y alterna la vista fijada del waterfall."""
+    trigger_id = ctx.triggered_id if hasattr(ctx, 'triggered_id') else None
+    curvas_enfasis = [] if trigger_id == 'boton-reset' else no_update
+    if trigger_id == 'boton-fijar-vista':
+        estado_fijar_vista = not estado_fijar_vista
+    color = "#f01717" if estado_fijar_vista else "#7C8085"
+    return curvas_enfasis, bool(estado_fijar_vista), {'backgroundColor': color, **ESTILO_BOTON_VISTA}
+
+
+def actualizar_grafico_rigidez(resultados, escala_x, escala_y, seleccion_eje, df_json, df_corte_json, df_filtrado_json,
+                               masa_martillo):
+    try:
+        if _cancelado(resultados):
+            return generar_figura_vacia(MENSAJE_CANCELADO)
+        _, temporal = _datos_temporales(df_json, df_corte_json, df_filtrado_json)
+        if temporal is None:
+            return generar_figura_vacia()
+        seleccion_eje = _ajustar_seleccion_eje(temporal.df, seleccion_eje)
+        frf_eje = _frf_eje(temporal, seleccion_eje, masa_martillo)
+        fK, S_ff, K_disp = frf_eje['fK'], frf_eje['S_ff'], frf_eje['K']
+        magK = np.abs(K_disp)
+        phaseK = np.angle(K_disp, deg=True)
+        if not (np.isfinite(fK).any() and np.isfinite(magK).any() and np.isfinite(phaseK).any()):
+            raise ValueError("Arrays contienen solo valores no finitos")
+        umbral_Sff = max(CONFIG.UMBRALES_DATOS['MIN_AMPLITUD_RUIDO'], CONFIG.UMBRALES_DATOS['FACTOR_UMBRAL_SFF'] * np.max(S_ff[np.isfinite(S_ff)]))
+        mask = (fK >= CONFIG.LIMITES_FISICOS['FREQ_MIN']) & (S_ff > umbral_Sff) & np.isfinite(fK) & np.isfinite(S_ff)
+        if not np.any(mask) or not np.isfinite(magK[mask]).any():
+            raise ValueError("No hay datos válidos después de filtrar")
+        return generar_grafico_rigidez(fK[mask], magK[mask], phaseK[mask], seleccion_eje, escala_x, escala_y)
+    except Exception as e:
+        logger.error("Error generando gráfico de rigidez dinámica: %s", e)
+        return generar_figura_vacia("Error en gráfico de rigidez dinámica")
+
+
+def actualizar_grafico_coherencia(resultados, seleccion_eje, df_json, df_corte_json, df_filtrado_json, masa_martillo):
+    vacio = np.array([])
+    try:
+        if _cancelado(resultados):
+            return generar_figura_vacia(MENSAJE_CANCELADO)
+        _, temporal = _datos_temporales(df_json, df_corte_json, df_filtrado_json)
+        if temporal is None:
+            return generar_figura_vacia()
+        try:
+            frf_eje = _frf_eje(temporal, _ajustar_seleccion_eje(temporal.df, seleccion_eje), masa_martillo)
+        except ValueError as e:
+            logger.info("Coherencia sin FRF: %s", e)
+            return generar_grafico_coherencia(vacio, vacio, vacio, vacio)
+        return generar_grafico_coherencia(frf_eje['fK'], frf_eje['S_ff'], frf_eje['S_xx'], frf_eje['S_xf'])
+    except Exception as e:
+        logger.error("Error generando gráfico de coherencia: %s", e)
+        return generar_figura_vacia("Error en gráfico de coherencia")
+
+
+def actualizar_tablas_amortiguamiento(resultados, seleccion_eje, df_json, df_corte_json, df_filtrado_json,
+                                      masa_martillo, bandpass_multibanda):
+    sin_datos = html.Div("Sin datos suficientes para análisis de rigidez dinámica",
+                         style={"color": "orange", "textAlign": "center", "padding": "20px"})
+    if _cancelado(resultados):
+        return html.Div(MENSAJE_CANCELADO, style={"color": "orange", "textAlign": "center", "padding": "20px"})
+    try:
+        _, temporal = _datos_temporales(df_json, df_corte_json, df_filtrado_json)
+        if temporal is None:
+            return html.Div()
+        seleccion_eje = _ajustar_seleccion_eje(temporal.df, seleccion_eje)
+
+        # El amortiguamiento solo se muestra si la FRF del eje es calculable
+        _frf_eje(temporal, seleccion_eje, masa_martillo)
+    except Exception as e:
+        logger.error("Error en cálculo de FRF: %s", e)
+        return sin_datos
+
+    try:
+        try:
+            resultado_amort = SESION.amortiguamiento(temporal, seleccion_eje, parsear_frecuencias_centrales(bandpass_multibanda))
+        except Exception as e:
+            logger.warning("Error en cálculo de amortiguamiento: %s", e)
+            resultado_amort = {'modos': [], 'zeta_global': None, 'mensajes': [f"Error en cálculo: {str(e)[:50]}"]}
+        return _tablas_amortiguamiento(resultado_amort)
+    except Exception as e:
+        logger.error("Error en tablas de amortiguamiento: %s", e)
+        return html.Div([
+            html.H4("Error en cálculo de amortiguamiento", style={"color": "red", "marginBottom": "5px"}),
+            html.Div(f"Error: {str(e)[:100]}", style={"color": "white", "textAlign": "center"})])
+
+
+def registrar_callbacks_graficos(app):
+    """Registra los callbacks de gráficos sobre `app` (una sola vez por instancia)."""
+    if getattr(app, "_callbacks_graphs_registered", False):
+        return app
+    app.callback(
+        Output('grafico-tiempo', 'figure'),
+        Input('selector-multi', 'value'),
+        *ENTRADAS_DATASET,
+    )(medir_callback('figura_tiempo')(actualizar_grafico_tiempo))
+    app.callback(
+        Output('grafico-fft', 'figure'),
+        Input('selector-multi', 'value'),
+        Input('escala-x', 'value'),
+        Input('escala-y', 'value'),
+        *ENTRADAS_DATASET,
+    )(medir_callback('figura_fft')(actualizar_grafico_fft))
+    app.callback(
+        Output('grafico-waterfall', 'figure'),
+        Output('selector-curvas', 'options'),
+        Input('procesamiento-resultados', 'data'),
+        Input('escala-x', 'value'),
+        Input('escala-y', 'value'),
+        Input('selector-curvas', 'value'),
+        Input('estado-fijar-vista', 'data'),
+        State('selector-eje', 'value'),
+        *ESTADOS_DATASET,
+        State('input-duracion-segmento', 'value'),
+    )(medir_callback('figura_waterfall')(actualizar_waterfall))
+    app.callback(
+        Output('selector-curvas', 'value'),
+        Output('estado-fijar-vista', 'data'),
+        Output('boton-fijar-vista', 'style'),
+        Input('boton-reset', 'n_clicks'),
+        Input('boton-fijar-vista', 'n_clicks'),
+        State('estado-fijar-vista', 'data'),
+        prevent_initial_call=True,
+    )(controlar_vista_waterfall)
+    app.callback(
+        Output('grafico-desplazamiento', 'figure'),
+        Input('procesamiento-resultados', 'data'),
+        Input('escala-x', 'value'),
+        Input('escala-y', 'value'),
+        State('selector-eje', 'value'),
+        *ESTADOS_DATASET,
+        State('input-masa-martillo', 'value'),
+    )(medir_callback('figura_rigidez')(actualizar_grafico_rigidez))
+    app.callback(
+        Output('grafico-coherencia', 'figure'),
+        Input('procesamiento-resultados', 'data'),
+        State('selector-eje', 'value'),
+        *ESTADOS_DATASET,
+        State('input-masa-martillo', 'value'),
+    )(medir_callback('figura_coherencia')(actualizar_grafico_coherencia))
+    app.callback(
+        Output('amortiguamiento-tables', 'children'),
+        Input('procesamiento-resultados', 'data'),
+        State('selector-eje', 'value'),
+        *ESTADOS_DATASET,
+        State('input-masa-martillo', 'value'),
+        State('input-bandpass-multibanda', 'value'),
+    )(medir_callback('tablas_amortiguamiento')(actualizar_tablas_amortiguamiento))
+    setattr(app, "_callbacks_graphs_registered", True)
+    return app
 
 
 def register_callbacks(app):
-    # Cargar callbacks del módulo legado (actualizar_graficos y otros aún no migrados)
-    _load_legacy_module()
+    # Callbacks del módulo legado aún no migrados (ya cargado si `app` viene de `app_legacy`)
+    cargar_modulo_legado()
+    registrar_callbacks_graficos(app)
     # Importar módulos que registran callbacks extraídos (control, export, filtros, corte, masa)
     # La importación se hace aquí para asegurar que exista una única instancia de app y evitar duplicados.
     from . import control  # noqa: F401
@@ -42,5 +355,3 @@ def register_callbacks(app):
     from . import cutting  # noqa: F401
     from . import mass  # noqa: F401
     return app
-
-
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+"""
+Carga desde la carpeta local del servidor (`CONFIG.CARGA_ARCHIVOS['DIRECTORIO_LOCAL']`): listado de
+archivos y carga directa al registro de datasets, sin pasar por `dcc.Upload`.
+"""
+
+import logging
+
+from dash import Input, Output, State, no_update
+
+from dynamic_stiffness_analyzer.services.local_folder import CARPETA_LOCAL
+
+
+logger = logging.getLogger(__name__)
+
+
+ESTILO_CONTENEDOR = {'display': 'flex', 'flexDirection': 'row', 'alignItems': 'center', 'marginBottom': '20px'}
+
+
+def _formatear_tamano(n_bytes: int) -> str:
+    for unidad in ('B', 'KB', 'MB'):
+        if n_bytes < 1024:
+            return f"{n_bytes:.0f} {unidad}"
+        n_bytes /= 1024
+    return f"{n_bytes:.1f} GB"
+
+
+def listar_archivos_locales(n_clicks):
+    """Opciones del selector; al listar se lanza la preparación en segundo plano de los archivos nuevos."""
+    if not CARPETA_LOCAL.habilitada:
+        return [], {'display': 'none'}
+    try:
+        archivos = CARPETA_LOCAL.listar()
+        if CARPETA_LOCAL.preparar_en_segundo_plano:
+            CARPETA_LOCAL.preparar_pendientes()
+    except OSError as e:
+        logger.error("No se pudo listar la carpeta local: %s", e)
+        return [], ESTILO_CONTENEDOR
+    opciones = [
+        {'label': f"{a.nombre} ({_formatear_tamano(a.tamano)}){' ✓' if a.preparado else ''}", 'value': a.nombre}
+        for a in archivos
+    ]
+    return opciones, ESTILO_CONTENEDOR
+
+
+def cargar_archivo_local(n_clicks, nombre):
+    if not n_clicks or not nombre:
+        return no_update, no_update, no_update
+    msg, referencia, msg_loading = CARPETA_LOCAL.cargar(nombre)
+    return msg, (referencia or ''), msg_loading
+
+
+def registrar_callbacks_archivos_locales(app):
+    """Registra el listado y la carga de archivos locales sobre `app` (una sola vez por instancia)."""
+    if getattr(app, "_callbacks_local_files_registered", False):
+        return app
+    app.callback(
+        Output('selector-archivo-local', 'options'),
+        Output('contenedor-archivos-locales', 'style'),
+        Input('boton-refrescar-locales', 'n_clicks'),
+    )(listar_archivos_locales)
+    app.callback(
+        Output('nombre-archivo', 'children', allow_duplicate=True),
+        Output('store-df', 'data', allow_duplicate=True),
+        Output('mensaje-cargando', 'children', allow_duplicate=True),
+        Input('boton-cargar-local', 'n_clicks'),
+        State('selector-archivo-local', 'value'),
+        prevent_initial_call=True,
+    )(cargar_archivo_local)
+    setattr(app, "_callbacks_local_files_registered", True)
+    return app
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dash import Output, Input, State, no_update, ctx
+from dash._callback import GLOBAL_CALLBACK_MAP
 
 from app_legacy import app
 from dynamic_stiffness_analyzer.services.validation import (
@@ -13,9 +14,11 @@ def validar_masa_martillo(masa):
 
 
 def _output_exists(component_id: str, prop: str) -> bool:
+    # Incluye callbacks globales (`@callback`) y de varias salidas ("..a.b...c.d..")
     key = f"{component_id}.{prop}"
     try:
-        return key in getattr(app, "callback_map", {})
+        mapas = (getattr(app, "callback_map", {}), GLOBAL_CALLBACK_MAP)
+        return any(key in clave.strip('.').split('...') for mapa in mapas for clave in mapa)
     except Exception:
         return False
 
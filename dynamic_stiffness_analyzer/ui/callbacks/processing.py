@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+"""
+Análisis en segundo plano: un trabajo por combinación de entradas (datasets, eje, masa, bandas,
+duración de segmento) que precalcula FRF, amortiguamiento y espectrograma fuera del worker de Dash.
+
+El progreso se publica en `procesamiento-estado` (sondeado con `procesamiento-interval`) y, al
+terminar, `procesamiento-resultados` dispara los callbacks de gráficos pesados, que encuentran los
+resultados ya memoizados en `SESION`/`CACHE`.
+"""
+
+import logging
+
+from dash import Input, Output, State, no_update
+
+from dynamic_stiffness_analyzer.config.settings import CONFIG
+from dynamic_stiffness_analyzer.services.cache import huella_contenido
+from dynamic_stiffness_analyzer.services.datasets import leer_dataset
+from dynamic_stiffness_analyzer.services.jobs import GESTOR_TRABAJOS, TrabajoCancelado
+from dynamic_stiffness_analyzer.services.profiling import PERFILADOR
+from dynamic_stiffness_analyzer.services.session import EJES_ACELERACION, SESION
+from dynamic_stiffness_analyzer.services.validation import validar_masa_martillo
+from dynamic_stiffness_analyzer.signal_processing.filters import parsear_frecuencias_centrales
+from dynamic_stiffness_analyzer.visualization.waterfall_plot import espectrograma_waterfall
+
+
+logger = logging.getLogger(__name__)
+
+
+ESTILO_BOTON_CANCELAR = {'backgroundColor': '#dc3545', 'color': 'white'}
+ESTADO_INACTIVO = {'activo': False, 'paso': 0, 'max_pasos': 0}
+
+
+def _tolerante(paso):
+    """Un paso que falla no detiene el trabajo: los callbacks de gráficos mostrarán su error."""
+    def ejecutar_paso(ejecutar):
+        try:
+            return paso(ejecutar)
+        except TrabajoCancelado:
+            raise
+        except Exception as e:
+            logger.warning("Paso de análisis omitido: %s", e)
+            return None
+    return ejecutar_paso
+
+
+def pasos_analisis(df_json, df_corte_json, df_filtrado_json, seleccion_eje, masa_martillo, frecuencias_centrales,
+                   duracion_segmento):
+    """Pasos del análisis completo; comparten el contexto de la etapa de datos."""
+    contexto = {}
+
+    def preparar(ejecutar):
+        # Una ejecución de perfilado por análisis: incluye los callbacks de figuras que lo siguen
+        PERFILADOR.iniciar(f"Análisis ({seleccion_eje}, masa={masa_martillo} kg)")
+        datos = SESION.datos(df_json, df_corte_json, df_filtrado_json)
+        contexto['temporal'] = SESION.tiempo(datos)
+        if contexto['temporal'] is None:
+            raise ValueError("Sin datos válidos para analizar")
+        df = contexto['temporal'].df
+        contexto['eje'] = seleccion_eje if seleccion_eje in df.columns else (
+            'accel_x' if 'accel_x' in df.columns else [c for c in df.columns if c != 'tiempo'][0])
+
+    def frf(ejecutar):
+        temporal = contexto['temporal']
+        df = temporal.df
+        if 'fuerza' not in df.columns or len(df) < 1024 or not any(eje in df.columns for eje in EJES_ACELERACION):
+            return None
+        SESION.frf(temporal, validar_masa_martillo(masa_martillo)[0], ejecutar)
+
+    def amortiguamiento(ejecutar):
+        if contexto['eje'] in EJES_ACELERACION:
+            SESION.amortiguamiento(contexto['temporal'], contexto['eje'], frecuencias_centrales, ejecutar)
+
+    def espectrograma(ejecutar):
+        df_waterfall = leer_dataset(df_corte_json or df_filtrado_json or df_json)
+        espectrograma_waterfall(df_waterfall, contexto['eje'], duracion_segmento, ejecutar)
+
+    return [
+        ('Preparando datos', preparar),
+        ('Calculando FRF y rigidez dinámica', _tolerante(frf)),
+        ('Calculando amortiguamiento', _tolerante(amortiguamiento)),
+        ('Calculando espectrograma 3D', _tolerante(espectrograma)),
+    ]
+
+
+def iniciar_procesamiento(df_json, df_corte_json, df_filtrado_json, seleccion_eje, n_clicks_masa, n_clicks_duracion,
+                          masa_martillo, bandpass_multibanda, duracion_segmento):
+    """Lanza (o reutiliza) el trabajo de las entradas actuales; el anterior queda cancelado por obsoleto."""
+    if not df_json:
+        return ESTADO_INACTIVO, True, no_update
+    frecuencias = parsear_frecuencias_centrales(bandpass_multibanda)
+    clave = huella_contenido('analisis', df_json, df_corte_json or None, df_filtrado_json or None, seleccion_eje,
+                             validar_masa_martillo(masa_martillo)[0], frecuencias, duracion_segmento)
+    trabajo = GESTOR_TRABAJOS.enviar(
+        pasos_analisis(df_json, df_corte_json, df_filtrado_json, seleccion_eje, masa_martillo, frecuencias, duracion_segmento),
+        clave,
+    )
+    return trabajo.resumen(), False, CONFIG.PROCESAMIENTO['INTERVALO_MS']
+
+
+def sondear_procesamiento(n_intervals, estado):
+    """
+    Progreso del trabajo en curso; al terminar publica `procesamiento-resultados` y detiene el sondeo.
+
+    Un trabajo cancelado también se publica (estado 'cancelado') para que los gráficos pesados se vacíen
+    en lugar de seguir mostrando el análisis anterior.
+    """
+    trabajo = GESTOR_TRABAJOS.obtener((estado or {}).get('trabajo'))
+    if trabajo is None:
+        return ESTADO_INACTIVO, no_update, True, '', {**ESTILO_BOTON_CANCELAR, 'display': 'none'}
+    resumen = trabajo.resumen()
+    if trabajo.activo:
+        texto = f"⏳ {trabajo.mensaje} ({trabajo.paso + 1}/{len(trabajo.pasos)})"
+        return resumen, no_update, False, texto, {**ESTILO_BOTON_CANCELAR, 'display': 'inline-block'}
+    oculto = {**ESTILO_BOTON_CANCELAR, 'display': 'none'}
+    resultados = {'trabajo': trabajo.id, 'estado': trabajo.estado, 'duracion': resumen['duracion']}
+    if trabajo.estado == 'cancelado':
+        return resumen, resultados, True, trabajo.mensaje, oculto
+    texto = '' if trabajo.estado == 'completado' else f"⚠ Error en el análisis: {trabajo.error}"
+    return resumen, resultados, True, texto, oculto
+
+
+def cancelar_procesamiento(n_clicks, estado):
+    if n_clicks and GESTOR_TRABAJOS.cancelar((estado or {}).get('trabajo')):
+        return 'Cancelando procesamiento...'
+    return no_update
+
+
+def registrar_callbacks_procesamiento(app):
+    """Registra el inicio, sondeo y cancelación de trabajos sobre `app` (una sola vez por instancia)."""
+    if getattr(app, "_callbacks_processing_registered", False):
+        return app
+    app.callback(
+        Output('procesamiento-estado', 'data'),
+        Output('procesamiento-interval', 'disabled'),
+        Output('procesamiento-interval', 'interval'),
+        Input('store-df', 'data'),
+        Input('store-df-corte', 'data'),
+        Input('store-df-filtrado', 'data'),
+        Input('selector-eje', 'value'),
+        Input('boton-aplicar-masa', 'n_clicks'),
+        Input('boton-aplicar-duracion-segmento', 'n_clicks'),
+        State('input-masa-martillo', 'value'),
+        State('input-bandpass-multibanda', 'value'),
+        State('input-duracion-segmento', 'value'),
+    )(iniciar_procesamiento)
+    app.callback(
+        Output('procesamiento-estado', 'data', allow_duplicate=True),
+        Output('procesamiento-resultados', 'data'),
+        Output('procesamiento-interval', 'disabled', allow_duplicate=True),
+        Output('progreso-procesamiento', 'children'),
+        Output('cancelar-procesamiento', 'style'),
+        Input('procesamiento-interval', 'n_intervals'),
+        State('procesamiento-estado', 'data'),
+        prevent_initial_call=True,
+    )(sondear_procesamiento)
+    app.callback(
+        Output('progreso-procesamiento', 'children', allow_duplicate=True),
+        Input('cancelar-procesamiento', 'n_clicks'),
+        State('procesamiento-estado', 'data'),
+        prevent_initial_call=True,
+    )(cancelar_procesamiento)
+    setattr(app, "_callbacks_processing_registered", True)
+    return app
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+"""
+Tabla de tiempos por etapa de cada ejecución (`PERFILADOR`) y descarga en JSON.
+
+`medir_callback(nombre)` mide un callback de figura; el tiempo que transcurre desde que devuelve
+hasta que Flask termina la respuesta (serialización JSON de las figuras) se suma como
+`serializacion_respuesta`.
+"""
+
+import functools
+import time
+
+import flask
+from dash import Input, Output, dash_table, dcc, html, no_update
+
+from dynamic_stiffness_analyzer.services.profiling import PERFILADOR
+from dynamic_stiffness_analyzer.visualization.shared import ESTILO_CELDAS_TABLA
+
+
+COLUMNAS_TABLA = [
+    {"name": "Etapa", "id": "etapa"},
+    {"name": "Llamadas", "id": "llamadas"},
+    {"name": "Total (ms)", "id": "total_ms"},
+    {"name": "Media (ms)", "id": "media_ms"},
+    {"name": "Máx. (ms)", "id": "max_ms"},
+]
+
+
+def medir_callback(nombre: str):
+    """Decorador para callbacks de Dash: tramo `nombre` y marca para medir la serialización de la respuesta."""
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with PERFILADOR.tramo(nombre):
+                resultado = funcion(*args, **kwargs)
+            if flask.has_request_context():
+                flask.g.fin_callback_perfilado = time.perf_counter()
+            return resultado
+        return envoltura
+    return decorador
+
+
+def _medir_serializacion(respuesta):
+    fin_callback = flask.g.pop('fin_callback_perfilado', None)
+    if fin_callback is not None:
+        PERFILADOR.registrar('serializacion_respuesta', time.perf_counter() - fin_callback)
+    return respuesta
+
+
+def listar_ejecuciones_perfiladas(resultados, n_clicks):
+    """Opciones del selector (más reciente primero); selecciona la ejecución activa."""
+    opciones = [{'label': f"{r['inicio'][11:]} · {r['descripcion']}", 'value': r['id']} for r in PERFILADOR.resumenes()]
+    return opciones, PERFILADOR.activa()
+
+
+def mostrar_tabla_perfilado(ejecucion_id, n_clicks):
+    resumen = next((r for r in PERFILADOR.resumenes() if r['id'] == ejecucion_id), None)
+    if resumen is None:
+        return html.Div("Sin mediciones", style={"color": "orange"})
+    if not resumen['etapas']:
+        return html.Div("La ejecución aún no tiene tramos medidos", style={"color": "orange"})
+    return dash_table.DataTable(columns=COLUMNAS_TABLA, data=resumen['etapas'], **ESTILO_CELDAS_TABLA)
+
+
+def descargar_perfilado(n_clicks):
+    if not n_clicks:
+        return no_update
+    return dcc.send_string(PERFILADOR.exportar_json(), f"perfilado_{time.strftime('%Y%m%d_%H%M%S')}.json")
+
+
+def registrar_callbacks_perfilado(app):
+    """Registra la tabla y la descarga de tiempos sobre `app` (una sola vez por instancia)."""
+    if getattr(app, "_callbacks_profiling_registered", False):
+        return app
+    app.server.after_request(_medir_serializacion)
+    app.callback(
+        Output('selector-ejecucion-perfilado', 'options'),
+        Output('selector-ejecucion-perfilado', 'value'),
+        Input('procesamiento-resultados', 'data'),
+        Input('boton-actualizar-perfilado', 'n_clicks'),
+    )(listar_ejecuciones_perfiladas)
+    app.callback(
+        Output('tabla-perfilado', 'children'),
+        Input('selector-ejecucion-perfilado', 'value'),
+        Input('boton-actualizar-perfilado', 'n_clicks'),
+    )(mostrar_tabla_perfilado)
+    app.callback(
+        Output('descarga-perfilado', 'data'),
+        Input('boton-descargar-perfilado', 'n_clicks'),
+        prevent_initial_call=True,
+    )(descargar_perfilado)
+    setattr(app, "_callbacks_profiling_registered", True)
+    return app
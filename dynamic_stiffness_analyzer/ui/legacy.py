@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+"""
+Carga única del módulo legado `Programa_finaal(RD_V10.4).py`.
+
+El módulo se registra en `sys.modules['legacy_app']`: `app_legacy`, `ui.layout` y los callbacks
+comparten la misma instancia (un solo layout, una sola `app` de Dash y cada callback registrado una vez).
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+from types import ModuleType
+
+
+NOMBRE_MODULO = "legacy_app"
+ARCHIVO_LEGADO = "Programa_finaal(RD_V10.4).py"
+
+
+def ruta_modulo_legado() -> Path:
+    candidates = [
+        Path(__file__).parents[2] / ARCHIVO_LEGADO,  # raíz del repo
+        Path(__file__).parents[1] / ARCHIVO_LEGADO,  # paquete (por si acaso)
+        Path.cwd() / ARCHIVO_LEGADO,                 # cwd
+    ]
+    for c in candidates:
+        if c.exists():
+            return c
+    return candidates[0]
+
+
+def cargar_modulo_legado() -> ModuleType:
+    """Ejecuta el módulo legado la primera vez; después devuelve el ya cargado."""
+    module = sys.modules.get(NOMBRE_MODULO)
+    if module is not None:
+        return module
+    spec = importlib.util.spec_from_file_location(NOMBRE_MODULO, str(ruta_modulo_legado()))
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    # Registrado antes de ejecutar (como `import`): una importación circular ve el módulo en curso
+    sys.modules[NOMBRE_MODULO] = module
+    try:
+        spec.loader.exec_module(module)  # type: ignore[attr-defined]
+    except BaseException:
+        sys.modules.pop(NOMBRE_MODULO, None)
+        raise
+    return module
@@ -4,12 +4,29 @@ import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 from scipy.fft import rfft, rfftfreq
-from scipy.signal import get_window
 
 from dynamic_stiffness_analyzer.config.settings import CONFIG
+from dynamic_stiffness_analyzer.services.cache import CACHE, huella_contenido, sal_calculo
 from dynamic_stiffness_analyzer.signal_processing.windowing import ventana_exponencial, ventana_fuerza_adaptativa
 
 
+def _espectro_amplitud(col: str, y: np.ndarray, fs: float, dt: float):
+    """Devuelve (frecuencias, |FFT|) de la señal ventaneada según su tipo de canal."""
+    from scipy.signal import get_window
+
+    try:
+        if col.startswith('accel_'):
+            y_proc = ventana_exponencial(y, fs)
+        elif col.startswith('fuerza'):
+            y_proc = ventana_fuerza_adaptativa(y, fs)
+        else:
+            y_proc = y
+    except Exception:
+        y_proc = y
+    N = len(y_proc)
+    return rfftfreq(N, dt), np.abs(rfft(y_proc * get_window('hann', N)))
+
+
 def generar_grafico_fft_optimizado(df: pd.DataFrame, seleccion_multi, escala_x: str, escala_y: str) -> go.Figure:
     fig_fft = go.Figure()
     if df is None or df.empty:
@@ -33,22 +50,11 @@ def generar_grafico_fft_optimizado(df: pd.DataFrame, seleccion_multi, escala_x:
         y = df[col].values
         if len(y) == 0 or not np.isfinite(y).any():
             continue
-        try:
-            if col.startswith('accel_'):
-                y_proc = ventana_exponencial(y, fs)
-            elif col.startswith('fuerza'):
-                y_proc = ventana_fuerza_adaptativa(y, fs)
-            else:
-                y_proc = y
-        except Exception:
-            y_proc = y
-        N = len(y_proc)
-        if N < 4:
+        if len(y) < 4:
             continue
         try:
-            yf = rfft(y_proc * get_window('hann', N))
-            xf = rfftfreq(N, dt)
-            amp = np.abs(yf)
+            xf, amp = CACHE.obtener_o_calcular(huella_contenido('fft', col, y, dt, sal_calculo()),
+                                               lambda: _espectro_amplitud(col, y, fs, dt))
             if escala_y == 'db':
                 amp = 20 * np.log10(np.maximum(amp, 1e-12))
                 amp = np.where(np.isfinite(amp), amp, -240)
@@ -4,6 +4,14 @@ import plotly.graph_objects as go
 from dash import html
 
 
+# Estilo común de las tablas (`dash_table.DataTable`) sobre el fondo oscuro de la aplicación
+ESTILO_CELDAS_TABLA = dict(
+    style_header={"backgroundColor": "#222", "color": "white", "fontWeight": "bold", "fontSize": 16},
+    style_cell={"backgroundColor": "#333", "color": "white", "textAlign": "center", "fontSize": 15},
+    style_table={"width": "100%", "marginBottom": "20px"},
+)
+
+
 def generar_figura_vacia(titulo: str = "Sin datos") -> go.Figure:
     fig = go.Figure()
     fig.update_layout(title="Sin datos disponibles", paper_bgcolor='#111111', plot_bgcolor='#111111', font=dict(color='white'))
@@ -7,32 +7,42 @@ import plotly.graph_objects as go
 from dynamic_stiffness_analyzer.config.settings import CONFIG
 
 
-def optimizar_dataframe_para_visualizacion(df: pd.DataFrame, max_puntos: int = 50000):
-    if df is None or len(df) <= max_puntos:
+def optimizar_dataframe_para_visualizacion(df: pd.DataFrame, max_puntos: int = 50000, columnas=None):
+    """
+    Decima `df` para graficar (30% de los puntos en el primer 10% del registro). Con `columnas` solo
+    se extraen esas (más 'tiempo'): sobre un dataset memmap solo se leen las páginas de esos puntos.
+    """
+    if df is None:
         return df, False
+    if columnas is not None:
+        columnas = [col for col in dict.fromkeys(['tiempo'] + list(columnas)) if col in df.columns]
+    if len(df) <= max_puntos:
+        return (df if columnas is None else df[columnas]), False
     n_total = len(df)
     primer_10_pct = n_total // 10
     puntos_inicio = int(max_puntos * 0.3)
     step_inicio = max(1, primer_10_pct // max(puntos_inicio, 1))
     puntos_resto = max_puntos - puntos_inicio
     step_resto = max(1, (n_total - primer_10_pct) // max(puntos_resto, 1))
-    indices = list(range(0, primer_10_pct, step_inicio))
-    indices += list(range(primer_10_pct, n_total, step_resto))
-    indices = sorted(set(indices))
+    indices = np.concatenate([np.arange(0, primer_10_pct, step_inicio), np.arange(primer_10_pct, n_total, step_resto)])
     if indices[-1] != n_total - 1:
-        indices.append(n_total - 1)
-    return df.iloc[indices].copy().reset_index(drop=True), True
+        indices = np.append(indices, n_total - 1)
+    if columnas is None:
+        return df.iloc[indices].reset_index(drop=True), True
+    return pd.DataFrame({col: df[col].to_numpy()[indices] for col in columnas}), True
 
 
 def generar_grafico_tiempo_optimizado(df: pd.DataFrame, seleccion_multi, df_original=None, filtro_aplicado=False, df_corte_json=None):
-    df_viz, optimizado = optimizar_dataframe_para_visualizacion(df, max_puntos=CONFIG.VISUALIZACION['MAX_PUNTOS_TIEMPO'])
+    df_viz, optimizado = optimizar_dataframe_para_visualizacion(df, max_puntos=CONFIG.VISUALIZACION['MAX_PUNTOS_TIEMPO'],
+                                                                columnas=seleccion_multi)
     fig_tiempo = go.Figure()
     t = df_viz['tiempo'].values
     colores = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf']
     for i, col in enumerate(seleccion_multi):
         color = colores[i % len(colores)]
         if filtro_aplicado and df_original is not None and col in df_original.columns and not df_corte_json:
-            df_orig_viz, _ = optimizar_dataframe_para_visualizacion(df_original, max_puntos=CONFIG.VISUALIZACION['MAX_PUNTOS_TIEMPO'])
+            df_orig_viz, _ = optimizar_dataframe_para_visualizacion(df_original, max_puntos=CONFIG.VISUALIZACION['MAX_PUNTOS_TIEMPO'],
+                                                                    columnas=[col])
             fig_tiempo.add_trace(go.Scatter(x=df_orig_viz['tiempo'].values, y=df_orig_viz[col].values, mode='lines',
                                             name=col + '(original)', line=dict(dash='dot', color='gray')))
         if col in df_viz.columns:
@@ -1,24 +1,87 @@
 from __future__ import annotations
 
 import numpy as np
-import pandas as pd
 import plotly.graph_objects as go
-from scipy.fft import rfft, rfftfreq
-from scipy.signal import get_window
 
+from dynamic_stiffness_analyzer.analysis.spectrogram import calcular_espectrograma
 from dynamic_stiffness_analyzer.config.settings import CONFIG
+from dynamic_stiffness_analyzer.services.cache import CACHE, huella_contenido, sal_calculo
+from dynamic_stiffness_analyzer.services.datasets import leer_dataset
 
 
-def generar_waterfall_adaptativo(df_json: str, seleccion_eje: str, escala_x: str, escala_y: str, curvas_enfasis, estado_fijar_vista: bool, duracion_segmento: float | None):
-    if df_json is None or df_json == '':
-        return go.Figure(), []
-    df_actual = pd.read_json(df_json, orient='split')
-    if df_actual.empty or seleccion_eje not in df_actual.columns:
-        return go.Figure(), []
+COLORSCALE_GEOLOGICO = [[0.0, '#000080'], [0.1, '#0000FF'], [0.2, '#0080FF'], [0.3, '#00FFFF'], [0.4, '#00FF80'], [0.5, '#00FF00'], [0.6, '#80FF00'], [0.7, '#FFFF00'], [0.8, '#FF8000'], [0.9, '#FF4000'], [1.0, '#FF0000']]
+
+
+def _reducir_frecuencias(freqs: np.ndarray, Z: np.ndarray, max_columnas: int):
+    """Reduce las columnas de frecuencia tomando el máximo por bloque (los picos se conservan)."""
+    bloque = int(np.ceil(Z.shape[1] / max(max_columnas, 1)))
+    if bloque <= 1:
+        return freqs, Z
+    n_bloques = int(np.ceil(Z.shape[1] / bloque))
+    relleno = n_bloques * bloque - Z.shape[1]
+    Z_pad = np.pad(Z, ((0, 0), (0, relleno)), constant_values=-np.inf)
+    Z_red = np.max(Z_pad.reshape(Z.shape[0], n_bloques, bloque), axis=2)
+    return freqs[::bloque], Z_red
+
+
+def _lineas_con_separadores(freqs: np.ndarray, tiempos: np.ndarray, Z: np.ndarray):
+    """Concatena varias curvas en una sola polilínea 3D separada por NaN."""
+    n_seg, n_freq = Z.shape
+    x = np.empty((n_seg, n_freq + 1), dtype=np.float32)
+    y = np.empty_like(x)
+    z = np.empty_like(x)
+    x[:, :-1] = freqs
+    y[:, :-1] = tiempos[:, None]
+    z[:, :-1] = Z
+    x[:, -1] = y[:, -1] = z[:, -1] = np.nan
+    return x.ravel(), y.ravel(), z.ravel()
+
+
+def _agregar_trazas_waterfall(fig: go.Figure, espectrograma, curvas_enfasis) -> None:
+    """
+    Dibuja el espectrograma en una sola traza (superficie o polilínea con separadores NaN, según
+    `CONFIG.VISUALIZACION['MODO_WATERFALL']`) y superpone las curvas de `curvas_enfasis` en una traza ligera.
+    """
+    freqs, Z = _reducir_frecuencias(espectrograma['frecuencias'], espectrograma['amplitud'],
+                                    CONFIG.VISUALIZACION['MAX_FRECUENCIAS_WATERFALL'])
+    tiempos = np.asarray(espectrograma['tiempos'], dtype=float)
+    enfasis = np.isin(espectrograma['segmentos'].astype(str), list(curvas_enfasis or []))
+    hay_enfasis = bool(curvas_enfasis) and enfasis.any()
+
+    if CONFIG.VISUALIZACION['MODO_WATERFALL'] == 'lineas':
+        x, y, z = _lineas_con_separadores(freqs, tiempos, Z)
+        fig.add_trace(go.Scatter3d(
+            x=x, y=y, z=z, mode='lines',
+            line=dict(color=z, colorscale=COLORSCALE_GEOLOGICO, width=1 if hay_enfasis else 6),
+            opacity=0.08 if hay_enfasis else 1.0, showlegend=False
+        ))
+    else:
+        fig.add_trace(go.Surface(
+            x=freqs, y=tiempos, z=Z, colorscale=COLORSCALE_GEOLOGICO, showscale=False,
+            opacity=0.35 if hay_enfasis else 1.0, showlegend=False
+        ))
+
+    if hay_enfasis:
+        x, y, z = _lineas_con_separadores(freqs, tiempos[enfasis], Z[enfasis])
+        fig.add_trace(go.Scatter3d(
+            x=x, y=y, z=z, mode='lines',
+            line=dict(color=z, colorscale=COLORSCALE_GEOLOGICO, width=6),
+            opacity=1.0, showlegend=False
+        ))
+
+
+def espectrograma_waterfall(df_actual, seleccion_eje: str, duracion_segmento: float | None, ejecutar=None):
+    """
+    Espectrograma del eje con los parámetros del waterfall (copia del dict en caché) y `fs`; None sin datos.
+
+    `ejecutar(funcion, *args)` permite calcularlo en otro proceso (trabajos en segundo plano).
+    """
+    if df_actual is None or df_actual.empty or seleccion_eje not in df_actual.columns:
+        return None
     t = df_actual['tiempo'].values
     y_wf = df_actual[seleccion_eje].values
     if len(t) < 2 or len(y_wf) < 2:
-        return go.Figure(), []
+        return None
 
     dt_values = np.diff(t)
     dt_valid = dt_values[dt_values > 0]
@@ -31,64 +94,36 @@ def generar_waterfall_adaptativo(df_json: str, seleccion_eje: str, escala_x: str
         else:
             dt = dt_median
     fs = 1 / dt
-    N = len(y_wf)
-    nyquist_freq = fs / 2
 
     min_window = CONFIG.TOLERANCIAS['MIN_DURACION_SEGMENTO']
     if duracion_segmento is not None and duracion_segmento > 0:
         window_len = int(max(duracion_segmento, min_window) * fs)
     else:
         window_len = int(min_window * fs)
-    window_len = min(window_len, N)
-    overlap = 0.5
-    step = max(1, int(window_len * (1 - overlap)))
-    segment_starts = list(range(0, N - window_len + 1, step))
-    if len(segment_starts) > CONFIG.UMBRALES_DATOS['MAX_SEGMENTOS']:
-        indices = np.linspace(0, len(segment_starts) - 1, CONFIG.UMBRALES_DATOS['MAX_SEGMENTOS'], dtype=int)
-        segment_starts = [segment_starts[i] for i in indices]
-
-    segments_data = []
-    fig_waterfall = go.Figure()
-    for i, start in enumerate(segment_starts):
-        end = min(start + window_len, N)
-        actual_len = end - start
-        if actual_len < 512:
-            continue
-        seg = y_wf[start:end]
-        window = get_window('hann', actual_len)
-        seg_windowed = seg * window
-        Z = np.abs(rfft(seg_windowed))
-        freqs = rfftfreq(actual_len, dt)
-        if not np.isfinite(Z).any() or len(Z) == 0:
-            continue
-        if escala_y == 'db':
-            Z_plot = 20 * np.log10(np.maximum(Z, 1e-12))
-        else:
-            Z_plot = Z
-        tiempo_central = t[start + actual_len // 2]
-        freqs_plot = freqs
-        Z_plot_final = Z_plot
-
-        if not curvas_enfasis or str(i) in curvas_enfasis:
-            line_width = 6
-            opacity = 1.0
-        else:
-            line_width = 1
-            opacity = 0.08
-
-        colorscale_geologico = [[0.0, '#000080'], [0.1, '#0000FF'], [0.2, '#0080FF'], [0.3, '#00FFFF'], [0.4, '#00FF80'], [0.5, '#00FF00'], [0.6, '#80FF00'], [0.7, '#FFFF00'], [0.8, '#FF8000'], [0.9, '#FF4000'], [1.0, '#FF0000']]
-        fig_waterfall.add_trace(go.Scatter3d(
-            x=list(freqs_plot), y=[float(tiempo_central)] * len(freqs_plot), z=list(Z_plot_final),
-            mode='lines', line=dict(color=list(Z_plot_final), colorscale=colorscale_geologico, width=line_width),
-            opacity=opacity, showlegend=False
-        ))
+    max_segmentos = CONFIG.UMBRALES_DATOS['MAX_SEGMENTOS']
+    ejecutar = ejecutar or (lambda funcion, *args: funcion(*args))
+    espectrograma = dict(CACHE.obtener_o_calcular(
+        huella_contenido('espectrograma', t, y_wf, dt, window_len, 0.5, max_segmentos,
+                         sal_calculo('VENTANAS_WATERFALL')),
+        lambda: ejecutar(calcular_espectrograma, t, y_wf, dt, window_len, 0.5, max_segmentos),
+    ))
+    return espectrograma, fs
+
+
+def generar_waterfall_adaptativo(df_json: str, seleccion_eje: str, escala_x: str, escala_y: str, curvas_enfasis, estado_fijar_vista: bool, duracion_segmento: float | None):
+    """Devuelve (figura, espectrograma); el espectrograma (ver `calcular_espectrograma`) va en la escala graficada."""
+    resultado = espectrograma_waterfall(leer_dataset(df_json), seleccion_eje, duracion_segmento)
+    if resultado is None:
+        return go.Figure(), {}
+    espectrograma, fs = resultado
+    nyquist_freq = fs / 2
+    if escala_y == 'db':
+        espectrograma['amplitud'] = 20 * np.log10(np.maximum(espectrograma['amplitud'], np.float32(1e-12)))
+    n_segmentos = len(espectrograma['segmentos'])
 
-        step_export = max(1, len(freqs_plot) // 2000)
-        for j in range(0, len(freqs_plot), step_export):
-            if j < len(freqs_plot):
-                f, z = freqs_plot[j], Z_plot_final[j]
-                if np.isfinite(f) and np.isfinite(z):
-                    segments_data.append({'segmento': i + 1, 'tiempo_central': tiempo_central, 'frecuencia': f, 'amplitud': z})
+    fig_waterfall = go.Figure()
+    if n_segmentos > 0:
+        _agregar_trazas_waterfall(fig_waterfall, espectrograma, curvas_enfasis)
 
     if estado_fijar_vista:
         camera = dict(eye=dict(x=2.5, y=0, z=0), up=dict(x=0, y=0, z=1), center=dict(x=0, y=0, z=0), projection=dict(type="orthographic"))
@@ -104,10 +139,10 @@ def generar_waterfall_adaptativo(df_json: str, seleccion_eje: str, escala_x: str
             zaxis=dict(title="Amplitud" + (" (dB)" if escala_y == 'db' else " (g)"), color='white', backgroundcolor='black', gridcolor='white', showbackground=True, showgrid=True, zeroline=True, zerolinecolor='white'),
             camera=camera
         )
-        titulo = f'Waterfall 3D - Rango: 0-{nyquist_freq:.0f} Hz ({len(segment_starts)} segmentos) - fs={fs:.0f} Hz'
+        titulo = f'Waterfall 3D - Rango: 0-{nyquist_freq:.0f} Hz ({n_segmentos} segmentos) - fs={fs:.0f} Hz'
         fig_waterfall.update_layout(title=dict(text=titulo, font=dict(color='white', size=16)), scene=scene_config,
                                     paper_bgcolor='#111111', plot_bgcolor='black', font=dict(color='white'), margin=dict(l=0, r=0, t=50, b=0))
-    return fig_waterfall, segments_data
+    return fig_waterfall, (espectrograma if n_segmentos > 0 else {})
 
 
 
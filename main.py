@@ -1,20 +1,45 @@
 from __future__ import annotations
 
+"""
+Punto de entrada de la interfaz. `crear_app()` carga el módulo legado y registra los callbacks modulares
+una sola vez; importar este módulo no construye la app, de modo que los procesos del pool de trabajos
+(`forkserver`/`spawn`, que importan el módulo principal) no cargan Dash. `main.app` y `main.server`
+(p. ej. `gunicorn main:server`) la crean al primer acceso.
+"""
+
+import functools
+import logging
 import webbrowser
-from app_legacy import app  # carga el módulo legado y expone `app`
 
-# Registrar callbacks migrados para que queden activos en la instancia de `app`
-# Importar módulos que registran callbacks por efectos secundarios de import
-try:
-    # Registro centralizado (control, export, filtros, corte, masa)
-    import dynamic_stiffness_analyzer.ui.callbacks.graphs as ui_graphs
-    ui_graphs.register_callbacks(app)
-except Exception as e:
-    print(f"[UI] Aviso: callbacks modulares no cargados: {e}")
+
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=None)
+def crear_app():
+    from app_legacy import app  # carga el módulo legado y expone `app`
+
+    # Registrar callbacks migrados para que queden activos en la instancia de `app`
+    # Importar módulos que registran callbacks por efectos secundarios de import
+    try:
+        # Registro centralizado (control, export, filtros, corte, masa)
+        import dynamic_stiffness_analyzer.ui.callbacks.graphs as ui_graphs
+        ui_graphs.register_callbacks(app)
+    except Exception:
+        # Sin ellos la app arranca sin los callbacks de gráficos
+        logger.exception("Callbacks modulares no cargados")
+    return app
+
+
+def __getattr__(nombre: str):
+    if nombre == "app":
+        return crear_app()
+    if nombre == "server":
+        return crear_app().server
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
 
 
 if __name__ == "__main__":
+    app = crear_app()
     webbrowser.open_new("http://127.0.0.1:8050")
     app.run(debug=False, use_reloader=False)
-
-